@@ -0,0 +1,97 @@
+"""
+Shared fixtures of the Rigel benchmark suite (requires pytest-benchmark).
+
+Benchmarks are not collected by the unit test run. Run them from the repository root:
+
+    pytest benchmarks --benchmark-autosave                          # save results as a JSON baseline in .benchmarks/
+    pytest benchmarks --benchmark-compare                           # compare with the latest saved baseline
+    pytest benchmarks --benchmark-compare=0001 --benchmark-compare-fail=mean:10%
+    pytest-benchmark compare 0001 0002 --group-by=name              # compare two saved baselines
+"""
+import os
+import pytest
+import yaml
+from typing import Any, Dict, List
+
+# Number of ROS packages declared by the synthetic Rigelfiles.
+SIZES = [1, 100, 1000]
+
+# Number of user-defined global variables declared by the synthetic Rigelfiles.
+VARIABLES = 50
+
+
+def synthetic_rigelfile(count: int) -> Dict[str, Any]:
+    """
+    Generate the YAML data of a Rigelfile whose fields make heavy use of global variables.
+    One in four ROS packages uses an existing Dockerfile and every ROS package depends upon the previous one.
+
+    :type count: int
+    :param count: The number of ROS packages.
+
+    :rtype: Dict[str, Any]
+    :return: The YAML data.
+    """
+    variables: Dict[str, Any] = {f'var_{index}': f'value_{index}' for index in range(VARIABLES)}
+    variables.update({'distro': 'noetic', 'registry': 'registry.example.com', 'user': 'rigel', 'password': 'secret'})
+
+    packages: List[Dict[str, Any]] = []
+    for index in range(count):
+        depends_on = [f'package_{index - 1}'] if index else []
+        registry = {'server': '{{ registry }}', 'username': '{{ user }}', 'password': '{{ password }}'}
+        if index % 4 == 3:
+            packages.append({
+                'package': f'package_{index}',
+                'image': '{{ registry }}/package_%d:{{ var_%d }}' % (index, index % VARIABLES),
+                'dockerfile': f'docker/package_{index}',
+                'depends_on': depends_on,
+                'registry': registry
+            })
+            continue
+        packages.append({
+            'package': f'package_{index}',
+            'image': '{{ registry }}/package_%d:{{ distro }}' % index,
+            'distro': '{{ distro }}',
+            'command': 'roslaunch package_%d {{ var_%d }}.launch' % (index, index % VARIABLES),
+            'depends_on': depends_on,
+            'dir': f'src/package_{index}',
+            'apt': ['{{ var_%d }}' % ((index + offset) % VARIABLES) for offset in range(5)],
+            'env': [
+                {'name': f'ENV_{offset}', 'value': '{{ var_%d }}-{{ distro }}' % ((index + offset) % VARIABLES)}
+                for offset in range(5)
+            ],
+            'entrypoint': ['echo {{ var_%d }}' % ((index + offset) % VARIABLES) for offset in range(3)],
+            'run': ['apt-get install -y {{ var_%d }}' % ((index + offset) % VARIABLES) for offset in range(3)],
+            'hostname': ['github.com'],
+            'ignore': ['*.bag', 'build/'],
+            'platforms': ['linux/amd64', 'linux/arm64'],
+            'registry': registry
+        })
+
+    return {
+        'vars': variables,
+        'packages': packages,
+        'deploy': [{
+            'name': 'rigel/benchmark_plugin',
+            'kwargs': {'server': '{{ registry }}', 'targets': [{'image': '{{ var_%d }}' % i} for i in range(10)]}
+        }]
+    }
+
+
+@pytest.fixture(params=SIZES, ids=lambda count: f'{count}_packages')
+def rigelfile_data(request: Any) -> Dict[str, Any]:
+    """
+    The YAML data of a synthetic Rigelfile (before decoding).
+    """
+    data: Dict[str, Any] = synthetic_rigelfile(request.param)
+    return data
+
+
+@pytest.fixture
+def rigelfile_path(tmp_path: Any, rigelfile_data: Dict[str, Any]) -> str:
+    """
+    The path of a synthetic Rigelfile.
+    """
+    path = os.path.join(str(tmp_path), 'Rigelfile')
+    with open(path, 'w') as rigelfile:
+        yaml.safe_dump(rigelfile_data, rigelfile, sort_keys=False)
+    return path
@@ -0,0 +1,70 @@
+"""
+Compare the validation of Rigelfile package declarations with and without a discriminated union.
+
+Usage (with Rigel installed): python benchmarks/rigelfile_validation.py [--packages N] [--repeat R]
+"""
+import argparse
+import timeit
+from pydantic import BaseModel
+from rigel.models import DockerfileSection, DockerSection, Rigelfile
+from typing import Any, Dict, List, Union
+
+
+class UndiscriminatedPackages(BaseModel):
+    """
+    Package declarations validated by trying each model of the union in turn.
+    """
+    packages: List[Union[DockerSection, DockerfileSection]]
+
+
+def synthetic_packages(count: int) -> List[Dict[str, Any]]:
+    """
+    Generate package declarations, half of them using an existing Dockerfile.
+
+    :type count: int
+    :param count: The number of package declarations.
+
+    :rtype: List[Dict[str, Any]]
+    :return: The package declarations.
+    """
+    packages: List[Dict[str, Any]] = []
+    for i in range(count):
+        if i % 2:
+            packages.append({'package': f'package_{i}', 'image': f'image_{i}', 'dockerfile': f'docker/{i}'})
+        else:
+            packages.append({
+                'package': f'package_{i}',
+                'image': f'image_{i}',
+                'distro': 'noetic',
+                'command': f'roslaunch package_{i} main.launch',
+                'apt': ['wget', 'curl'],
+                'platforms': ['linux/amd64']
+            })
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--packages', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data: Dict[str, Any] = {'packages': synthetic_packages(args.packages)}
+
+    def discriminated() -> None:
+        Rigelfile(**data)
+
+    def undiscriminated() -> None:
+        UndiscriminatedPackages(**data)
+
+    results = {
+        'discriminated union': min(timeit.repeat(discriminated, number=1, repeat=args.repeat)),
+        'undiscriminated union': min(timeit.repeat(undiscriminated, number=1, repeat=args.repeat))
+    }
+    for name, seconds in results.items():
+        print(f'{name:<24} {seconds * 1000:>8.1f} ms ({args.packages} packages, best of {args.repeat})')
+    print(f"{'speedup':<24} {results['undiscriminated union'] / results['discriminated union']:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
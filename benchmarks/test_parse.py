@@ -0,0 +1,42 @@
+import copy
+import pytest
+from rigel.files import YAMLDataDecoder, YAMLDataLoader
+from rigel.models import Rigelfile
+from rigelcore.models import ModelBuilder
+from typing import Any, Dict, Tuple
+
+pytest.importorskip('pytest_benchmark')
+
+
+def decoded(data: Dict[str, Any]) -> Dict[str, Any]:
+    decoded_data: Dict[str, Any] = YAMLDataDecoder().decode(copy.deepcopy(data))
+    return decoded_data
+
+
+def test_load(benchmark: Any, rigelfile_path: str) -> None:
+    """
+    Benchmark reading and parsing a Rigelfile as YAML.
+    """
+    data = benchmark(YAMLDataLoader(rigelfile_path).load)
+    assert data['packages']
+
+
+def test_decode(benchmark: Any, rigelfile_data: Dict[str, Any]) -> None:
+    """
+    Benchmark replacing all global variables used inside a Rigelfile.
+    The YAML data is decoded in place so each round decodes a fresh copy (not measured).
+    """
+    def setup() -> Tuple[Tuple[Dict[str, Any]], Dict[str, Any]]:
+        return (copy.deepcopy(rigelfile_data),), {}
+
+    data = benchmark.pedantic(YAMLDataDecoder().decode, setup=setup, rounds=20, warmup_rounds=1)
+    assert '{{' not in data['packages'][0]['image']
+
+
+def test_validate(benchmark: Any, rigelfile_data: Dict[str, Any]) -> None:
+    """
+    Benchmark validating the decoded YAML data of a Rigelfile.
+    """
+    data = decoded(rigelfile_data)
+    rigelfile = benchmark(ModelBuilder(Rigelfile).build, [], data)
+    assert len(rigelfile.packages) == len(rigelfile_data['packages'])
@@ -0,0 +1,48 @@
+import pytest
+import sys
+import types
+from pydantic import BaseModel
+from rigel.models import PluginSection
+from rigel.plugins import PluginLoader
+from typing import Any, Dict, Iterator, List
+
+pytest.importorskip('pytest_benchmark')
+
+
+class BenchmarkPlugin(BaseModel):
+    """
+    A plugin whose arguments are validated like those of the registry plugin.
+    """
+    server: str
+    targets: List[Dict[str, Any]] = []
+
+    def run(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+@pytest.fixture(scope='module', autouse=True)
+def plugin_module() -> Iterator[None]:
+    """
+    Make the benchmark plugin importable as an installed plugin.
+    """
+    module = types.ModuleType('benchmark_plugin')
+    module.Plugin = BenchmarkPlugin  # type: ignore[attr-defined]
+    sys.modules['benchmark_plugin'] = module
+    yield
+    del sys.modules['benchmark_plugin']
+
+
+@pytest.mark.parametrize('targets', [1, 100], ids=lambda count: f'{count}_targets')
+def test_load(benchmark: Any, targets: int) -> None:
+    """
+    Benchmark loading an installed plugin and validating its arguments.
+    """
+    section = PluginSection(
+        name='rigel/benchmark_plugin',
+        kwargs={'server': 'registry.example.com', 'targets': [{'image': f'image_{i}'} for i in range(targets)]}
+    )
+    plugin = benchmark(PluginLoader().load, section)
+    assert len(plugin.targets) == targets
@@ -0,0 +1,42 @@
+import os
+import pytest
+from rigel.files import Renderer
+from rigel.models import DockerSection
+from typing import Any
+
+pytest.importorskip('pytest_benchmark')
+
+# All templates used to create build files, each with the ROS package fields they use.
+TEMPLATES = ['Dockerfile.j2', 'entrypoint.j2', 'config.j2', 'dockerignore.j2']
+
+
+@pytest.fixture(scope='module')
+def package() -> DockerSection:
+    """
+    A ROS package using most features of the templates.
+    """
+    return DockerSection(
+        package='package',
+        image='registry.example.com/package:noetic',
+        distro='noetic',
+        command='roslaunch package main.launch',
+        dir='src/package',
+        apt=[f'dependency-{index}' for index in range(20)],
+        env=[{'name': f'ENV_{index}', 'value': f'value_{index}'} for index in range(20)],
+        entrypoint=[f'echo step {index}' for index in range(10)],
+        run=[f'apt-get install -y tool-{index}' for index in range(10)],
+        hostname=['github.com', 'gitlab.com'],
+        ignore=['*.bag', 'build/', 'devel/'],
+        ssh=[{'hostname': 'github.com', 'value': 'keys/id_rsa', 'file': True}],
+        rosinstall=['package.rosinstall']
+    )
+
+
+@pytest.mark.parametrize('template', TEMPLATES)
+def test_render(benchmark: Any, tmp_path: Any, package: DockerSection, template: str) -> None:
+    """
+    Benchmark rendering each template used to create the build files of a ROS package.
+    """
+    output = os.path.join(str(tmp_path), template)
+    benchmark(Renderer(package).render, template, output)
+    assert os.path.getsize(output)
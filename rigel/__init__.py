@@ -1,19 +1,59 @@
-from .exceptions import (  # noqa: F401
-    EmptyRigelfileError,
-    IncompleteRigelfileError,
-    InvalidPluginNameError,
-    PluginInstallationError,
-    PluginNotCompliantError,
-    PluginNotFoundError,
-    RigelfileAlreadyExistsError,
-    RigelfileNotFoundError,
-    UnformattedRigelfileError,
-    UnknownROSPackagesError,
-    UnsupportedCompilerError,
-    UnsupportedPlatformError
-)
-from . import files  # noqa: F401
-from . import models  # noqa: F401
-from . import plugins  # noqa: F401
+import importlib
+from typing import Any, TYPE_CHECKING
+
+# Importing the dependencies of Rigel (pydantic, jinja2, rigelcore) is slow.
+# Exports are only imported when first accessed so that the thin client of the Rigel daemon
+# (see rigel.client) forwards commands without importing them.
+if TYPE_CHECKING:  # pragma: no cover
+    from .exceptions import (  # noqa: F401
+        CyclicDependencyError,
+        DaemonAlreadyRunningError,
+        EmptyRigelfileError,
+        GitRevisionError,
+        IncompleteRigelfileError,
+        InvalidBuilderEndpointError,
+        InvalidLockfileError,
+        InvalidMemorySizeError,
+        InvalidPluginNameError,
+        InvalidRigelfileFragmentError,
+        InvalidRosinstallFileError,
+        InvalidShardError,
+        PluginInstallationError,
+        PluginNotCompliantError,
+        PluginNotFoundError,
+        PreflightError,
+        RepositoryFetchError,
+        RigelfileAlreadyExistsError,
+        RigelfileNotFoundError,
+        UnformattedRigelfileError,
+        UnknownDependencyError,
+        UnknownROSPackagesError,
+        UnsupportedCompilerError,
+        UnsupportedPlatformError
+    )
+    from . import files  # noqa: F401
+    from . import models  # noqa: F401
+    from . import plugins  # noqa: F401
+    from . import vcs  # noqa: F401
 
 __version__ = '0.2.22'
+
+SUBMODULES = ['files', 'models', 'plugins', 'vcs']
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import exported errors and submodules once first accessed.
+
+    :type name: string
+    :param name: The name of the export.
+
+    :rtype: Any
+    :return: The exported error or submodule.
+    """
+    if name in SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    exceptions = importlib.import_module('.exceptions', __name__)
+    if name.endswith('Error') and hasattr(exceptions, name):
+        return getattr(exceptions, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,2021 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, AsyncExitStack, contextmanager
+from pathlib import Path
+from pydantic import BaseModel
+from rigel.builds import (
+    add_dependents,
+    BakeFileGenerator,
+    BuildJournal,
+    BuildLog,
+    base_image_pulls,
+    base_images,
+    BuildScheduler,
+    ChangeDetector,
+    create_watcher,
+    default_jobs,
+    detect_budget,
+    DockerSession,
+    generate_paths,
+    input_digest,
+    MultiPlatformBuilder,
+    parse_builder_endpoints,
+    parse_shard,
+    pin_image,
+    PreflightChecker,
+    PreflightFailure,
+    preflight_report,
+    pull_base_image,
+    resolve_image_digest,
+    run_bake,
+    select_packages,
+    shard_packages,
+    ssh_key_path,
+    stream_build,
+    TimingDatabase
+)
+from rigel.exceptions import PreflightError
+from rigel.files import (
+    BuildContext,
+    DURATIONS_FILE,
+    load_durations,
+    load_lockfile,
+    LOCKFILE,
+    Renderer,
+    RigelfileComposer,
+    write_durations,
+    write_lockfile,
+    YAMLDataDecoder
+)
+from rigel.metrics import MetricsRegistry
+from rigel.models import (
+    DockerSection,
+    DockerfileSection,
+    LockedPackage,
+    LockedRepository,
+    Lockfile,
+    PluginSection,
+    Rigelfile,
+    SUPPORTED_PLATFORMS
+)
+from rigel.plugins import Plugin
+from rigel.plugins.loader import PluginLoader
+from rigel.profiling import labelled
+from rigel.vcs import Repository, RepositoryMirror, resolve_commit, RosinstallParser
+from rigelcore.exceptions import RigelError
+from rigelcore.loggers import MessageLogger
+from rigelcore.models import ModelBuilder
+from rigelcore.simulations import SimulationRequirementsParser
+from rigelcore.simulations.requirements import SimulationRequirementNode, SimulationRequirementsManager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+
+RIGEL_BUILDER = 'rigel-builder'
+BAKE_FILE = '.rigel_config/docker-bake.json'
+TIMINGS_DB = '.rigel_config/timings.db'
+LOGS_FOLDER = '.rigel_config/logs'
+JOURNAL_FILE = '.rigel_config/journal.json'
+BUILD_FILES = ['Dockerfile', 'entrypoint.sh', 'config', 'Dockerfile.dockerignore']  # created for each ROS package
+PULL_JOBS = 4  # base images pulled concurrently
+
+T = TypeVar('T')
+
+
+class WorkingDirectory:
+    """
+    A class to share the working directory of the process between concurrent operations.
+
+    All paths declared inside a Rigelfile are relative to the folder of the Rigelfile.
+    Since the working directory is shared by the whole process, operations on the same folder
+    may run concurrently while operations on different folders are serialized.
+    """
+
+    def __init__(self) -> None:
+        self.__condition = threading.Condition()
+        self.__path: Optional[str] = None
+        self.__previous = ''
+        self.__users = 0
+
+    @contextmanager
+    def use(self, path: str) -> Iterator[None]:
+        """
+        Run a block of code inside a given folder.
+
+        :type path: string
+        :param path: The absolute path of the folder.
+        """
+        with self.__condition:
+            while self.__users and self.__path != path:
+                self.__condition.wait()
+            if not self.__users:
+                self.__previous = os.getcwd()
+                os.chdir(path)
+                self.__path = path
+            self.__users += 1
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__users -= 1
+                if not self.__users:
+                    os.chdir(self.__previous)
+                    self.__path = None
+                    self.__condition.notify_all()
+
+
+WORKDIR = WorkingDirectory()
+
+
+class CreateResult(BaseModel):
+    """
+    The outcome of creating the build files of a ROS package.
+
+    :type package: string
+    :cvar package: The name of the ROS package.
+    :type files: List[string]
+    :cvar files: The absolute paths of the created files.
+    """
+    package: str
+    files: List[str]
+
+
+class BuildResult(BaseModel):
+    """
+    The outcome of containerizing a ROS package.
+
+    :type package: string
+    :cvar package: The name of the ROS package.
+    :type image: string
+    :cvar image: The name of the Docker image.
+    :type platforms: List[string]
+    :cvar platforms: The target platforms. Empty if built for the host platform.
+    :type duration: float
+    :cvar duration: The build duration (seconds).
+    :type cache_hit: Optional[bool]
+    :cvar cache_hit: Whether the image was fully restored from cache. None if unknown.
+    :type resumed: bool
+    :cvar resumed: Whether the build was skipped since the previous run already built the image from the same inputs.
+    """
+    package: str
+    image: str
+    platforms: List[str] = []
+    duration: float
+    cache_hit: Optional[bool] = None
+    resumed: bool = False
+
+
+class PluginResult(BaseModel):
+    """
+    The outcome of running an external plugin.
+
+    :type plugin: string
+    :cvar plugin: The name of the external plugin.
+    :type duration: float
+    :cvar duration: The execution duration (seconds).
+    :type report: string
+    :cvar report: The status of the simulation requirements, if any.
+    """
+    plugin: str
+    duration: float
+    report: str = ''
+
+
+class RebuildRound(threading.Thread):
+    """
+    A round of builds run in the background while watching for changes (see function 'Project.watch').
+    Build files are created first for the ROS packages whose declaration changed.
+    """
+
+    def __init__(
+        self,
+        project: 'Project',
+        packages: List[Union[DockerSection, DockerfileSection]],
+        render: List[DockerSection],
+        load: bool,
+        push: bool,
+        jobs: Optional[int]
+    ) -> None:
+        """
+        :type project: Project
+        :param project: The Rigel project.
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to containerize.
+        :type render: List[rigel.models.DockerSection]
+        :param render: The ROS packages whose build files must be created.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of ROS packages to build concurrently. Computed from the available resources if not set.
+        """
+        super().__init__(daemon=True)
+        self.project = project
+        self.packages = {package.package: package for package in packages}
+        self.render = render
+        self.load = load
+        self.push = push
+        self.jobs = jobs
+        self.rendered: Set[str] = set()
+        self.completed: Set[str] = set()
+        self.cancelled = False
+        self.error: Optional[Exception] = None
+        self.__builders = False
+        self.__lock = threading.Lock()
+
+    def run(self) -> None:
+        try:
+            with self.project.workdir():
+                for package in self.render:
+                    if self.cancelled:
+                        return
+                    self.project.create_package_files(package)
+                    self.rendered.add(package.package)
+
+                with self.__lock:
+                    if self.cancelled:
+                        return
+                    if any(isinstance(package, DockerSection) for package in self.packages.values()):
+                        self.project.create_builders([])
+                        self.__builders = True
+
+                def build_package(name: str) -> None:
+                    if self.cancelled:  # the builders no longer exist
+                        raise CancelledError()
+                    self.project.build_package(self.packages[name], self.load, self.push)
+                    self.completed.add(name)
+
+                scheduler = self.project.scheduler(list(self.packages.values()), self.jobs)
+                try:
+                    scheduler.run(build_package)
+                finally:
+                    self.remove_builders()
+        except Exception as exception:
+            self.error = exception
+
+    def remove_builders(self) -> None:
+        """
+        Remove the builders, if existent.
+        """
+        with self.__lock:
+            if self.__builders:
+                self.__builders = False
+                self.project.remove_builders([])
+
+    def cancel(self) -> None:
+        """
+        Abort all builds in progress and wait for the round to finish.
+        Removing the builders makes builds in progress fail immediately.
+        """
+        self.cancelled = True
+        try:
+            self.remove_builders()
+        except RigelError:
+            pass  # the builds in progress fail anyway
+        self.join()
+
+
+class Project:
+    """
+    A class to drive Rigel from within a Python process.
+
+    The Rigelfile is parsed once and the Docker client and registry authentications
+    are shared by all operations. Errors are raised as instances of RigelError.
+    """
+
+    def __init__(
+        self,
+        path: str = '.',
+        logger: Optional[MessageLogger] = None,
+        session: Optional[DockerSession] = None
+    ) -> None:
+        """
+        :type path: string
+        :param path: The folder containing the Rigelfile.
+        :type logger: Optional[rigelcore.loggers.MessageLogger]
+        :param logger: The logger for progress messages.
+        :type session: Optional[rigel.builds.DockerSession]
+        :param session: The Docker session to use.
+        """
+        self.root = os.path.abspath(path)
+        self.logger = logger or MessageLogger()
+        self.session = session or DockerSession()
+        self.timings = TimingDatabase(os.path.join(self.root, TIMINGS_DB))
+        self.journal = BuildJournal(os.path.join(self.root, JOURNAL_FILE))
+        self.plugins: Dict[str, Plugin] = {}  # external plugins currently executing
+        self.echo_builds = True  # print build output besides writing it to the build logs
+        self.metrics: Optional[MetricsRegistry] = None  # metrics are only collected if set
+        self.__rigelfile: Optional[Rigelfile] = None
+        self.__sources: List[Tuple[str, int, int]] = []  # state of the parsed files
+        self.__environ: Dict[str, str] = {}  # environment variables the Rigelfile was parsed with
+        self.__warmed: Set[Tuple[str, str]] = set()  # base image digests (and platforms) held by the current builder
+
+    @contextmanager
+    def workdir(self) -> Iterator[None]:
+        """
+        Run a block of code inside the folder of the Rigelfile.
+        """
+        with WORKDIR.use(self.root):
+            yield
+
+    @contextmanager
+    def measure(self, package: str, phase: str) -> Iterator[None]:
+        """
+        Record the duration of a phase of the build of a ROS package, if metrics are collected.
+
+        :type package: string
+        :param package: The name of the ROS package.
+        :type phase: string
+        :param phase: The name of the phase (e.g. 'login' or 'build').
+        """
+        started_at = time.time()
+        try:
+            yield
+        finally:
+            if self.metrics is not None:
+                self.metrics.set('rigel_build_duration_seconds', time.time() - started_at, package=package, phase=phase)
+
+    def sources(self, include: List[str]) -> List[Tuple[str, int, int]]:
+        """
+        Get the state of the Rigelfile and of the Rigelfile fragments it includes.
+
+        :type include: List[string]
+        :param include: The include patterns declared inside the Rigelfile.
+
+        :rtype: List[Tuple[string, int, int]]
+        :return: The path, modification time (nanoseconds) and size of each file. Missing files have size -1.
+        """
+        rigelfile = os.path.join(self.root, 'Rigelfile')
+        sources = []
+        for path in [rigelfile] + RigelfileComposer(rigelfile).fragments(include):
+            try:
+                stat = os.stat(path)
+                sources.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                sources.append((path, 0, -1))
+        return sources
+
+    def parse(self, patterns: Optional[List[str]] = None) -> Rigelfile:
+        """
+        Parse information inside the Rigelfile and the Rigelfile fragments it includes.
+        The complete Rigelfile is only parsed again once any of these files or the environment variables change.
+
+        :type patterns: Optional[List[string]]
+        :param patterns: Names or shell-style patterns of the desired ROS packages.
+        If set, and the complete Rigelfile was not parsed yet, only the included ROS packages
+        that are desired (or required by desired ones) are parsed.
+
+        :rtype: rigel.models.Rigelfile
+        :return: The parsed information.
+        """
+        if (
+            self.__rigelfile is not None and
+            self.sources(self.__rigelfile.include) == self.__sources and
+            os.environ == self.__environ
+        ):
+            return self.__rigelfile
+
+        with self.workdir():
+            composer = RigelfileComposer('./Rigelfile')
+            decoder = YAMLDataDecoder()
+            yaml_data = decoder.decode(composer.load(patterns))
+            rigelfile: Rigelfile = ModelBuilder(Rigelfile).build([], yaml_data)
+
+        if patterns is None:
+            self.__rigelfile = rigelfile
+            self.__sources = self.sources(rigelfile.include)
+            self.__environ = dict(os.environ)
+        return rigelfile
+
+    def reload(self) -> None:
+        """
+        Discard the parsed Rigelfile so that it is parsed again when next required.
+        """
+        self.__rigelfile = None
+
+    def select(
+        self,
+        packages: List[Union[DockerSection, DockerfileSection]],
+        shard: Optional[str] = None
+    ) -> List[Union[DockerSection, DockerfileSection]]:
+        """
+        Select the ROS packages assigned to a given shard.
+        Shards are balanced by build duration only if the Rigelfile.durations (shared by all CI runners)
+        covers all ROS packages. The local build history is never used as it differs between runners.
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to split.
+        :type shard: Optional[string]
+        :param shard: The shard declaration (e.g. '2/4'). If not set all ROS packages are selected.
+
+        :rtype: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :return: The ROS packages assigned to the shard.
+        """
+        if not shard:
+            return packages
+        index, count = parse_shard(shard)
+        durations = load_durations(os.path.join(self.root, DURATIONS_FILE))
+        unknown = [package.package for package in packages if package.package not in durations]
+        if durations and unknown:
+            self.logger.warning(f"{DURATIONS_FILE} lacks packages {', '.join(unknown)}. Shards are assigned by name instead.")
+        selected = shard_packages(packages, index, count, durations)
+        self.logger.info(f"Packages assigned to shard {index}/{count}: {', '.join(p.package for p in selected) or 'none'}")
+        return selected
+
+    def export_durations(self) -> Dict[str, float]:
+        """
+        Share the expected build durations of the ROS packages with all CI runners by writing them
+        to the Rigelfile.durations, which is then used to balance shards (see function 'select').
+
+        :rtype: Dict[string, float]
+        :return: The expected build duration (seconds) of each ROS package with successful builds.
+        """
+        durations = self.timings.expected_durations()
+        write_durations(durations, os.path.join(self.root, DURATIONS_FILE))
+        self.logger.info(f"Wrote the expected build durations of {len(durations)} packages to {DURATIONS_FILE}.")
+        return durations
+
+    def check_packages(
+        self,
+        declared: List[Union[DockerSection, DockerfileSection]],
+        packages: List[Union[DockerSection, DockerfileSection]]
+    ) -> List[PreflightFailure]:
+        """
+        Check concurrently whether ROS packages are ready to be built.
+
+        :type declared: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param declared: All declared ROS packages (their images need not exist beforehand).
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to check.
+
+        :rtype: List[rigel.builds.PreflightFailure]
+        :return: All problems found.
+        """
+        checker = PreflightChecker(self.session.client, [package.image for package in declared], lockfile=self.lockfile())
+        with self.workdir():
+            return checker.run(packages)
+
+    def ensure_ready(
+        self,
+        declared: List[Union[DockerSection, DockerfileSection]],
+        packages: List[Union[DockerSection, DockerfileSection]]
+    ) -> None:
+        """
+        Fail before building ROS packages that are not ready to be built.
+
+        :type declared: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param declared: All declared ROS packages.
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages about to be built.
+        """
+        failures = self.check_packages(declared, packages)
+        if failures:
+            raise PreflightError(report=preflight_report(failures))
+        self.logger.info(f'Preflight checks passed for {len(packages)} packages.')
+
+    def preflight(self, pkg: Optional[List[str]] = None, shard: Optional[str] = None) -> List[PreflightFailure]:
+        """
+        Check whether the ROS packages are ready to be built: image registries are reachable, .rosinstall files,
+        SSH key files and Dockerfiles exist and base images are available.
+
+        :type pkg: Optional[List[string]]
+        :param pkg: Names or shell-style patterns of the desired ROS packages. All if not set.
+        :type shard: Optional[string]
+        :param shard: Only check one shard of the desired ROS packages (e.g. '2/4').
+
+        :rtype: List[rigel.builds.PreflightFailure]
+        :return: All problems found, in order of declaration of the ROS packages.
+        """
+        with self.workdir():
+            rigelfile = self.parse()
+            desired_packages = self.select(select_packages(rigelfile.packages, pkg or []), shard)
+            return self.check_packages(rigelfile.packages, desired_packages)
+
+    def create_package_files(self, package: DockerSection, prefetched: bool = False) -> List[str]:
+        """
+        Create all the files required to containerize a given ROS package.
+
+        :type package: rigel.models.DockerSection
+        :param package: The ROS package whose Dockerfile is to be created.
+        :type prefetched: bool
+        :param prefetched: Whether the external repositories were already fetched by Rigel.
+
+        :rtype: List[string]
+        :return: The absolute paths of the created files.
+        """
+        self.logger.warning(f"Creating build files for package {package.package}.")
+
+        path = generate_paths(package)[1]
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+        renderer = Renderer(package, self.lockfile().packages.get(package.package), prefetched=prefetched)
+
+        templates = [('Dockerfile.j2', 'Dockerfile'), ('entrypoint.j2', 'entrypoint.sh')]
+        if package.ssh:
+            templates.append(('config.j2', 'config'))
+        if package.dir:  # only packages with a source folder have a build context worth pruning
+            templates.append(('dockerignore.j2', 'Dockerfile.dockerignore'))
+
+        files = []
+        for template, filename in templates:
+            renderer.render(template, f'{path}/{filename}')
+            self.logger.info(f"Created file {path}/{filename}")
+            files.append(f'{path}/{filename}')
+        return files
+
+    def prefetch_repositories(self, packages: List[DockerSection], jobs: int) -> None:
+        """
+        Fetch in parallel all external repositories listed in the .rosinstall files of the given ROS packages.
+        Repositories are kept as bare mirrors inside a local cache and a working copy is placed
+        inside the build context of each ROS package.
+
+        :type packages: List[rigel.models.DockerSection]
+        :param packages: The ROS packages whose external repositories are to be fetched.
+        :type jobs: int
+        :param jobs: Maximum number of repositories to fetch concurrently.
+        """
+        parser = RosinstallParser(strict=True)
+        mirror = RepositoryMirror(os.path.abspath('.rigel_config/mirrors'), jobs)
+        lockfile = self.lockfile()
+
+        repositories: Dict[str, List[Repository]] = {}
+        for package in packages:
+            root = generate_paths(package)[0]
+            repositories[package.package] = [
+                repository
+                for file in package.rosinstall
+                for repository in parser.parse(os.path.join(root, file))
+            ]
+            locked = lockfile.packages.get(package.package)
+            if locked is not None:  # check out the pinned commits instead
+                commits = {(r.name, r.url, r.version): r.commit for r in locked.repositories}
+                repositories[package.package] = [
+                    repository.copy(update={'version': commits.get((repository.name, repository.url, repository.version),
+                                                                   repository.version)})
+                    for repository in repositories[package.package]
+                ]
+
+        self.logger.warning('Fetching external repositories.')
+        mirror.fetch(repository.url for package_repositories in repositories.values() for repository in package_repositories)
+
+        for package in packages:
+            path = f'{generate_paths(package)[1]}/rosinstall'
+            mirror.stage(repositories[package.package], path)
+            self.logger.info(f"Placed external repositories of package {package.package} at {path}")
+
+    def lockfile(self) -> Lockfile:
+        """
+        Get the pinned base images and external repositories of the ROS packages (see file 'Rigelfile.lock').
+
+        :rtype: rigel.models.Lockfile
+        :return: The pinned inputs of each ROS package. Nothing is pinned if the project has no Rigelfile.lock.
+        """
+        return load_lockfile(os.path.join(self.root, LOCKFILE))
+
+    def lock(self, update: bool = False, jobs: int = 4) -> Lockfile:
+        """
+        Pin the base images of the ROS packages to digests and their external repositories to commits
+        inside the Rigelfile.lock, which is then used when creating build files.
+        Inputs that are already pinned are kept unless an update is requested.
+        ROS packages built from their own Dockerfile are not locked, since their Dockerfile is used as is.
+
+        :type update: bool
+        :param update: Resolve all base images and external repositories again.
+        :type jobs: int
+        :param jobs: Maximum number of base images and repositories to resolve concurrently.
+
+        :rtype: rigel.models.Lockfile
+        :return: The pinned inputs of each ROS package.
+        """
+        with self.workdir():
+            rigelfile = self.parse()
+            previous = Lockfile() if update else self.lockfile()
+            pinned_images = {image: pin for locked in previous.packages.values() for image, pin in locked.images.items()}
+            pinned_commits = {
+                (repository.url, repository.version): repository.commit
+                for locked in previous.packages.values()
+                for repository in locked.repositories
+            }
+
+            # Only generated Dockerfiles are rendered with pinned inputs.
+            parser = RosinstallParser()
+            packages = [package for package in rigelfile.packages if isinstance(package, DockerSection)]
+            images = {package.package: base_images(package) for package in packages}
+            repositories = {
+                package.package: [
+                    repository
+                    for file in package.rosinstall
+                    for repository in parser.parse(os.path.join(generate_paths(package)[0], file))
+                ]
+                for package in packages
+            }
+
+            unpinned_images = list(dict.fromkeys(
+                image for package_images in images.values() for image in package_images if image not in pinned_images
+            ))
+            unpinned_repositories = list(dict.fromkeys(
+                (repository.url, repository.version)
+                for package_repositories in repositories.values()
+                for repository in package_repositories
+                if (repository.url, repository.version) not in pinned_commits
+            ))
+            if unpinned_images or unpinned_repositories:
+                self.logger.info(f'Resolving {len(unpinned_images)} base images and {len(unpinned_repositories)} repositories.')
+
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+                digests = {image: executor.submit(resolve_image_digest, self.session.client, image) for image in unpinned_images}
+                commits = {key: executor.submit(resolve_commit, *key) for key in unpinned_repositories}
+                for image, digest in digests.items():
+                    pinned_images[image] = pin_image(image, digest.result())
+                for key, commit in commits.items():
+                    pinned_commits[key] = commit.result()
+
+            lockfile = Lockfile(packages={
+                package.package: LockedPackage(
+                    images={image: pinned_images[image] for image in images[package.package]},
+                    repositories=[
+                        LockedRepository(
+                            name=repository.name,
+                            url=repository.url,
+                            version=repository.version,
+                            commit=pinned_commits[(repository.url, repository.version)]
+                        )
+                        for repository in repositories[package.package]
+                    ]
+                )
+                for package in packages
+            })
+            write_lockfile(lockfile, os.path.join(self.root, LOCKFILE))
+            pinned = sum(len(locked.images) + len(locked.repositories) for locked in lockfile.packages.values())
+            self.logger.info(f"Pinned {pinned} inputs of {len(packages)} packages in {LOCKFILE}. Run 'rigel create' to use them.")
+            unlocked = [package.package for package in rigelfile.packages if isinstance(package, DockerfileSection)]
+            if unlocked:
+                self.logger.warning(f"Packages built from their own Dockerfile are not locked: {', '.join(unlocked)}. "
+                                    "Pin their base images by digest inside their Dockerfile instead.")
+            return lockfile
+
+    def create_bake_file(self, packages: List[Union[DockerSection, DockerfileSection]], cache_dir: Optional[str]) -> str:
+        """
+        Describe the containerization of the given ROS packages in a single docker buildx bake file.
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to containerize.
+        :type cache_dir: Optional[str]
+        :param cache_dir: Folder where to keep a local build cache for each ROS package, if any.
+
+        :rtype: string
+        :return: The absolute path of the bake file.
+        """
+        paths: Dict[str, Tuple[str, str]] = {}
+        for package in packages:
+            if isinstance(package, DockerSection):
+                root, dockerfile_folder = generate_paths(package)
+                paths[package.package] = (root, f'{dockerfile_folder}/Dockerfile')
+            else:  # DockerfileSection
+                root = generate_paths(package)[0]
+                paths[package.package] = (root, f'{root}/Dockerfile')
+
+        filepath = os.path.abspath(BAKE_FILE)
+        Path(os.path.dirname(filepath)).mkdir(parents=True, exist_ok=True)
+        generator = BakeFileGenerator(packages, paths, os.path.abspath(cache_dir) if cache_dir else None)
+        generator.write(filepath)
+        self.logger.info(f"Created file {filepath}")
+        return filepath
+
+    def create(
+        self,
+        pkg: Optional[List[str]] = None,
+        prefetch: bool = False,
+        jobs: int = 4,
+        bake: bool = False,
+        cache_dir: Optional[str] = None,
+        shard: Optional[str] = None
+    ) -> List[CreateResult]:
+        """
+        Create all files required to containerize the ROS packages.
+
+        :type pkg: Optional[List[string]]
+        :param pkg: Names or shell-style patterns of the desired ROS packages. All if not set.
+        :type prefetch: bool
+        :param prefetch: Fetch external repositories in advance using a mirror cache.
+        :type jobs: int
+        :param jobs: Maximum number of repositories to fetch concurrently.
+        :type bake: bool
+        :param bake: Also describe all ROS packages in a single docker buildx bake file.
+        :type cache_dir: Optional[string]
+        :param cache_dir: Folder where to keep a local build cache for each ROS package (bake only).
+        :type shard: Optional[string]
+        :param shard: Only handle one shard of the desired ROS packages (e.g. '2/4').
+
+        :rtype: List[CreateResult]
+        :return: The files created for each ROS package.
+        """
+        with self.workdir():
+            rigelfile = self.parse(None if bake else pkg or None)
+            desired_packages = self.select(select_packages(rigelfile.packages, pkg or []), shard)
+
+            docker_packages = [package for package in desired_packages if isinstance(package, DockerSection)]
+
+            prefetched_packages = []
+            if prefetch:
+                prefetched_packages = [package for package in docker_packages if package.rosinstall]
+                self.prefetch_repositories(prefetched_packages, jobs)
+
+            results = [
+                CreateResult(package=package.package, files=self.create_package_files(package, package in prefetched_packages))
+                for package in docker_packages
+            ]
+
+            if bake:
+                self.create_bake_file(rigelfile.packages, cache_dir)
+
+            return results
+
+    def login_registry(self, package: Union[DockerSection, DockerfileSection]) -> None:
+        """
+        Login to a Docker image registry.
+        Each registry is authenticated only once per session.
+
+        :param package: The ROS package to be containerized and deployed.
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        """
+        if package.registry:
+
+            server = package.registry.server
+
+            with self.measure(package.package, 'login'):
+                authenticated = self.session.login(package.registry)
+
+            if authenticated:
+                self.logger.info(f'Authenticated with registry {server}')
+            else:
+                self.logger.info(f'Reusing authentication with registry {server}')
+
+    def create_builders(self, platforms: List[str], multi_platform_builder: Optional[MultiPlatformBuilder] = None) -> None:
+        """
+        Create the builders required to containerize ROS packages and ensure that QEMU is properly configured.
+        This is done only once, regardless of the number of ROS packages to containerize.
+
+        :type platforms: List[str]
+        :param platforms: All platforms for which images are to be built.
+        :type multi_platform_builder: Optional[rigel.builds.MultiPlatformBuilder]
+        :param multi_platform_builder: The builder of per-platform images, if platforms are built separately.
+        """
+        docker = self.session.client
+
+        docker.create_builder(RIGEL_BUILDER, use=True)
+        self.logger.info(f"Created builder '{RIGEL_BUILDER}'")
+
+        # Ensure that QEMU is properly configured before building an image.
+        for docker_platform, _, qemu_config_file in SUPPORTED_PLATFORMS:
+            if not os.path.exists(f'/proc/sys/fs/binfmt_misc/{qemu_config_file}'):
+                docker.run_container(
+                    'qus',
+                    'aptman/qus',
+                    command=['-s -- -c -p'],
+                    privileged=True,
+                    remove=True,
+                )
+                self.logger.info(f"Created QEMU configuration file for '{docker_platform}'")
+
+        if multi_platform_builder:
+            multi_platform_builder.create_remote_builders(platforms)
+
+    def remove_builders(self, platforms: List[str], multi_platform_builder: Optional[MultiPlatformBuilder] = None) -> None:
+        """
+        Remove all builders created to containerize ROS packages.
+
+        :type platforms: List[str]
+        :param platforms: All platforms for which images were built.
+        :type multi_platform_builder: Optional[rigel.builds.MultiPlatformBuilder]
+        :param multi_platform_builder: The builder of per-platform images, if platforms were built separately.
+        """
+        self.session.client.remove_builder(RIGEL_BUILDER)
+        self.__warmed.clear()  # the content store of the builder is removed with it
+        self.logger.info(f"Removed builder '{RIGEL_BUILDER}'")
+        if multi_platform_builder:
+            multi_platform_builder.remove_remote_builders(platforms)
+
+    def containerize_package(
+        self,
+        package: DockerSection,
+        load: bool,
+        push: bool,
+        multi_platform_builder: Optional[MultiPlatformBuilder] = None
+    ) -> None:
+        """
+        Containerize a given ROS package.
+        All required builders must have been created beforehand (see function 'create_builders').
+
+        :type package: rigel.models.DockerSection
+        :param package: The ROS package whose Dockerfile is to be created.
+        :type load: bool
+        :param package: Store built image locally.
+        :type push: bool
+        :param package: Store built image in a remote registry.
+        :type multi_platform_builder: Optional[rigel.builds.MultiPlatformBuilder]
+        :param multi_platform_builder: If set, the image of each platform is built as a separate concurrent job.
+        """
+        self.logger.warning(f"Containerizing package {package.package}.")
+        if package.ssh and not package.rosinstall:
+            self.logger.warning('No .rosinstall file was declared. Recommended to remove unused SSH keys from Dockerfile.')
+
+        buildargs: Dict[str, str] = {}
+        for key in package.ssh:
+            if not key.file:
+                value = os.environ[key.value]  # NOTE: SSHKey model ensures that environment variable is declared.
+                buildargs[key.value] = value
+
+        path = generate_paths(package)
+
+        self.login_registry(package)
+
+        platforms = package.platforms or None
+
+        # Build the Docker image.
+        self.logger.info(f"Building Docker image '{package.image}'")
+
+        kwargs: Dict[str, Any] = {
+            "file": f'{path[1]}/Dockerfile',
+        }
+
+        if buildargs:
+            kwargs["build_args"] = buildargs
+
+        if multi_platform_builder and platforms:
+
+            def log(docker_platform: str) -> BuildLog:
+                return self.build_log(package, f"{package.package}-{'-'.join(docker_platform.split('/')[1:])}")
+
+            def record(docker_platform: str, duration: float, success: bool) -> None:
+                self.timings.record(package.package, [docker_platform], duration, success=success)
+
+            multi_platform_builder.build(path[0], package.image, platforms, load, push, log, record, **kwargs)
+
+        else:
+
+            kwargs.update({
+                "tags": package.image,
+                "load": load,
+                "push": push
+            })
+
+            if platforms:
+                kwargs["platforms"] = platforms
+
+            self.stream_build(package, path[0], **kwargs)
+
+        self.logger.info(f"Docker image '{package.image}' built with success.")
+        if push:
+            self.logger.info(f"Docker image '{package.image}' pushed with success.")
+
+    def build_log(self, package: Union[DockerSection, DockerfileSection], name: str) -> BuildLog:
+        """
+        Create a build log for a ROS package (see folder '.rigel_config/logs').
+        Build output is echoed with the name of the ROS package unless disabled.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+        :type name: string
+        :param name: The name of the log file (without extension).
+
+        :rtype: rigel.builds.BuildLog
+        :return: The build log.
+        """
+        def echo(line: str) -> None:
+            print(f'[{package.package}] {line}')
+
+        return BuildLog(name, os.path.join(self.root, LOGS_FOLDER), echo if self.echo_builds else None)
+
+    def stream_build(self, package: Union[DockerSection, DockerfileSection], path: str, **kwargs: Any) -> None:
+        """
+        Build a Docker image with the build output written to the build log of a given ROS package
+        (see folder '.rigel_config/logs'). The latest lines of the build log are shown if the build fails.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+        :type path: string
+        :param path: Root of the build context.
+        :type kwargs: Dict[str, Any]
+        :param kwargs: Additional build arguments (see function 'rigel.builds.stream_build').
+        """
+        log = self.build_log(package, package.package)
+        try:
+            with log, self.measure(package.package, 'build'):
+                stream_build(self.session.client, path, log, **kwargs)
+        except RigelError:
+            self.logger.error(f"Failed to build Docker image '{package.image}'. Last lines of '{log.path}':")
+            for line in log.tail():
+                print(f'  {line}')
+            raise
+
+    def pull_base_images(
+        self,
+        declared: List[Union[DockerSection, DockerfileSection]],
+        packages: List[Union[DockerSection, DockerfileSection]],
+        jobs: int = PULL_JOBS
+    ) -> None:
+        """
+        Pull concurrently, and only once, the distinct base images of ROS packages into the builder before building them.
+        Images whose digest the builder already holds are not pulled again.
+        Images that fail to be pulled are left to be pulled by the builds themselves.
+
+        :type declared: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param declared: All declared ROS packages (their images cannot be pulled beforehand).
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages about to be built.
+        :type jobs: int
+        :param jobs: Maximum number of base images to pull concurrently.
+        """
+        pulls = base_image_pulls(packages, [package.image for package in declared], self.lockfile())
+        if not pulls:
+            return
+        self.logger.info(f"Pulling {len(pulls)} base images: {', '.join(image for image, _ in pulls)}")
+
+        pulled = 0
+        lock = threading.Lock()
+
+        def pull(image: str, platforms: List[str]) -> None:
+            nonlocal pulled
+
+            def echo(line: str) -> None:
+                print(f'[pull {image}] {line}')
+
+            name = 'pull-' + ''.join(c if c.isalnum() or c in '-_.' else '_' for c in image)
+            log = BuildLog(name, os.path.join(self.root, LOGS_FOLDER), echo if self.echo_builds else None)
+            started_at = time.time()
+            try:
+                with log:
+                    downloaded = pull_base_image(self.session.client, image, platforms, log, RIGEL_BUILDER, self.__warmed)
+            except RigelError:
+                self.logger.warning(f"Failed to pull base image '{image}' (see {log.path}). It will be pulled when building.")
+                return
+            with lock:
+                pulled += 1
+                if downloaded:
+                    self.logger.info(f"Pulled base image '{image}' in {time.time() - started_at:.1f}s ({pulled}/{len(pulls)}).")
+                else:
+                    self.logger.info(f"Base image '{image}' is already held by the builder ({pulled}/{len(pulls)}).")
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for future in [executor.submit(pull, image, platforms) for image, platforms in pulls]:
+                future.result()
+
+    def build_image(self, package: DockerfileSection, load: bool, push: bool) -> None:
+        """
+        Containerize a given ROS package (existing Dockerfile).
+
+        :type package: rigel.models.DockerfileSection
+        :param package: The Dockerfile to use to containerize.
+        :type load: bool
+        :param package: Store built image locally.
+        :type push: bool
+        :param package: Store built image in a remote registry.
+        """
+        self.logger.warning(f"Creating Docker image using provided Dockerfile at {package.dockerfile}")
+
+        self.login_registry(package)
+
+        path = generate_paths(package)[0]
+
+        self.logger.info(f"Building Docker image {package.image}")
+        self.stream_build(package, path, tags=package.image, load=load, push=push)
+
+        self.logger.info(f"Docker image '{package.image}' built with success.")
+
+    def build_package(
+        self,
+        package: Union[DockerSection, DockerfileSection],
+        load: bool,
+        push: bool,
+        multi_platform_builder: Optional[MultiPlatformBuilder] = None
+    ) -> BuildResult:
+        """
+        Containerize a given ROS package and record the build duration.
+        All required builders must have been created beforehand (see function 'create_builders').
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+        :type load: bool
+        :param load: Store built image locally.
+        :type push: bool
+        :param push: Store built image in a remote registry.
+        :type multi_platform_builder: Optional[rigel.builds.MultiPlatformBuilder]
+        :param multi_platform_builder: If set, the image of each platform is built as a separate concurrent job.
+
+        :rtype: BuildResult
+        :return: The outcome of the build.
+        """
+        platforms = package.platforms if isinstance(package, DockerSection) else []
+        if self.metrics is not None:
+            self.metrics.set('rigel_build_context_bytes', self.build_context(package).size()[0], package=package.package)
+        previous = self.session.client.get_image(package.image) if load else None
+        started_at = time.time()
+        success = False
+        cache_hit = None
+        current = None
+        try:
+            if isinstance(package, DockerSection):
+                self.containerize_package(package, load, push, multi_platform_builder)
+            else:  # DockerfileSection
+                self.build_image(package, load, push)
+            success = True
+        finally:
+            duration = time.time() - started_at
+            if success and previous is not None:  # an unchanged local image means that every layer was cached
+                current = self.session.client.get_image(package.image)
+                cache_hit = current is not None and current.id == previous.id
+            if multi_platform_builder is None or not platforms:  # otherwise recorded per platform
+                self.timings.record(package.package, platforms, duration, cache_hit, success, started_at)
+            if self.metrics is not None:
+                self.record_build_metrics(package, duration, success, cache_hit, current.size if current is not None else None)
+
+        return BuildResult(
+            package=package.package,
+            image=package.image,
+            platforms=platforms,
+            duration=duration,
+            cache_hit=cache_hit
+        )
+
+    def record_build_metrics(
+        self,
+        package: Union[DockerSection, DockerfileSection],
+        duration: float,
+        success: bool,
+        cache_hit: Optional[bool],
+        image_size: Optional[int]
+    ) -> None:
+        """
+        Record the outcome of the build of a ROS package as metrics.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+        :type duration: float
+        :param duration: The build duration (seconds).
+        :type success: bool
+        :param success: Whether the build succeeded.
+        :type cache_hit: Optional[bool]
+        :param cache_hit: Whether the image was fully restored from cache. None if unknown.
+        :type image_size: Optional[int]
+        :param image_size: The size of the built Docker image (bytes). None if unknown.
+        """
+        assert self.metrics is not None
+        name = package.package
+        self.metrics.set('rigel_build_duration_seconds', duration, package=name, phase='total')
+        self.metrics.inc('rigel_builds_total', package=name, status='success' if success else 'failure')
+        if cache_hit is not None:
+            self.metrics.inc('rigel_build_cache_lookups_total', package=name)
+            self.metrics.inc('rigel_build_cache_hits_total', 1.0 if cache_hit else 0.0, package=name)
+            self.metrics.set(
+                'rigel_build_cache_hit_ratio',
+                self.metrics.total('rigel_build_cache_hits_total') / self.metrics.total('rigel_build_cache_lookups_total')
+            )
+        if image_size is not None:
+            self.metrics.set('rigel_image_size_bytes', image_size, package=name, image=package.image)
+
+    def bake_packages(
+        self,
+        packages: List[Union[DockerSection, DockerfileSection]],
+        desired_packages: List[Union[DockerSection, DockerfileSection]],
+        load: bool,
+        push: bool,
+        cache_dir: Optional[str]
+    ) -> List[BuildResult]:
+        """
+        Containerize several ROS packages with a single docker buildx bake invocation.
+        Stages shared by several ROS packages are then built only once.
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: All declared ROS packages.
+        :type desired_packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param desired_packages: The ROS packages to containerize.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type cache_dir: Optional[str]
+        :param cache_dir: Folder where to keep a local build cache for each ROS package, if any.
+
+        :rtype: List[BuildResult]
+        :return: The outcome of the build of each ROS package. All share the duration of the whole bake.
+        """
+        bake_file = self.create_bake_file(packages, cache_dir)
+
+        overrides: Dict[str, str] = {}
+        for package in desired_packages:
+            self.login_registry(package)
+            if isinstance(package, DockerSection):
+                target = BakeFileGenerator.target_name(package.package)
+                for key in package.ssh:
+                    if not key.file:  # NOTE: SSHKey model ensures that environment variable is declared.
+                        overrides[f'{target}.args.{key.value}'] = os.environ[key.value]
+
+        docker_packages = [package for package in desired_packages if isinstance(package, DockerSection)]
+        platforms = sorted({p for package in docker_packages for p in package.platforms})
+
+        self.create_builders(platforms)
+        try:
+            targets = [BakeFileGenerator.target_name(package.package) for package in desired_packages]
+            self.logger.info(f"Baking targets {', '.join(targets)}")
+            started_at = time.time()
+            run_bake(self.session.client, bake_file, targets, load, push, overrides)
+            duration = time.time() - started_at
+            for package in desired_packages:
+                self.logger.info(f"Docker image '{package.image}' built with success.")
+        finally:
+            # In all situations make sure to remove the builders if existent
+            self.remove_builders(platforms)
+
+        return [
+            BuildResult(
+                package=package.package,
+                image=package.image,
+                platforms=package.platforms if isinstance(package, DockerSection) else [],
+                duration=duration
+            )
+            for package in desired_packages
+        ]
+
+    def build(
+        self,
+        pkg: Optional[List[str]] = None,
+        load: bool = False,
+        push: bool = False,
+        jobs: Optional[int] = None,
+        split_platforms: bool = False,
+        builder_endpoints: Optional[List[str]] = None,
+        bake: bool = False,
+        cache_dir: Optional[str] = None,
+        changed_since: Optional[str] = None,
+        shard: Optional[str] = None,
+        resume: bool = False,
+        preflight: bool = True,
+        pull: bool = True
+    ) -> List[BuildResult]:
+        """
+        Build a Docker image of the ROS packages.
+        Progress is journaled (see file '.rigel_config/journal.json') so that interrupted or failed runs can be resumed.
+        Runs building a single ROS package are not journaled unless resumed.
+
+        :type pkg: Optional[List[string]]
+        :param pkg: Names or shell-style patterns of the desired ROS packages. All if not set.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of ROS packages to build concurrently. Computed from the available resources if not set.
+        :type split_platforms: bool
+        :param split_platforms: Build each platform image as a separate concurrent job.
+        :type builder_endpoints: Optional[List[string]]
+        :param builder_endpoints: Remote BuildKit endpoints per platform (e.g. 'linux/arm64=tcp://arm-node:1234').
+        :type bake: bool
+        :param bake: Build all ROS packages with a single docker buildx bake invocation.
+        :type cache_dir: Optional[string]
+        :param cache_dir: Folder where to keep a local build cache for each ROS package (bake only).
+        :type changed_since: Optional[string]
+        :param changed_since: Only build ROS packages affected by changes made since this git revision.
+        :type shard: Optional[string]
+        :param shard: Only build one shard of the desired ROS packages (e.g. '2/4').
+        :type resume: bool
+        :param resume: Skip ROS packages built with success by the previous run whose inputs did not change.
+        :type preflight: bool
+        :param preflight: Check whether all ROS packages are ready to be built before building any of them.
+        :type pull: bool
+        :param pull: Pull the base images of all ROS packages concurrently before building any of them.
+
+        :rtype: List[BuildResult]
+        :return: The outcome of the build of each ROS package, in order of declaration.
+        """
+        with self.workdir():
+            rigelfile = self.parse(None if bake or changed_since else pkg or None)
+            desired_packages = select_packages(rigelfile.packages, pkg or [])
+
+            if changed_since:
+                detector = ChangeDetector(changed_since)
+                affected = [package.package for package in detector.affected_packages(rigelfile.packages)]
+                desired_packages = [package for package in desired_packages if package.package in affected]
+                if not desired_packages:
+                    self.logger.info(f"No packages affected by changes since '{changed_since}'.")
+                    return []
+                self.logger.info(f"Packages affected by changes since '{changed_since}': "
+                                 f"{', '.join(package.package for package in desired_packages)}")
+
+            desired_packages = self.select(desired_packages, shard)
+            if not desired_packages:
+                return []
+
+            if bake:
+                if preflight:
+                    self.ensure_ready(rigelfile.packages, desired_packages)
+                return self.bake_packages(rigelfile.packages, desired_packages, load, push, cache_dir)
+
+            endpoints = parse_builder_endpoints(builder_endpoints or [])
+
+            digests, results = self.start_journal(rigelfile.packages, desired_packages, load, push, resume)
+
+            order = [package.package for package in desired_packages]
+            desired_packages = [package for package in desired_packages if package.package not in results]
+            if not desired_packages:
+                return [results[name] for name in order]
+
+            if preflight:
+                self.ensure_ready(rigelfile.packages, desired_packages)
+
+            multi_platform_builder = None
+            if split_platforms:
+                multi_platform_builder = MultiPlatformBuilder(self.session.client, RIGEL_BUILDER, endpoints, self.logger)
+
+            packages = {package.package: package for package in desired_packages}
+
+            def build_package(name: str) -> None:
+                results[name] = self.build_package(packages[name], load, push, multi_platform_builder)
+                if name in digests:
+                    self.journal.record(name, digests[name], packages[name].image)
+
+            pull_packages = rigelfile.packages if pull and multi_platform_builder is None else None
+            self.dispatch_builds(desired_packages, jobs, build_package, multi_platform_builder, pull_packages)
+            return [results[name] for name in order]
+
+    def start_journal(
+        self,
+        declared: List[Union[DockerSection, DockerfileSection]],
+        packages: List[Union[DockerSection, DockerfileSection]],
+        load: bool,
+        push: bool,
+        resume: bool
+    ) -> Tuple[Dict[str, str], Dict[str, BuildResult]]:
+        """
+        Start journaling a build run, either resuming the previous run or forgetting it.
+        Input digests are only computed if resuming or if a later run may skip part of this one,
+        i.e. more than one ROS package is about to be built.
+
+        :type declared: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param declared: All declared ROS packages.
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The desired ROS packages.
+        :type load: bool
+        :param load: Whether built images are stored locally.
+        :type push: bool
+        :param push: Whether built images are stored in a remote registry.
+        :type resume: bool
+        :param resume: Skip ROS packages built with success by the previous run whose inputs did not change.
+
+        :rtype: Tuple[Dict[string, string], Dict[string, BuildResult]]
+        :return: The input digest of each ROS package to journal and the outcome of each ROS package
+        that need not be built again.
+        """
+        digests: Dict[str, str] = {}
+        if resume or len(packages) > 1:
+            digests = self.input_digests(declared, packages, load, push)
+        if not resume:
+            self.journal.clear()
+            return digests, {}
+
+        results: Dict[str, BuildResult] = {}
+        for package in packages:
+            if self.journal.completed(package.package, digests[package.package]):
+                results[package.package] = BuildResult(
+                    package=package.package,
+                    image=package.image,
+                    platforms=package.platforms if isinstance(package, DockerSection) else [],
+                    duration=0.0,
+                    resumed=True
+                )
+        if results:
+            self.logger.info(f"Resuming previous run. Skipping {len(results)} packages already built: "
+                             f"{', '.join(results)}")
+        return digests, results
+
+    def dispatch_builds(
+        self,
+        packages: List[Union[DockerSection, DockerfileSection]],
+        jobs: Optional[int],
+        build_package: Callable[[str], None],
+        multi_platform_builder: Optional[MultiPlatformBuilder] = None,
+        pull_packages: Optional[List[Union[DockerSection, DockerfileSection]]] = None
+    ) -> None:
+        """
+        Build ROS packages concurrently, once the required builders exist. The builders are removed afterwards.
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to build.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of ROS packages to build concurrently. Computed from the available resources if not set.
+        :type build_package: Callable[[string], None]
+        :param build_package: Builds the ROS package with the given name.
+        :type multi_platform_builder: Optional[MultiPlatformBuilder]
+        :param multi_platform_builder: Builds each platform image separately if set.
+        :type pull_packages: Optional[List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]]
+        :param pull_packages: All declared ROS packages, if base images are to be pulled before building.
+        """
+        docker_packages = [package for package in packages if isinstance(package, DockerSection)]
+        platforms = sorted({p for package in docker_packages for p in package.platforms})
+        scheduler = self.scheduler(packages, jobs)
+
+        if docker_packages:
+            self.create_builders(platforms, multi_platform_builder)
+        try:
+            if pull_packages is not None:
+                self.pull_base_images(pull_packages, packages)
+            scheduler.run(build_package)
+        finally:
+            # In all situations make sure to remove the builders if existent
+            if docker_packages:
+                self.remove_builders(platforms, multi_platform_builder)
+
+    def input_digests(
+        self,
+        declared: List[Union[DockerSection, DockerfileSection]],
+        packages: List[Union[DockerSection, DockerfileSection]],
+        load: bool,
+        push: bool
+    ) -> Dict[str, str]:
+        """
+        Compute a digest of everything the images of ROS packages are built from: their declaration, build files,
+        build context and the digests of the ROS packages they depend upon.
+
+        :type declared: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param declared: All declared ROS packages.
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages whose digest is required.
+        :type load: bool
+        :param load: Whether built images are stored locally.
+        :type push: bool
+        :param push: Whether built images are stored in a remote registry.
+
+        :rtype: Dict[string, string]
+        :return: The digest of each ROS package (and of all ROS packages they depend upon).
+        """
+        declarations = {package.package: package for package in declared + packages}
+        digests: Dict[str, str] = {}
+
+        for package in packages:
+            stack = [package.package]
+            while stack:  # dependencies first (iteratively, since chains of dependencies may be long)
+                name = stack[-1]
+                if name in digests:
+                    stack.pop()
+                    continue
+                current = declarations[name]
+                missing = [d for d in current.depends_on if d in declarations and d not in digests and d not in stack]
+                if missing:
+                    stack.extend(missing)
+                    continue
+
+                # Rigel state (journal, timings, logs, build files of other packages) lies inside the build context
+                # of ROS packages whose folder is the project root. Only the build files of the ROS package itself
+                # are inputs and these are added below.
+                context = self.build_context(current)
+                files = [
+                    os.path.join(context.root, path) for path, _ in context.files() if '.rigel_config' not in path.split('/')
+                ]
+                if isinstance(current, DockerSection):
+                    build_files = generate_paths(current)[1]
+                    files.extend(os.path.join(build_files, name) for name in BUILD_FILES)
+                    files.extend(ssh_key_path(current, key) for key in current.ssh if key.file)
+
+                declaration = current.dict()
+                declaration.update({'load': load, 'push': push})
+                digests[name] = input_digest(declaration, files, [digests.get(d, '') for d in current.depends_on])
+                stack.pop()
+
+        return digests
+
+    def scheduler(self, packages: List[Union[DockerSection, DockerfileSection]], jobs: Optional[int]) -> BuildScheduler:
+        """
+        Plan the concurrent containerization of ROS packages.
+        The longest chains of builds start first and builds only start while their declared
+        resource usage fits the CPUs and memory available to Rigel (see cgroups).
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to containerize.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of ROS packages to build concurrently. Computed from the available resources if not set.
+
+        :rtype: rigel.builds.BuildScheduler
+        :return: The scheduler.
+        """
+        budget = detect_budget()
+        if jobs is None:
+            jobs = default_jobs(budget)
+            self.logger.info(f'Building up to {jobs} packages concurrently ({budget.cpus:g} CPUs, '
+                             f'{(budget.memory or 0) / 1024 ** 3:.1f} GiB of memory available).')
+        return BuildScheduler(
+            {package.package: package.depends_on for package in packages},
+            jobs,
+            self.timings.expected_durations(),
+            {package.package: package.resources for package in packages if package.resources is not None},
+            budget
+        )
+
+    def watched_paths(self, rigelfile: Rigelfile, names: List[str]) -> List[str]:
+        """
+        List the files and folders to watch for changes while rebuilding ROS packages.
+
+        :type rigelfile: rigel.models.Rigelfile
+        :param rigelfile: The parsed Rigelfile.
+        :type names: List[string]
+        :param names: The names of the ROS packages to rebuild.
+
+        :rtype: List[string]
+        :return: The absolute paths of the Rigelfile, the Rigelfile fragments and the inputs of the ROS packages.
+        """
+        paths = [path for path, _, _ in self.sources(rigelfile.include)]
+        with self.workdir():
+            for package in rigelfile.packages:
+                if package.package in names:
+                    paths.extend(ChangeDetector.inputs(package))
+        return paths
+
+    def watch(
+        self,
+        pkg: Optional[List[str]] = None,
+        load: bool = False,
+        push: bool = False,
+        jobs: Optional[int] = None,
+        delay: float = 0.5,
+        polling: bool = False,
+        stop: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Build a Docker image of the ROS packages and build it again whenever the ROS packages change.
+
+        The Rigelfile, the Rigelfile fragments and the source folder and .rosinstall files of each ROS package
+        are watched for changes. Once a burst of changes finishes only the affected ROS packages (and their
+        dependents) are built again. Build files are created again for ROS packages whose declaration changed.
+        Builds in progress are cancelled and started again whenever newer changes arrive.
+
+        :type pkg: Optional[List[string]]
+        :param pkg: Names or shell-style patterns of the desired ROS packages. All if not set.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of ROS packages to build concurrently. Computed from the available resources if not set.
+        :type delay: float
+        :param delay: Time without further changes after which a burst of changes is considered finished (seconds).
+        :type polling: bool
+        :param polling: Detect changes by periodically comparing the state of files instead of using inotify.
+        :type stop: Optional[threading.Event]
+        :param stop: Stop watching once set. Otherwise watch until interrupted.
+        """
+        rigelfile = self.parse()
+        names = [package.package for package in select_packages(rigelfile.packages, pkg or [])]
+        pending, render = set(names), set(names)
+        current: Optional[RebuildRound] = None
+
+        watcher = create_watcher(self.watched_paths(rigelfile, names), polling)
+        try:
+            while stop is None or not stop.is_set():
+                current = self.dispatch_rebuild(current, rigelfile, pending, render, load, push, jobs)
+
+                changed = watcher.wait(delay, 0.5)
+                if not changed:
+                    continue
+
+                affected: Set[str] = set()
+                if changed.intersection(path for path, _, _ in self.sources(rigelfile.include)):
+                    previous = {package.package: package for package in rigelfile.packages}
+                    try:
+                        rigelfile = self.parse()
+                        names = [package.package for package in select_packages(rigelfile.packages, pkg or [])]
+                    except RigelError as err:
+                        self.logger.error(f'Unable to use changed Rigelfile: {err}')
+                        continue
+                    modified = {p.package for p in rigelfile.packages if previous.get(p.package) != p}
+                    affected.update(modified)
+                    render.update(modified)
+                    watcher.close()
+                    watcher = create_watcher(self.watched_paths(rigelfile, names), polling)
+
+                affected = add_dependents(rigelfile.packages, affected | self.changed_packages(rigelfile, changed))
+                affected.intersection_update(names)
+                if not affected:
+                    continue
+                self.logger.warning(f"Changes detected for packages {', '.join(sorted(affected))}.")
+
+                if current is not None and current.is_alive():
+                    self.logger.warning('Cancelling builds in progress.')
+                    current.cancel()
+                    pending.update(set(current.packages) - current.completed)
+                    render.update(package.package for package in current.render if package.package not in current.rendered)
+                    current = None
+
+                pending.update(affected)
+                pending.intersection_update(names)
+
+        finally:
+            if current is not None:
+                current.cancel()
+            watcher.close()
+
+    def dispatch_rebuild(
+        self,
+        current: Optional[RebuildRound],
+        rigelfile: Rigelfile,
+        pending: Set[str],
+        render: Set[str],
+        load: bool,
+        push: bool,
+        jobs: Optional[int]
+    ) -> Optional[RebuildRound]:
+        """
+        Start a new round of builds while watching for changes once the current round (if any) finishes.
+
+        :type current: Optional[RebuildRound]
+        :param current: The round of builds in progress, if any.
+        :type rigelfile: rigel.models.Rigelfile
+        :param rigelfile: The parsed Rigelfile.
+        :type pending: Set[string]
+        :param pending: The names of the ROS packages waiting to be built. Cleared once their round starts.
+        :type render: Set[string]
+        :param render: The names of the ROS packages whose build files must be created. Cleared once their round starts.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of ROS packages to build concurrently. Computed from the available resources if not set.
+
+        :rtype: Optional[RebuildRound]
+        :return: The round of builds in progress, if any.
+        """
+        if current is not None and not current.is_alive():
+            if current.error is not None:
+                self.logger.error(f'Build failed: {current.error}')
+            self.logger.info('Waiting for changes.')
+            current = None
+
+        if current is None and pending:
+            packages = [package for package in rigelfile.packages if package.package in pending]
+            current = RebuildRound(
+                self,
+                packages,
+                [p for p in packages if isinstance(p, DockerSection) and p.package in render],
+                load,
+                push,
+                jobs
+            )
+            current.start()
+            pending.clear()
+            render.clear()
+
+        return current
+
+    def changed_packages(self, rigelfile: Rigelfile, changed: Set[str]) -> Set[str]:
+        """
+        Find which ROS packages have inputs among changed files.
+
+        :type rigelfile: rigel.models.Rigelfile
+        :param rigelfile: The parsed Rigelfile.
+        :type changed: Set[string]
+        :param changed: The absolute paths of the changed files and folders.
+
+        :rtype: Set[string]
+        :return: The names of the ROS packages whose inputs changed.
+        """
+        affected: Set[str] = set()
+        with self.workdir():
+            for package in rigelfile.packages:
+                inputs = ChangeDetector.inputs(package)
+                if any(file == path or file.startswith(path + os.sep) for file in changed for path in inputs):
+                    affected.add(package.package)
+        return affected
+
+    def build_context(self, package: Union[DockerSection, DockerfileSection]) -> BuildContext:
+        """
+        Get the build context sent to the builder when containerizing a given ROS package.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+
+        :rtype: rigel.files.BuildContext
+        :return: The build context.
+        """
+        with self.workdir():
+            if isinstance(package, DockerSection):
+                root, dockerfile_folder = generate_paths(package)
+                dockerignore = f'{dockerfile_folder}/Dockerfile.dockerignore'
+                if os.path.isfile(dockerignore):  # Dockerfile-specific ignore files take precedence
+                    return BuildContext.from_dockerignore(root, dockerignore)
+                return BuildContext.from_dockerignore(root)
+            return BuildContext.from_dockerignore(generate_paths(package)[0])
+
+    def load_plugin(
+        self,
+        plugin: PluginSection,
+        application_args: List[Any],
+        application_kwargs: Dict[str, Any]
+    ) -> Plugin:
+        """
+        Load an external plugin.
+
+        :type plugin: rigel.models.PluginSection
+        :param plugin: Metadata about the external plugin.
+        :type application_args: List[Any]
+        :param application_args: Additional positional arguments to be passed the plugin.
+        :type application_kwargs: Dict[str, Any]
+        :param application_kwargs: Additional keyword arguments to be passed the plugin.
+
+        :rtype: rigel.plugin.Plugin
+        :return: An instance of the external plugin.
+        """
+        self.logger.warning(f"Loading external plugin '{plugin.name}'.")
+
+        # Do not change the plugin declaration since the Rigelfile is parsed only once.
+        plugin = plugin.copy(deep=True)
+        if application_args:
+            plugin.args = application_args + plugin.args
+
+        if application_kwargs:
+            plugin.kwargs.update(application_kwargs)
+
+        plugin_instance: Plugin = PluginLoader().load(plugin)
+        return plugin_instance
+
+    def run_plugin(
+        self,
+        name: str,
+        plugin: Plugin,
+        manager: Optional[SimulationRequirementsManager] = None,
+        statements: Optional[List[str]] = None
+    ) -> PluginResult:
+        """
+        Run an external plugin. The plugin is always stopped afterwards.
+
+        :type name: string
+        :param name: The name of the external plugin.
+        :type plugin: rigel.plugin.Plugin
+        :param plugin: The external plugin to be run.
+        :type manager: Optional[rigelcore.simulations.SimulationRequirementsManager]
+        :param manager: The simulation requirements to wait for, if the plugin starts a simulation.
+        :type statements: Optional[List[string]]
+        :param statements: The HPL statements of the simulation requirements, in the same order (used to label metrics).
+
+        :rtype: PluginResult
+        :return: The outcome of the execution.
+        """
+        started_at = time.time()
+        self.plugins[name] = plugin
+        success = False
+        try:
+            self.logger.warning(f"Executing external plugin '{name}'.")
+            labelled(f'plugin[{name}].run', plugin.run)()  # a separate frame per plugin in profiles
+
+            report = ''
+            if manager is not None:
+                self.logger.warning("Simulation started.")
+                simulation_started_at = time.time()
+                while not manager.finished:  # wait for test stage to finish
+                    time.sleep(0.1)
+                report = str(manager)
+                if self.metrics is not None:
+                    self.record_simulation_metrics(name, manager, statements or [], time.time() - simulation_started_at)
+            success = True
+        finally:
+            if self.plugins.pop(name, None) is not None:  # not stopped elsewhere
+                plugin.stop()
+            if self.metrics is not None:
+                self.metrics.set('rigel_plugin_duration_seconds', time.time() - started_at, plugin=name)
+                self.metrics.inc('rigel_plugin_runs_total', plugin=name, status='success' if success else 'failure')
+
+        self.logger.info(f"Plugin '{name}' finished execution with success.")
+        return PluginResult(plugin=name, duration=time.time() - started_at, report=report)
+
+    def record_simulation_metrics(
+        self,
+        name: str,
+        manager: SimulationRequirementsManager,
+        statements: List[str],
+        verdict_time: float
+    ) -> None:
+        """
+        Record the verdict of a simulation as metrics.
+
+        :type name: string
+        :param name: The name of the external simulation plugin.
+        :type manager: rigelcore.simulations.SimulationRequirementsManager
+        :param manager: The simulation requirements.
+        :type statements: List[string]
+        :param statements: The HPL statements of the simulation requirements. Requirements are numbered if missing.
+        :type verdict_time: float
+        :param verdict_time: Time from the start of the simulation until its verdict (seconds).
+        """
+        assert self.metrics is not None
+        self.metrics.set('rigel_simulation_verdict_seconds', verdict_time, plugin=name)
+        for index, requirement in enumerate(manager.children):
+            assert isinstance(requirement, SimulationRequirementNode)  # children are requirement nodes
+            self.metrics.set(
+                'rigel_simulation_requirement_satisfied',
+                1.0 if requirement.satisfied else 0.0,
+                plugin=name,
+                requirement=statements[index] if index < len(statements) else str(index)
+            )
+
+    def stop_plugin(self, name: str) -> None:
+        """
+        Stop an external plugin, if currently executing.
+
+        :type name: string
+        :param name: The name of the external plugin.
+        """
+        plugin = self.plugins.pop(name, None)
+        if plugin is not None:
+            plugin.stop()
+            self.logger.info(f"Plugin '{name}' stopped executing gracefully.")
+
+    def stop_plugins(self) -> None:
+        """
+        Stop all external plugins currently executing.
+        """
+        for name in list(self.plugins):
+            self.stop_plugin(name)
+
+    def deploy(self) -> List[PluginResult]:
+        """
+        Run all external deployment plugins declared inside the Rigelfile.
+
+        :rtype: List[PluginResult]
+        :return: The outcome of each external plugin.
+        """
+        with self.workdir():
+            rigelfile = self.parse()
+            if not rigelfile.deploy:
+                self.logger.warning('No deployment plugin declared inside Rigelfile.')
+                return []
+
+            return [
+                self.run_plugin(plugin_section.name, self.load_plugin(plugin_section, [], {}))
+                for plugin_section in rigelfile.deploy
+            ]
+
+    def run(self) -> List[PluginResult]:
+        """
+        Run all external simulation plugins declared inside the Rigelfile.
+
+        :rtype: List[PluginResult]
+        :return: The outcome of each external plugin, including the status of the simulation requirements.
+        """
+        with self.workdir():
+            rigelfile = self.parse()
+            if not rigelfile.simulate:
+                self.logger.warning('No simulation plugin declared inside Rigelfile.')
+                return []
+
+            results = []
+            for plugin_section in rigelfile.simulate.plugins:
+
+                requirements_manager = SimulationRequirementsManager(rigelfile.simulate.timeout)
+
+                # Parse simulation requirements.
+                requirements_parser = SimulationRequirementsParser()
+                for hpl_statement in rigelfile.simulate.introspection:
+                    requirement = requirements_parser.parse(hpl_statement)
+                    requirement.father = requirements_manager
+                    requirements_manager.children.append(requirement)
+
+                # Run external simulation plugins.
+                plugin = self.load_plugin(plugin_section, [requirements_manager], {})
+                results.append(
+                    self.run_plugin(plugin_section.name, plugin, requirements_manager, rigelfile.simulate.introspection)
+                )
+
+            return results
+
+
+class AsyncProject:
+    """
+    An asyncio variant of class Project.
+
+    Blocking operations (Docker builds and external plugins) are run by a pool of threads
+    so that many ROS packages and external plugins may be awaited concurrently from a single event loop.
+    Cancelling a deployment stops the affected external plugins. Builders are shared by all concurrent builds
+    and removed once the last of them finishes or is cancelled, which also aborts builds still in progress.
+    """
+
+    def __init__(
+        self,
+        path: str = '.',
+        logger: Optional[MessageLogger] = None,
+        session: Optional[DockerSession] = None,
+        executor: Optional[Executor] = None
+    ) -> None:
+        """
+        :type path: string
+        :param path: The folder containing the Rigelfile.
+        :type logger: Optional[rigelcore.loggers.MessageLogger]
+        :param logger: The logger for progress messages.
+        :type session: Optional[rigel.builds.DockerSession]
+        :param session: The Docker session to use.
+        :type executor: Optional[concurrent.futures.Executor]
+        :param executor: The pool of threads running blocking operations. Defaults to the one of the event loop.
+        """
+        self.project = Project(path, logger, session)
+        self.executor = executor
+        self.__builds = 0  # number of builds currently using the builders
+        self.__builders_lock: Optional[asyncio.Lock] = None  # bound to the running event loop once required
+
+    async def __call(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Auxiliary function that runs a blocking function inside the folder of the Rigelfile
+        without blocking the event loop.
+
+        :type function: Callable[..., T]
+        :param function: The blocking function.
+
+        :rtype: T
+        :return: The value returned by the function.
+        """
+        def call() -> T:
+            with self.project.workdir():
+                return function(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, call)
+
+    async def __complete(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Auxiliary function that runs a blocking function that must complete even if the awaiting task is cancelled.
+
+        :type function: Callable[..., T]
+        :param function: The blocking function.
+
+        :rtype: T
+        :return: The value returned by the function.
+        """
+        future = asyncio.ensure_future(self.__call(function, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    async def parse(self, patterns: Optional[List[str]] = None) -> Rigelfile:
+        """
+        Parse information inside the Rigelfile (see function 'Project.parse').
+
+        :type patterns: Optional[List[string]]
+        :param patterns: Names or shell-style patterns of the desired ROS packages.
+
+        :rtype: rigel.models.Rigelfile
+        :return: The parsed information.
+        """
+        return await self.__call(self.project.parse, patterns)
+
+    async def __acquire_builders(self) -> None:
+        """
+        Auxiliary function that creates the builders unless some other build is already using them.
+        """
+        if self.__builders_lock is None:
+            self.__builders_lock = asyncio.Lock()
+        async with self.__builders_lock:
+            if not self.__builds:
+                try:
+                    await self.__complete(self.project.create_builders, [])
+                except asyncio.CancelledError:
+                    await self.__complete(self.project.remove_builders, [])
+                    raise
+            self.__builds += 1
+
+    async def __release_builders(self) -> None:
+        """
+        Auxiliary function that removes the builders unless some other build is still using them.
+        """
+        assert self.__builders_lock is not None
+        async with self.__builders_lock:
+            self.__builds -= 1
+            if not self.__builds:
+                await self.__complete(self.project.remove_builders, [])
+
+    @asynccontextmanager
+    async def builders(self) -> AsyncIterator[None]:
+        """
+        Ensure that the builders required to containerize ROS packages exist while a block of code runs.
+        """
+        await self.__acquire_builders()
+        try:
+            yield
+        finally:
+            # In all situations make sure to remove the builders once no longer required.
+            await asyncio.shield(self.__release_builders())
+
+    async def build_package(
+        self,
+        package: Union[str, DockerSection, DockerfileSection],
+        load: bool = False,
+        push: bool = False
+    ) -> BuildResult:
+        """
+        Containerize a given ROS package and record the build duration.
+        Dependencies between ROS packages are not considered (see function 'build').
+
+        :type package: Union[string, rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package or its name.
+        :type load: bool
+        :param load: Store built image locally.
+        :type push: bool
+        :param push: Store built image in a remote registry.
+
+        :rtype: BuildResult
+        :return: The outcome of the build.
+        """
+        if isinstance(package, str):
+            name = package
+            package = [p for p in select_packages((await self.parse([name])).packages, [name]) if p.package == name][0]
+
+        if isinstance(package, DockerfileSection):
+            return await self.__call(self.project.build_package, package, load, push)
+
+        async with self.builders():
+            return await self.__call(self.project.build_package, package, load, push)
+
+    async def build(
+        self,
+        pkg: Optional[List[str]] = None,
+        load: bool = False,
+        push: bool = False,
+        jobs: int = 1
+    ) -> List[BuildResult]:
+        """
+        Build a Docker image of the ROS packages.
+        A ROS package is only built once all ROS packages it depends upon were built.
+
+        :type pkg: Optional[List[string]]
+        :param pkg: Names or shell-style patterns of the desired ROS packages. All if not set.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type jobs: int
+        :param jobs: Maximum number of ROS packages to build concurrently.
+
+        :rtype: List[BuildResult]
+        :return: The outcome of the build of each ROS package, in order of declaration.
+        """
+        rigelfile = await self.parse(pkg or None)
+        desired_packages = select_packages(rigelfile.packages, pkg or [])
+        semaphore = asyncio.Semaphore(max(1, jobs))
+        tasks: Dict[str, 'asyncio.Future[BuildResult]'] = {}
+
+        async def build_package(package: Union[DockerSection, DockerfileSection]) -> BuildResult:
+            for dependency in package.depends_on:
+                if dependency in tasks:
+                    await tasks[dependency]
+            async with semaphore:
+                return await self.build_package(package, load, push)
+
+        async with AsyncExitStack() as stack:
+            if any(isinstance(package, DockerSection) for package in desired_packages):
+                await stack.enter_async_context(self.builders())  # shared by all builds
+            for package in desired_packages:
+                tasks[package.package] = asyncio.ensure_future(build_package(package))
+            try:
+                return list(await asyncio.gather(*tasks.values()))
+            finally:
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    async def run_plugin(self, plugin: PluginSection) -> PluginResult:
+        """
+        Load and run an external plugin. The plugin is stopped if the awaiting task is cancelled.
+
+        :type plugin: rigel.models.PluginSection
+        :param plugin: Metadata about the external plugin.
+
+        :rtype: PluginResult
+        :return: The outcome of the execution.
+        """
+        plugin_instance = await self.__call(self.project.load_plugin, plugin, [], {})
+        try:
+            return await self.__call(self.project.run_plugin, plugin.name, plugin_instance)
+        except asyncio.CancelledError:
+            await self.__complete(self.project.stop_plugin, plugin.name)
+            raise
+
+    async def deploy(self) -> List[PluginResult]:
+        """
+        Run concurrently all external deployment plugins declared inside the Rigelfile.
+        If a plugin fails all others are stopped.
+
+        :rtype: List[PluginResult]
+        :return: The outcome of each external plugin.
+        """
+        rigelfile = await self.parse()
+        if not rigelfile.deploy:
+            self.project.logger.warning('No deployment plugin declared inside Rigelfile.')
+            return []
+
+        tasks = [asyncio.ensure_future(self.run_plugin(plugin)) for plugin in rigelfile.deploy]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
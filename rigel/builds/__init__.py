@@ -0,0 +1,15 @@
+from .bake import BakeFileGenerator, run_bake  # noqa: F401
+from .journal import BuildJournal, input_digest  # noqa: F401
+from .lock import pin_image, resolve_image_digest  # noqa: F401
+from .logs import BuildLog, stream_build  # noqa: F401
+from .paths import generate_paths, ssh_key_path  # noqa: F401
+from .platforms import MultiPlatformBuilder, parse_builder_endpoints  # noqa: F401
+from .preflight import base_images, PreflightChecker, PreflightFailure, preflight_report  # noqa: F401
+from .pull import base_image_pulls, pull_base_image  # noqa: F401
+from .resources import default_jobs, detect_budget  # noqa: F401
+from .scheduler import BuildScheduler  # noqa: F401
+from .selection import add_dependents, ChangeDetector, select_packages  # noqa: F401
+from .session import DockerSession  # noqa: F401
+from .sharding import parse_shard, shard_packages  # noqa: F401
+from .timings import BuildRecord, TimingDatabase  # noqa: F401
+from .watcher import create_watcher, FileWatcher, InotifyWatcher, PollingWatcher  # noqa: F401
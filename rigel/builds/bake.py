@@ -0,0 +1,148 @@
+import json
+import os
+import python_on_whales
+import re
+from rigel.models import DockerSection, DockerfileSection
+from rigelcore.clients import DockerClient
+from rigelcore.exceptions import DockerAPIError
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class BakeFileGenerator:
+    """
+    A class to describe the containerization of several ROS packages as a single 'docker buildx bake' definition.
+
+    Every ROS package becomes one bake target and all targets are gathered in the 'default' group.
+    Dependencies between ROS packages are expressed as named contexts ('target:<name>'),
+    so that images built upon images of other packages are resolved within the same BuildKit solve.
+    Values of build arguments are never written to the definition, only their names.
+    """
+
+    def __init__(
+        self,
+        packages: List[Union[DockerSection, DockerfileSection]],
+        paths: Dict[str, Tuple[str, str]],
+        cache_dir: Optional[str] = None
+    ) -> None:
+        """
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages to containerize.
+        :type paths: Dict[str, Tuple[str, str]]
+        :param paths: The build context root and the Dockerfile path of each ROS package.
+        :type cache_dir: Optional[string]
+        :param cache_dir: Folder where to keep a local BuildKit cache for each ROS package, if any.
+        """
+        self.packages = packages
+        self.paths = paths
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def target_name(package: str) -> str:
+        """
+        Compute the name of the bake target of a ROS package.
+
+        :type package: string
+        :param package: The name of the ROS package.
+
+        :rtype: string
+        :return: A valid bake target name.
+        """
+        return re.sub(r'[^a-zA-Z0-9_-]', '-', package)
+
+    def target(self, package: Union[DockerSection, DockerfileSection]) -> Dict[str, Any]:
+        """
+        Describe the containerization of a single ROS package as a bake target.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+
+        :rtype: Dict[str, Any]
+        :return: The bake target.
+        """
+        context, dockerfile = self.paths[package.package]
+        target: Dict[str, Any] = {
+            'context': context,
+            'dockerfile': dockerfile,
+            'tags': [package.image]
+        }
+
+        if isinstance(package, DockerSection):
+            if package.platforms:
+                target['platforms'] = package.platforms
+            args = [key.value for key in package.ssh if not key.file]
+            if args:
+                target['args'] = {arg: None for arg in args}  # values are only set when baking
+
+        images = {p.package: p.image for p in self.packages}
+        contexts = {
+            images[dependency]: f'target:{self.target_name(dependency)}'
+            for dependency in package.depends_on if dependency in images
+        }
+        if contexts:
+            target['contexts'] = contexts
+
+        if self.cache_dir:
+            cache = os.path.join(self.cache_dir, self.target_name(package.package))
+            target['cache-from'] = [f'type=local,src={cache}']
+            target['cache-to'] = [f'type=local,dest={cache},mode=max']
+
+        return target
+
+    def generate(self) -> Dict[str, Any]:
+        """
+        Describe the containerization of all ROS packages.
+
+        :rtype: Dict[str, Any]
+        :return: The bake definition.
+        """
+        targets = {self.target_name(package.package): self.target(package) for package in self.packages}
+        return {
+            'group': {'default': {'targets': list(targets)}},
+            'target': targets
+        }
+
+    def write(self, filepath: str) -> None:
+        """
+        Write the bake definition of all ROS packages to a JSON file.
+
+        :type filepath: string
+        :param filepath: The path of the bake file.
+        """
+        with open(filepath, 'w+') as bake_file:
+            json.dump(self.generate(), bake_file, indent=2)
+
+
+def run_bake(
+    docker: DockerClient,
+    filepath: str,
+    targets: List[str],
+    load: bool,
+    push: bool,
+    overrides: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    Build several bake targets with a single BuildKit solve.
+
+    :type docker: rigelcore.clients.DockerClient
+    :param docker: The Docker client.
+    :type filepath: string
+    :param filepath: The path of the bake file.
+    :type targets: List[string]
+    :param targets: The targets to build.
+    :type load: bool
+    :param load: Store built images locally.
+    :type push: bool
+    :param push: Store built images in a remote registry.
+    :type overrides: Optional[Dict[str, str]]
+    :param overrides: Overrides of target attributes (e.g. {'target.args.KEY': 'value'}).
+    """
+    try:
+        docker.client.buildx.bake(
+            targets=targets,
+            files=[filepath],
+            load=load,
+            push=push,
+            set=overrides or {}
+        )
+    except python_on_whales.exceptions.DockerException as exception:
+        raise DockerAPIError(exception=exception)
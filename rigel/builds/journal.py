@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def input_digest(declaration: Dict[str, Any], files: Iterable[str], dependencies: List[str]) -> str:
+    """
+    Compute a digest of everything the image of a ROS package is built from.
+    Files are identified by their path, size and modification time rather than by their content,
+    so that the digest is cheap to compute even for large build contexts.
+
+    :type declaration: Dict[string, Any]
+    :param declaration: The declaration of the ROS package (and any build options that affect the outcome).
+    :type files: Iterable[string]
+    :param files: The absolute paths of the files sent to the builder.
+    :type dependencies: List[string]
+    :param dependencies: The input digests of the ROS packages it depends upon.
+
+    :rtype: string
+    :return: The digest (hexadecimal SHA-256).
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'declaration': declaration, 'dependencies': dependencies}, sort_keys=True, default=str).encode())
+    for path in sorted(set(files)):
+        try:
+            stat = os.stat(path)
+            fingerprint = f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0'
+        except OSError:
+            fingerprint = f'{path}\0missing\0'
+        digest.update(fingerprint.encode())
+    return digest.hexdigest()
+
+
+class BuildJournal:
+    """
+    A class to keep track of the ROS packages built with success during the latest build run.
+
+    Each successful build is written to the journal as soon as it finishes, so that an interrupted or
+    failed run can be resumed by skipping the ROS packages whose inputs did not change meanwhile.
+    """
+
+    def __init__(self, path: str = '.rigel_config/journal.json') -> None:
+        """
+        :type path: string
+        :param path: The path of the journal file. Created when first written if missing.
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the ROS packages built with success during the latest run.
+
+        :rtype: Dict[string, Dict[string, Any]]
+        :return: The input digest, image name and completion time of each ROS package.
+        """
+        if self.__entries is None:
+            try:
+                with open(self.path) as journal_file:
+                    self.__entries = dict(json.load(journal_file).get('packages', {}))
+            except (OSError, ValueError, AttributeError):  # missing or corrupted journals are ignored
+                self.__entries = {}
+        return self.__entries
+
+    def completed(self, package: str, digest: str) -> bool:
+        """
+        Verify if a ROS package was built with success from the same inputs during the latest run.
+
+        :type package: string
+        :param package: The name of the ROS package.
+        :type digest: string
+        :param digest: The current input digest of the ROS package.
+
+        :rtype: bool
+        :return: True if the ROS package need not be built again. False otherwise.
+        """
+        with self.__lock:
+            entry = self.entries().get(package)
+            return entry is not None and entry.get('digest') == digest
+
+    def record(self, package: str, digest: str, image: str) -> None:
+        """
+        Record that a ROS package was built with success.
+
+        :type package: string
+        :param package: The name of the ROS package.
+        :type digest: string
+        :param digest: The input digest of the ROS package.
+        :type image: string
+        :param image: The name of the built Docker image.
+        """
+        with self.__lock:
+            self.entries()[package] = {'digest': digest, 'image': image, 'finished_at': time.time()}
+            self.__write()
+
+    def clear(self) -> None:
+        """
+        Start a new run, forgetting all previously built ROS packages.
+        """
+        with self.__lock:
+            self.__entries = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def __write(self) -> None:
+        """
+        Auxiliary function that atomically writes the journal, so that an interruption never corrupts it.
+        """
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=folder, prefix='.journal-')
+        try:
+            with os.fdopen(fd, 'w') as journal_file:
+                json.dump({'packages': self.__entries}, journal_file, indent=2, sort_keys=True)
+            os.replace(path, self.path)
+        except OSError:
+            os.remove(path)
+            raise
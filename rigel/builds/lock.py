@@ -0,0 +1,43 @@
+import json
+import python_on_whales
+from rigelcore.clients import DockerClient
+from rigelcore.exceptions import DockerAPIError
+
+
+def resolve_image_digest(docker: DockerClient, image: str) -> str:
+    """
+    Resolve the name of an image to the digest it currently points to inside its registry, without pulling it.
+    For multi-platform images the digest of the image index is returned.
+
+    :type docker: rigelcore.clients.DockerClient
+    :param docker: The Docker client.
+    :type image: string
+    :param image: The name of the image (e.g. 'ros:noetic').
+
+    :rtype: string
+    :return: The digest (e.g. 'sha256:...').
+    """
+    try:
+        output = python_on_whales.utils.run(
+            docker.client.docker_cmd + ['buildx', 'imagetools', 'inspect', '--format', '{{json .Manifest}}', image]
+        )
+        return str(json.loads(str(output))['digest'])
+    except python_on_whales.exceptions.DockerException as exception:
+        raise DockerAPIError(exception=exception)
+    except (KeyError, TypeError, ValueError):
+        raise DockerAPIError(exception=f"Unable to resolve the digest of image '{image}'.")
+
+
+def pin_image(image: str, digest: str) -> str:
+    """
+    Pin the name of an image to a digest. The tag is kept for readability but is ignored by Docker.
+
+    :type image: string
+    :param image: The name of the image (e.g. 'ros:noetic').
+    :type digest: string
+    :param digest: The digest of the image.
+
+    :rtype: string
+    :return: The pinned reference (e.g. 'ros:noetic@sha256:...').
+    """
+    return f"{image.split('@')[0]}@{digest}"
@@ -0,0 +1,260 @@
+import os
+import queue
+import subprocess
+import threading
+from collections import deque
+from rigelcore.clients import DockerClient
+from rigelcore.exceptions import DockerAPIError
+from types import TracebackType
+from typing import Callable, Deque, Dict, IO, List, Optional, Type, Union
+
+
+class BuildLog:
+    """
+    A class to capture the build output of a ROS package using a bounded amount of memory.
+
+    Each line is written to a rotating log file and the latest lines are kept in a ring buffer.
+    Lines are also echoed by a background thread fed through a bounded queue.
+    If echoing cannot keep up (e.g. slow terminal) lines are skipped instead of stalling the build.
+    """
+
+    def __init__(
+        self,
+        package: str,
+        folder: str,
+        echo: Optional[Callable[[str], None]] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+        tail_lines: int = 50,
+        queue_size: int = 1000
+    ) -> None:
+        """
+        :type package: string
+        :param package: The name of the ROS package.
+        :type folder: string
+        :param folder: The folder where to keep the log files.
+        :type echo: Optional[Callable[[string], None]]
+        :param echo: Function called with each line (without trailing newline), if any.
+        :type max_bytes: int
+        :param max_bytes: Size after which the log file is rotated.
+        :type backups: int
+        :param backups: Number of rotated log files to keep. Logs of previous builds are rotated as well.
+        :type tail_lines: int
+        :param tail_lines: Number of latest lines to keep in memory.
+        :type queue_size: int
+        :param queue_size: Maximum number of lines waiting to be echoed.
+        """
+        self.package = package
+        self.path = os.path.join(folder, f'{package}.log')
+        self.echo = echo
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lines: Deque[str] = deque(maxlen=tail_lines)
+        self.skipped = 0  # lines not echoed
+        self.size = 0
+        self.__file: Optional[IO[str]] = None
+        self.__queue: 'queue.Queue[Optional[str]]' = queue.Queue(maxsize=queue_size)
+        self.__echo_thread: Optional[threading.Thread] = None
+
+    def __rotate(self) -> None:
+        """
+        Auxiliary function that moves the current log file to the first backup slot.
+        """
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f'{self.path}.{index}'):
+                os.replace(f'{self.path}.{index}', f'{self.path}.{index + 1}')
+        if os.path.exists(self.path):
+            if self.backups:
+                os.replace(self.path, f'{self.path}.1')
+            else:
+                os.remove(self.path)
+
+    def open(self) -> None:
+        """
+        Start capturing build output. The log of a previous build is rotated.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            self.__rotate()
+        self.__file = open(self.path, 'w')
+        self.size = 0
+        if self.echo is not None:
+            self.__echo_thread = threading.Thread(target=self.__echo_lines, daemon=True)
+            self.__echo_thread.start()
+
+    def __echo_lines(self) -> None:
+        """
+        Auxiliary function that echoes queued lines until the log is closed.
+        """
+        assert self.echo is not None
+        for line in iter(self.__queue.get, None):
+            try:
+                self.echo(line)
+            except Exception:
+                pass  # echoing is best-effort
+
+    def write(self, line: str) -> None:
+        """
+        Capture a line of build output.
+
+        :type line: string
+        :param line: The line.
+        """
+        line = line.rstrip('\n')
+        self.lines.append(line)
+
+        if self.__file is not None:
+            if self.size and self.size + len(line) + 1 > self.max_bytes:
+                self.__rotate()
+                self.__file = open(self.path, 'w')
+                self.size = 0
+            self.__file.write(line + '\n')
+            self.size += len(line) + 1
+
+        if self.__echo_thread is not None:
+            try:
+                self.__queue.put_nowait(line)
+            except queue.Full:
+                self.skipped += 1
+
+    def close(self) -> None:
+        """
+        Stop capturing build output. Waits for all queued lines to be echoed.
+        """
+        if self.__echo_thread is not None:
+            self.__queue.put(None)
+            self.__echo_thread.join()
+            self.__echo_thread = None
+        if self.__file is not None:
+            if self.skipped:
+                self.__file.write(f'[{self.skipped} lines were not echoed to the terminal]\n')
+            self.__file.close()
+            self.__file = None
+
+    def tail(self) -> List[str]:
+        """
+        Get the latest captured lines.
+
+        :rtype: List[string]
+        :return: The latest lines, oldest first.
+        """
+        return list(self.lines)
+
+    def __enter__(self) -> 'BuildLog':
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+
+def stream_command(command: List[str], log: BuildLog, name: str) -> None:
+    """
+    Run a Docker command with all of its output captured by a build log.
+    The output is read line by line and never kept in memory as a whole.
+
+    :type command: List[string]
+    :param command: The command and its arguments.
+    :type log: BuildLog
+    :param log: The build log.
+    :type name: string
+    :param name: The name of the Docker command used in error messages (e.g. 'buildx build').
+    """
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except OSError as exception:
+        raise DockerAPIError(exception=exception)
+
+    assert process.stdout is not None
+    with process.stdout:
+        for line in process.stdout:
+            log.write(line.decode(errors='replace'))
+
+    code = process.wait()
+    if code:
+        raise DockerAPIError(exception=f"'docker {name}' exited with code {code} (see {log.path})")
+
+
+def build_command(
+    docker: DockerClient,
+    path: str,
+    tags: Union[str, List[str]],
+    file: Optional[str] = None,
+    build_args: Optional[Dict[str, str]] = None,
+    platforms: Optional[List[str]] = None,
+    load: bool = False,
+    push: bool = False,
+    builder: Optional[str] = None
+) -> List[str]:
+    """
+    Assemble the docker buildx command that builds a Docker image.
+    See stream_build for a description of the parameters.
+
+    :rtype: List[string]
+    :return: The command and its arguments.
+    """
+    command = [str(part) for part in docker.client.docker_cmd] + ['buildx', 'build', '--progress', 'plain']
+    for tag in [tags] if isinstance(tags, str) else tags:
+        command.extend(['--tag', tag])
+    if file:
+        command.extend(['--file', file])
+    for key, value in (build_args or {}).items():
+        command.extend(['--build-arg', f'{key}={value}'])
+    if platforms:
+        command.extend(['--platform', ','.join(platforms)])
+    if load:
+        command.append('--load')
+    if push:
+        command.append('--push')
+    if builder:
+        command.extend(['--builder', builder])
+    command.append(path)
+    return command
+
+
+def stream_build(
+    docker: DockerClient,
+    path: str,
+    log: BuildLog,
+    tags: Union[str, List[str]],
+    file: Optional[str] = None,
+    build_args: Optional[Dict[str, str]] = None,
+    platforms: Optional[List[str]] = None,
+    load: bool = False,
+    push: bool = False,
+    builder: Optional[str] = None
+) -> None:
+    """
+    Build a Docker image using docker buildx with all build output captured by a build log.
+    The output is read line by line and never kept in memory as a whole.
+
+    :type docker: rigelcore.clients.DockerClient
+    :param docker: The Docker client.
+    :type path: string
+    :param path: Root of the build context.
+    :type log: BuildLog
+    :param log: The build log.
+    :type tags: Union[string, List[string]]
+    :param tags: The names of the Docker image.
+    :type file: Optional[string]
+    :param file: The path of the Dockerfile. Defaults to 'Dockerfile' at the root of the build context.
+    :type build_args: Optional[Dict[string, string]]
+    :param build_args: Build arguments.
+    :type platforms: Optional[List[string]]
+    :param platforms: The target platforms.
+    :type load: bool
+    :param load: Store built image locally.
+    :type push: bool
+    :param push: Store built image in a remote registry.
+    :type builder: Optional[string]
+    :param builder: The name of the builder to use. The current builder if not set.
+    """
+    stream_command(build_command(docker, path, tags, file, build_args, platforms, load, push, builder), log, 'buildx build')
@@ -0,0 +1,44 @@
+import os
+from rigel.models import DockerSection, DockerfileSection, SSHKey
+from typing import Tuple, Union
+
+
+def generate_paths(package: Union[DockerSection, DockerfileSection]) -> Tuple[str, str]:
+    """
+    Compute where the build context and the Dockerfile of a ROS package are placed.
+
+    :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+    :param package: The ROS package.
+
+    :rtype: Tuple[string, string]
+    :return: The root of the build context and the folder containing the Dockerfile.
+    """
+    if isinstance(package, DockerfileSection):
+        path = os.path.abspath(package.dockerfile)
+        return (path, path)
+    if package.dir:
+        return (
+            os.path.abspath(f'{package.dir}'),                      # package root
+            os.path.abspath(f'{package.dir}/.rigel_config')         # Dockerfile folder
+        )
+    else:
+        return (
+            os.path.abspath(f'.rigel_config/{package.package}'),    # package root
+            os.path.abspath(f'.rigel_config/{package.package}')     # Dockerfile folder
+        )
+
+
+def ssh_key_path(package: DockerSection, key: SSHKey) -> str:
+    """
+    Compute where the file of a private SSH key is read from when building the image of a ROS package.
+    Key files are copied from the build context, hence their path is relative to the package root.
+
+    :type package: rigel.models.DockerSection
+    :param package: The ROS package.
+    :type key: rigel.models.SSHKey
+    :param key: The private SSH key (stored inside a file).
+
+    :rtype: string
+    :return: The absolute path of the key file.
+    """
+    return os.path.join(generate_paths(package)[0], key.value)
@@ -0,0 +1,303 @@
+import platform as host_platform
+import python_on_whales
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from rigel.builds.logs import BuildLog, stream_build
+from rigel.exceptions import InvalidBuilderEndpointError, UnsupportedPlatformError
+from rigel.models import SUPPORTED_PLATFORMS
+from rigelcore.clients import DockerClient
+from rigelcore.exceptions import DockerAPIError, RigelError
+from rigelcore.loggers import MessageLogger
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+# Mapping between the machine names reported by the host and Docker architectures.
+HOST_ARCHITECTURES: Dict[str, str] = {
+    'x86_64': 'amd64',
+    'amd64': 'amd64',
+    'aarch64': 'arm64',
+    'arm64': 'arm64'
+}
+
+
+def parse_builder_endpoints(declarations: List[str]) -> Dict[str, str]:
+    """
+    Parse declarations of remote builder endpoints.
+
+    :type declarations: List[string]
+    :param declarations: Declarations in the format <PLATFORM>=<ENDPOINT> (e.g. 'linux/arm64=tcp://arm-node:1234').
+
+    :rtype: Dict[str, str]
+    :return: The endpoint to use for each platform.
+    """
+    supported_platforms = [p[0] for p in SUPPORTED_PLATFORMS]
+    endpoints: Dict[str, str] = {}
+    for declaration in declarations:
+        docker_platform, _, endpoint = declaration.partition('=')
+        docker_platform = docker_platform.strip()
+        endpoint = endpoint.strip()
+        if not docker_platform or not endpoint:
+            raise InvalidBuilderEndpointError(endpoint=declaration)
+        if docker_platform not in supported_platforms:
+            raise UnsupportedPlatformError(platform=docker_platform)
+        endpoints[docker_platform] = endpoint
+    return endpoints
+
+
+class MultiPlatformBuilder:
+    """
+    A class to build multi-architecture Docker images with one concurrent build per platform.
+
+    Each platform image is tagged separately (e.g. 'image:latest-arm64') so that it becomes
+    available as soon as its own build finishes. Platforms associated with a remote BuildKit endpoint
+    are built by a dedicated remote builder, all others by the local builder. When images are pushed,
+    the per-platform images are then assembled into a single manifest list under the original image name.
+    """
+
+    def __init__(
+        self,
+        docker: DockerClient,
+        builder: str,
+        endpoints: Optional[Dict[str, str]] = None,
+        logger: Optional[MessageLogger] = None
+    ) -> None:
+        """
+        :type docker: rigelcore.clients.DockerClient
+        :param docker: The Docker client.
+        :type builder: string
+        :param builder: Name of the local builder.
+        :type endpoints: Optional[Dict[str, str]]
+        :param endpoints: The remote BuildKit endpoint to use for each platform, if any.
+        :type logger: Optional[rigelcore.loggers.MessageLogger]
+        :param logger: The logger for progress messages.
+        """
+        self.docker = docker
+        self.builder = builder
+        self.endpoints = endpoints or {}
+        self.logger = logger or MessageLogger()
+
+    @staticmethod
+    def platform_tag(image: str, docker_platform: str) -> str:
+        """
+        Compute the name of the image built for a single platform.
+
+        :type image: string
+        :param image: The name of the multi-architecture image.
+        :type docker_platform: string
+        :param docker_platform: The target platform (e.g. 'linux/arm64').
+
+        :rtype: string
+        :return: The name of the single-platform image.
+        """
+        name, tag = image, 'latest'
+        if ':' in image.rsplit('/', 1)[-1]:
+            name, tag = image.rsplit(':', 1)
+        suffix = '-'.join(docker_platform.split('/')[1:])
+        return f'{name}:{tag}-{suffix}'
+
+    @staticmethod
+    def is_native(docker_platform: str) -> bool:
+        """
+        Verify if a platform matches the architecture of the host.
+
+        :type docker_platform: string
+        :param docker_platform: The target platform (e.g. 'linux/arm64').
+
+        :rtype: bool
+        :return: True if images for the platform are built without emulation. False otherwise.
+        """
+        architecture = HOST_ARCHITECTURES.get(host_platform.machine().lower())
+        return docker_platform == f'linux/{architecture}'
+
+    def builder_name(self, docker_platform: str) -> str:
+        """
+        Get the name of the builder responsible for a given platform.
+
+        :type docker_platform: string
+        :param docker_platform: The target platform.
+
+        :rtype: string
+        :return: The name of the builder.
+        """
+        if docker_platform in self.endpoints:
+            return f"{self.builder}-{docker_platform.replace('/', '-')}"
+        return self.builder
+
+    def create_remote_builders(self, platforms: List[str]) -> List[str]:
+        """
+        Create the remote builders for all platforms associated with a remote BuildKit endpoint.
+
+        :type platforms: List[string]
+        :param platforms: The target platforms.
+
+        :rtype: List[string]
+        :return: The names of the created builders.
+        """
+        names = []
+        for docker_platform in platforms:
+            if docker_platform in self.endpoints:
+                name = self.builder_name(docker_platform)
+                if not self.docker.get_builder(name):
+                    try:
+                        self.docker.client.buildx.create(
+                            self.endpoints[docker_platform],
+                            driver='remote',
+                            name=name
+                        )
+                    except python_on_whales.exceptions.DockerException as exception:
+                        raise DockerAPIError(exception=exception)
+                self.logger.info(f"Created builder '{name}' for platform '{docker_platform}'")
+                names.append(name)
+        return names
+
+    def create_manifest(self, image: str, sources: List[str]) -> None:
+        """
+        Assemble single-platform images stored in a registry into a manifest list.
+
+        :type image: string
+        :param image: The name of the manifest list.
+        :type sources: List[string]
+        :param sources: The names of the single-platform images.
+        """
+        try:
+            python_on_whales.utils.run(
+                self.docker.client.docker_cmd + ['buildx', 'imagetools', 'create', '--tag', image, *sources]
+            )
+        except python_on_whales.exceptions.DockerException as exception:
+            raise DockerAPIError(exception=exception)
+
+    def __build_platform(
+        self,
+        path: str,
+        image: str,
+        docker_platform: str,
+        log: BuildLog,
+        on_built: Optional[Callable[[str, float, bool], None]],
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """
+        Auxiliary function that builds the image for a single platform.
+
+        :type path: string
+        :param path: Root of the build context.
+        :type image: string
+        :param image: The name of the multi-architecture image.
+        :type docker_platform: string
+        :param docker_platform: The target platform.
+        :type log: rigel.builds.BuildLog
+        :param log: The build log of the platform.
+        :type on_built: Optional[Callable[[string, float, bool], None]]
+        :param on_built: Called with the platform, the build duration and whether the build succeeded.
+        :type kwargs: Dict[str, Any]
+        :param kwargs: Additional build arguments.
+
+        :rtype: string
+        :return: The name of the single-platform image.
+        """
+        tag = self.platform_tag(image, docker_platform)
+        self.logger.info(f"Building Docker image '{tag}' using builder '{self.builder_name(docker_platform)}'")
+        started_at = time.time()
+        success = False
+        try:
+            with log:
+                stream_build(
+                    self.docker,
+                    path,
+                    log,
+                    **kwargs,
+                    tags=tag,
+                    platforms=[docker_platform],
+                    builder=self.builder_name(docker_platform)
+                )
+            success = True
+        except RigelError:
+            self.logger.error(f"Failed to build Docker image '{tag}'. Last lines of '{log.path}':")
+            for line in log.tail():
+                print(f'  {line}')
+            raise
+        finally:
+            if on_built is not None:
+                on_built(docker_platform, time.time() - started_at, success)
+        return tag
+
+    def build(
+        self,
+        path: str,
+        image: str,
+        platforms: List[str],
+        load: bool,
+        push: bool,
+        log: Callable[[str], BuildLog],
+        on_built: Optional[Callable[[str, float, bool], None]] = None,
+        **kwargs: Any
+    ) -> Dict[str, str]:
+        """
+        Build one image per platform concurrently and, if pushed, assemble them into a manifest list.
+
+        :type path: string
+        :param path: Root of the build context.
+        :type image: string
+        :param image: The name of the multi-architecture image.
+        :type platforms: List[string]
+        :param platforms: The target platforms.
+        :type load: bool
+        :param load: Store built images locally.
+        :type push: bool
+        :param push: Store built images in a remote registry.
+        :type log: Callable[[string], rigel.builds.BuildLog]
+        :param log: Creates the build log of a platform (given the platform).
+        :type on_built: Optional[Callable[[string, float, bool], None]]
+        :param on_built: Called once per platform with the platform, the build duration and whether the build succeeded.
+        :type kwargs: Dict[str, Any]
+        :param kwargs: Additional build arguments (e.g. 'file' or 'build_args').
+
+        :rtype: Dict[str, str]
+        :return: The name of the image built for each platform.
+        """
+        # Start emulated builds after native ones so that native images are ready first.
+        ordered_platforms = sorted(platforms, key=lambda p: not self.is_native(p))
+
+        tags: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=len(ordered_platforms)) as executor:
+            futures: Dict[Future, str] = {
+                executor.submit(
+                    self.__build_platform,
+                    path,
+                    image,
+                    docker_platform,
+                    log(docker_platform),
+                    on_built,
+                    {**kwargs, 'load': load, 'push': push}
+                ): docker_platform
+                for docker_platform in ordered_platforms
+            }
+            pending: Set[Future] = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    docker_platform = futures[future]
+                    tags[docker_platform] = future.result()  # propagate errors
+                    self.logger.info(f"Docker image '{tags[docker_platform]}' ({docker_platform}) built with success.")
+
+        if push:
+            self.create_manifest(image, [tags[p] for p in platforms])
+            self.logger.info(f"Created manifest list '{image}' for platforms {', '.join(platforms)}.")
+        elif load:
+            native = [p for p in platforms if self.is_native(p)]
+            if native:  # make the native image available under the original name
+                self.docker.tag_image(tags[native[0]], image)
+                self.logger.info(f"Tagged Docker image '{tags[native[0]]}' as '{image}'.")
+            self.logger.warning('Manifest lists can only be assembled for images pushed to a registry.')
+
+        return tags
+
+    def remove_remote_builders(self, platforms: List[str]) -> None:
+        """
+        Remove the remote builders created for the given platforms.
+
+        :type platforms: List[string]
+        :param platforms: The target platforms.
+        """
+        for docker_platform in platforms:
+            if docker_platform in self.endpoints:
+                self.docker.remove_builder(self.builder_name(docker_platform))
@@ -0,0 +1,254 @@
+import os
+import python_on_whales
+import re
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel
+from rigel.builds.paths import generate_paths, ssh_key_path
+from rigel.models import DockerSection, DockerfileSection, LockedPackage, Lockfile
+from rigel.models.docker import Registry
+from rigelcore.clients import DockerClient
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Registry servers that are aliases of Docker Hub.
+DOCKER_HUB_ALIASES = ['docker.io', 'index.docker.io', 'registry-1.docker.io']
+DOCKER_HUB_REGISTRY = 'registry-1.docker.io'
+
+FROM_INSTRUCTION = re.compile(r'^\s*FROM\s+(?:--platform=\S+\s+)?(\S+)(?:\s+AS\s+(\S+))?', re.IGNORECASE | re.MULTILINE)
+
+
+class PreflightFailure(BaseModel):
+    """
+    A problem found before building the image of a ROS package.
+
+    :type package: string
+    :cvar package: The name of the ROS package.
+    :type check: string
+    :cvar check: The kind of check that failed ('registry', 'rosinstall', 'ssh', 'dockerfile' or 'base_image').
+    :type message: string
+    :cvar message: What is wrong.
+    """
+    package: str
+    check: str
+    message: str
+
+
+def preflight_report(failures: List[PreflightFailure]) -> str:
+    """
+    Describe all problems found before building, one per line.
+
+    :type failures: List[PreflightFailure]
+    :param failures: The problems found.
+
+    :rtype: string
+    :return: The report.
+    """
+    return '\n'.join(f'  - {failure.package} ({failure.check}): {failure.message}' for failure in failures)
+
+
+def registry_url(server: str) -> str:
+    """
+    Compute the URL of the base endpoint of the Docker Registry HTTP API for a registry server.
+    Registries served from the local host are reached using plain HTTP, as Docker does.
+
+    :type server: string
+    :param server: The registry server, as declared in the Rigelfile.
+
+    :rtype: string
+    :return: The URL of the base endpoint.
+    """
+    if '://' in server:
+        scheme, _, server = server.partition('://')
+    else:
+        scheme = 'https'
+    host = server.split('/')[0]
+    if host in DOCKER_HUB_ALIASES:
+        host = DOCKER_HUB_REGISTRY
+    if host.split(':')[0] in ['localhost', '127.0.0.1', '[::1]']:
+        scheme = 'http'
+    return f'{scheme}://{host}/v2/'
+
+
+def base_images(package: Union[DockerSection, DockerfileSection], lock: Optional[LockedPackage] = None) -> List[str]:
+    """
+    List the external images the image of a ROS package is built upon.
+
+    :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+    :param package: The ROS package.
+    :type lock: Optional[rigel.models.LockedPackage]
+    :param lock: The pinned inputs of the ROS package (see Rigelfile.lock), if any.
+
+    :rtype: List[string]
+    :return: The names of the base images, or their pinned references if locked. Stages of multi-stage builds and
+    images named after build arguments are left out, as well as the base images of Dockerfiles that cannot be read.
+    """
+    if isinstance(package, DockerSection):
+        # External repositories are cloned inside an intermediate stage (unless fetched in advance).
+        ros_images = list(dict.fromkeys([f'ros:{package.distro}', f'ros:{package.ros_image}']))
+        return [lock.images.get(image, image) for image in ros_images] if lock is not None else ros_images
+
+    try:
+        with open(os.path.join(generate_paths(package)[0], 'Dockerfile')) as dockerfile:
+            content = dockerfile.read()
+    except OSError:
+        return []
+
+    images: List[str] = []
+    stages = set()
+    for image, stage in FROM_INSTRUCTION.findall(content):
+        if image.lower() != 'scratch' and '$' not in image and image not in stages and image not in images:
+            images.append(image)
+        if stage:
+            stages.add(stage)
+    return images
+
+
+class PreflightChecker:
+    """
+    A class to detect, before a long build starts, problems that would otherwise only surface while building:
+    unreachable image registries, missing .rosinstall files, missing SSH key files, missing Dockerfiles
+    and unavailable base images.
+
+    All checks run concurrently and each distinct registry and base image is only checked once,
+    regardless of how many ROS packages use it.
+    """
+
+    def __init__(
+        self,
+        docker: DockerClient,
+        images: Optional[List[str]] = None,
+        jobs: int = 8,
+        timeout: float = 10.0,
+        lockfile: Optional[Lockfile] = None
+    ) -> None:
+        """
+        :type docker: rigelcore.clients.DockerClient
+        :param docker: The Docker client used to look for base images.
+        :type images: Optional[List[string]]
+        :param images: Images built by Rigel itself, which need not exist beforehand.
+        :type jobs: int
+        :param jobs: Maximum number of checks to run concurrently.
+        :type timeout: float
+        :param timeout: How long to wait for each registry to answer (seconds).
+        :type lockfile: Optional[rigel.models.Lockfile]
+        :param lockfile: The pinned inputs of the ROS packages. The pinned base images are checked instead, if any.
+        """
+        self.docker = docker
+        self.images = set(images or [])
+        self.jobs = max(1, jobs)
+        self.timeout = timeout
+        self.lockfile = lockfile or Lockfile()
+
+    def check_registry(self, registry: Registry) -> Optional[str]:
+        """
+        Verify that an image registry can be reached.
+        Any answer of the registry, including a request for authentication, is enough.
+
+        :type registry: rigel.models.Registry
+        :param registry: The image registry.
+
+        :rtype: Optional[string]
+        :return: What is wrong. None if the registry is reachable.
+        """
+        url = registry_url(registry.server)
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout):
+                return None
+        except urllib.error.HTTPError:  # the registry answered
+            return None
+        except (urllib.error.URLError, OSError, ValueError) as err:
+            reason = getattr(err, 'reason', err)
+            return f"Image registry '{registry.server}' is unreachable at {url} ({reason})."
+
+    def check_base_image(self, image: str) -> Optional[str]:
+        """
+        Verify that a base image is either available locally or can be pulled.
+
+        :type image: string
+        :param image: The name of the base image.
+
+        :rtype: Optional[string]
+        :return: What is wrong. None if the base image is available.
+        """
+        if self.docker.get_image(image) is not None:
+            return None
+        try:
+            self.docker.client.buildx.imagetools.inspect(image)
+            return None
+        except python_on_whales.exceptions.DockerException:
+            return f"Base image '{image}' is neither available locally nor in its registry."
+
+    def package_checks(
+        self,
+        package: Union[DockerSection, DockerfileSection]
+    ) -> List[Tuple[str, str, Callable[[], Optional[str]]]]:
+        """
+        List the checks that apply to a ROS package.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+
+        :rtype: List[Tuple[string, string, Callable[[], Optional[string]]]]
+        :return: The kind, a key identifying what is checked and the check itself, which returns what is wrong (if anything).
+        """
+        checks: List[Tuple[str, str, Callable[[], Optional[str]]]] = []
+        root = generate_paths(package)[0]
+
+        def missing(path: str, message: str) -> Callable[[], Optional[str]]:
+            return lambda: None if os.path.isfile(path) else message
+
+        def available(image: str) -> Callable[[], Optional[str]]:
+            return lambda: self.check_base_image(image)
+
+        if package.registry:
+            registry = package.registry
+            checks.append(('registry', registry_url(registry.server), lambda: self.check_registry(registry)))
+
+        if isinstance(package, DockerSection):
+            if package.dir and not os.path.isdir(root):
+                checks.append(('dockerfile', root, lambda: f"Package folder '{package.dir}' does not exist."))
+            for file in package.rosinstall:
+                path = os.path.join(root, file)
+                checks.append(('rosinstall', path, missing(path, f"File '{file}' does not exist at {root}.")))
+            for key in package.ssh:
+                if key.file:
+                    path = ssh_key_path(package, key)
+                    checks.append(('ssh', path, missing(path, f"SSH key file '{key.value}' does not exist at {root}.")))
+        else:
+            path = os.path.join(root, 'Dockerfile')
+            checks.append(('dockerfile', path, missing(path, f"No Dockerfile was found at '{package.dockerfile}'.")))
+
+        for image in base_images(package, self.lockfile.packages.get(package.package)):
+            if image not in self.images:
+                checks.append(('base_image', image, available(image)))
+
+        return checks
+
+    def run(self, packages: List[Union[DockerSection, DockerfileSection]]) -> List[PreflightFailure]:
+        """
+        Check all given ROS packages.
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: The ROS packages about to be built.
+
+        :rtype: List[PreflightFailure]
+        :return: All problems found, in order of declaration of the ROS packages.
+        """
+        checks: Dict[Tuple[str, str], Callable[[], Optional[str]]] = {}
+        usages: List[Tuple[str, Tuple[str, str]]] = []
+        for package in packages:
+            for kind, subject, check in self.package_checks(package):
+                checks.setdefault((kind, subject), check)
+                usages.append((package.package, (kind, subject)))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {key: executor.submit(check) for key, check in checks.items()}
+            outcomes = {key: future.result() for key, future in futures.items()}
+
+        failures = []
+        for name, key in usages:
+            message = outcomes[key]
+            if message is not None:
+                failures.append(PreflightFailure(package=name, check=key[0], message=message))
+        return failures
@@ -0,0 +1,84 @@
+import os
+import tempfile
+from rigel.builds.lock import pin_image, resolve_image_digest
+from rigel.builds.logs import BuildLog, stream_build
+from rigel.builds.preflight import base_images
+from rigel.models import DockerSection, DockerfileSection, Lockfile
+from rigelcore.clients import DockerClient
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+
+def base_image_pulls(
+    packages: List[Union[DockerSection, DockerfileSection]],
+    built: Optional[List[str]] = None,
+    lockfile: Optional[Lockfile] = None
+) -> List[Tuple[str, List[str]]]:
+    """
+    Collect the distinct base images of ROS packages, together with the platforms they are required for.
+
+    :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :param packages: The ROS packages about to be built.
+    :type built: Optional[List[string]]
+    :param built: Images built by Rigel itself, which cannot be pulled beforehand.
+    :type lockfile: Optional[rigel.models.Lockfile]
+    :param lockfile: The pinned inputs of the ROS packages. The pinned base images are pulled instead, if any.
+
+    :rtype: List[Tuple[string, List[string]]]
+    :return: Each base image and its platforms (empty for the host platform), in order of first use.
+    """
+    pulls: Dict[Tuple[str, Tuple[str, ...]], None] = {}
+    for package in packages:
+        platforms = tuple(sorted(package.platforms)) if isinstance(package, DockerSection) else ()
+        for image in base_images(package, lockfile.packages.get(package.package) if lockfile else None):
+            if image not in (built or []):
+                pulls[(image, platforms)] = None
+    return [(image, list(platforms)) for image, platforms in pulls]
+
+
+def pull_base_image(
+    docker: DockerClient,
+    image: str,
+    platforms: List[str],
+    log: BuildLog,
+    builder: str,
+    warmed: Optional[Set[Tuple[str, str]]] = None
+) -> bool:
+    """
+    Pull a base image into the content store of a builder, so that builds starting from it need not download it.
+
+    Builds run on a BuildKit builder that does not share the image store of the Docker daemon.
+    Hence the base image is pulled by building, on that builder, a Dockerfile made of a single FROM instruction
+    without exporting the result. The image is pinned to a digest beforehand (the one inside the Rigelfile.lock or
+    else the one its tag currently points to in its registry) and nothing is pulled for platforms
+    the builder already holds that digest for.
+
+    :type docker: rigelcore.clients.DockerClient
+    :param docker: The Docker client.
+    :type image: string
+    :param image: The name of the base image, possibly pinned to a digest.
+    :type platforms: List[string]
+    :param platforms: The platforms to pull. The host platform if empty.
+    :type log: BuildLog
+    :param log: Where to write the pull progress.
+    :type builder: string
+    :param builder: The name of the builder.
+    :type warmed: Optional[Set[Tuple[string, string]]]
+    :param warmed: The digests (and platforms, empty for the host platform) the builder already holds.
+    Updated with the pulled ones.
+
+    :rtype: bool
+    :return: True if the base image was pulled for some platform. False if the builder already held it.
+    """
+    warmed = set() if warmed is None else warmed
+    digest = image.split('@')[1] if '@' in image else resolve_image_digest(docker, image)
+    missing = [platform for platform in platforms or [''] if (digest, platform) not in warmed]
+    if not missing:
+        log.write(f"Base image '{image}' ({digest}) is already held by builder '{builder}'.\n")
+        return False
+
+    with tempfile.TemporaryDirectory(prefix='rigel-pull-') as context:
+        with open(os.path.join(context, 'Dockerfile'), 'w') as dockerfile:
+            dockerfile.write(f'FROM {pin_image(image, digest)}\n')
+        stream_build(docker, context, log, tags=[], platforms=[p for p in missing if p] or None, builder=builder)
+    warmed.update((digest, platform) for platform in missing)
+    return True
@@ -0,0 +1,165 @@
+import math
+import os
+from rigel.models.docker import Resources
+from typing import List, Optional
+
+# Resources assumed for each build when computing the default concurrency.
+DEFAULT_BUILD_CPUS = 1.0
+DEFAULT_BUILD_MEMORY = 2 * 1024 ** 3
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+
+def read_value(path: str) -> Optional[str]:
+    """
+    Read the content of a pseudo-file.
+
+    :type path: string
+    :param path: The path of the file.
+
+    :rtype: Optional[string]
+    :return: The stripped content of the file. None if it cannot be read.
+    """
+    try:
+        with open(path) as value_file:
+            return value_file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_folders(root: str = CGROUP_ROOT, proc: str = '/proc/self/cgroup') -> List[str]:
+    """
+    List the folders of the cgroup v2 hierarchy that limit the current process, innermost first.
+
+    :type root: string
+    :param root: The mount point of the cgroup v2 hierarchy.
+    :type proc: string
+    :param proc: The file listing the cgroups of the current process.
+
+    :rtype: List[string]
+    :return: The folders, from the cgroup of the process up to the root of the hierarchy.
+    """
+    content = read_value(proc) or ''
+    path = next((line[3:] for line in content.splitlines() if line.startswith('0::')), '/')
+    folders = []
+    while True:
+        folders.append(os.path.join(root, path.lstrip('/')).rstrip('/') or '/')
+        if path in ('', '/'):
+            return folders
+        path = os.path.dirname(path)
+
+
+def cgroup_cpu_limit(root: str = CGROUP_ROOT, proc: str = '/proc/self/cgroup') -> Optional[float]:
+    """
+    Get the CPU quota imposed by cgroups (v2, or v1 as a fallback).
+
+    :type root: string
+    :param root: The mount point of the cgroup hierarchy.
+    :type proc: string
+    :param proc: The file listing the cgroups of the current process.
+
+    :rtype: Optional[float]
+    :return: The number of CPUs the process may keep busy. None if unlimited.
+    """
+    limits = []
+    for folder in cgroup_folders(root, proc):
+        quota, _, period = (read_value(os.path.join(folder, 'cpu.max')) or 'max').partition(' ')
+        if quota != 'max' and period:
+            limits.append(int(quota) / int(period))
+
+    if not limits:  # cgroup v1
+        cfs_quota = read_value(os.path.join(root, 'cpu', 'cpu.cfs_quota_us'))
+        cfs_period = read_value(os.path.join(root, 'cpu', 'cpu.cfs_period_us'))
+        if cfs_quota and cfs_period and int(cfs_quota) > 0:
+            limits.append(int(cfs_quota) / int(cfs_period))
+    return min(limits, default=None)
+
+
+def cgroup_memory_limit(root: str = CGROUP_ROOT, proc: str = '/proc/self/cgroup') -> Optional[int]:
+    """
+    Get the memory limit imposed by cgroups (v2, or v1 as a fallback).
+
+    :type root: string
+    :param root: The mount point of the cgroup hierarchy.
+    :type proc: string
+    :param proc: The file listing the cgroups of the current process.
+
+    :rtype: Optional[int]
+    :return: The memory limit in bytes. None if unlimited.
+    """
+    limits = []
+    for folder in cgroup_folders(root, proc):
+        limit = read_value(os.path.join(folder, 'memory.max'))
+        if limit and limit != 'max':
+            limits.append(int(limit))
+
+    if not limits:  # cgroup v1 (unlimited is reported as a huge number)
+        limit = read_value(os.path.join(root, 'memory', 'memory.limit_in_bytes'))
+        if limit and int(limit) < physical_memory():
+            limits.append(int(limit))
+    return min(limits, default=None)
+
+
+def physical_memory() -> int:
+    """
+    Get the amount of physical memory of the host.
+
+    :rtype: int
+    :return: The amount of memory in bytes.
+    """
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, OSError, ValueError):  # not available on all platforms
+        return 2 ** 63 - 1
+
+
+def available_cpus() -> int:
+    """
+    Get the number of CPUs the current process may run on.
+
+    :rtype: int
+    :return: The number of CPUs.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def detect_budget() -> Resources:
+    """
+    Detect the resources available to build Docker images on this runner,
+    considering the CPU affinity, cgroup quotas and physical memory.
+
+    :rtype: rigel.models.docker.Resources
+    :return: The available CPUs and memory.
+    """
+    cpus = float(available_cpus())
+    cpu_limit = cgroup_cpu_limit()
+    if cpu_limit is not None:
+        cpus = min(cpus, cpu_limit)
+
+    memory = physical_memory()
+    memory_limit = cgroup_memory_limit()
+    if memory_limit is not None:
+        memory = min(memory, memory_limit)
+
+    return Resources(cpus=cpus, memory=memory)
+
+
+def default_jobs(budget: Resources) -> int:
+    """
+    Compute how many Docker images may be built concurrently within a budget,
+    assuming that each build keeps one CPU busy and uses up to 2 GiB of memory.
+
+    :type budget: rigel.models.docker.Resources
+    :param budget: The available resources.
+
+    :rtype: int
+    :return: The number of concurrent builds (at least one).
+    """
+    jobs = math.inf
+    if budget.cpus is not None:
+        jobs = min(jobs, math.floor(budget.cpus / DEFAULT_BUILD_CPUS))
+    if budget.memory is not None:
+        jobs = min(jobs, budget.memory // DEFAULT_BUILD_MEMORY)
+    return 1 if jobs == math.inf else max(1, int(jobs))
@@ -0,0 +1,160 @@
+import heapq
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from rigel.exceptions import CyclicDependencyError
+from rigel.models.docker import Resources
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class BuildScheduler:
+    """
+    A class to run build jobs concurrently while respecting the dependencies between them.
+
+    Each job starts as soon as all of its dependencies finished with success.
+    Whenever several jobs are ready, the one heading the longest remaining chain of
+    dependent jobs (the critical path) starts first. Dependencies on jobs that are not
+    scheduled are considered to be already satisfied.
+    Once a job fails no further jobs are started and the error is raised after
+    all running jobs finish.
+
+    If a budget of resources is given, a job only starts while the expected resource usage of all
+    running jobs plus its own fits the budget. Jobs without a known usage are not accounted for and
+    a job that does not fit the budget at all runs alone.
+    """
+
+    def __init__(
+        self,
+        dependencies: Dict[str, List[str]],
+        jobs: int = 1,
+        weights: Optional[Dict[str, float]] = None,
+        demands: Optional[Dict[str, Resources]] = None,
+        budget: Optional[Resources] = None
+    ) -> None:
+        """
+        :type dependencies: Dict[str, List[str]]
+        :param dependencies: The jobs to schedule (in order of declaration) and the jobs each one depends upon.
+        :type jobs: int
+        :param jobs: Maximum number of jobs to run concurrently.
+        :type weights: Optional[Dict[str, float]]
+        :param weights: The expected cost of each job. Jobs without a known cost are given a cost of 1.
+        :type demands: Optional[Dict[str, rigel.models.docker.Resources]]
+        :param demands: The expected resource usage of each job, if known.
+        :type budget: Optional[rigel.models.docker.Resources]
+        :param budget: The resources available to all running jobs. Unlimited if not set.
+        """
+        self.jobs = max(1, jobs)
+        self.order = {name: index for index, name in enumerate(dependencies)}
+        self.dependencies = {
+            name: [dependency for dependency in job_dependencies if dependency in dependencies]
+            for name, job_dependencies in dependencies.items()
+        }
+        self.dependents: Dict[str, List[str]] = {name: [] for name in dependencies}
+        for name, job_dependencies in self.dependencies.items():
+            for dependency in job_dependencies:
+                self.dependents[dependency].append(name)
+        self.weights = weights or {}
+        self.demands = demands or {}
+        self.budget = budget
+        self.priorities = self.__compute_priorities()
+
+    def __compute_priorities(self) -> Dict[str, float]:
+        """
+        Auxiliary function that computes the length of the critical path headed by each job.
+
+        :rtype: Dict[str, float]
+        :return: The total cost of the longest chain of jobs starting at each job.
+        """
+        priorities: Dict[str, float] = {}
+        pending = {name: len(dependents) for name, dependents in self.dependents.items()}
+        ready = [name for name, count in pending.items() if not count]  # jobs no other job depends upon
+        while ready:
+            name = ready.pop()
+            weight = self.weights.get(name, 1.0)
+            priorities[name] = weight + max((priorities[d] for d in self.dependents[name]), default=0.0)
+            for dependency in self.dependencies[name]:
+                pending[dependency] -= 1
+                if not pending[dependency]:
+                    ready.append(dependency)
+
+        if len(priorities) != len(self.dependencies):
+            cycle = [name for name in self.dependencies if name not in priorities]
+            raise CyclicDependencyError(cycle=' -> '.join(cycle))
+        return priorities
+
+    def fits(self, name: str, running: Iterable[str]) -> bool:
+        """
+        Verify if a job may start without exceeding the budget of resources.
+
+        :type name: string
+        :param name: The name of the job.
+        :type running: Iterable[string]
+        :param running: The names of the jobs currently running.
+
+        :rtype: bool
+        :return: True if the job fits the budget or if no other job is running. False otherwise.
+        """
+        running = list(running)
+        if self.budget is None or not running:
+            return True
+
+        jobs = [self.demands[job] for job in running + [name] if job in self.demands]
+        if self.budget.cpus is not None and sum(job.cpus or 0.0 for job in jobs) > self.budget.cpus:
+            return False
+        if self.budget.memory is not None and sum(job.memory or 0 for job in jobs) > self.budget.memory:
+            return False
+        return True
+
+    def schedule(self) -> List[str]:
+        """
+        Compute the order in which jobs would be started if run one at a time.
+
+        :rtype: List[string]
+        :return: The names of all jobs.
+        """
+        order: List[str] = []
+        self.run(order.append, jobs=1)
+        return order
+
+    def run(self, job: Callable[[str], None], jobs: Optional[int] = None) -> None:
+        """
+        Run all jobs.
+
+        :type job: Callable[[str], None]
+        :param job: The function that runs a job given its name.
+        :type jobs: Optional[int]
+        :param jobs: Maximum number of jobs to run concurrently. Defaults to the value set at creation.
+        """
+        max_workers = jobs or self.jobs
+        pending = {name: len(job_dependencies) for name, job_dependencies in self.dependencies.items()}
+        ready: List[Tuple[float, int, str]] = []
+        for name, count in pending.items():
+            if not count:
+                heapq.heappush(ready, (-self.priorities[name], self.order[name], name))
+
+        errors: List[BaseException] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running: Dict[Future, str] = {}
+            while ready or running:
+
+                # Jobs start in order of priority: a job waiting for resources also holds back the following ones.
+                while ready and len(running) < max_workers and not errors and self.fits(ready[0][2], running.values()):
+                    _, _, name = heapq.heappop(ready)
+                    running[executor.submit(job, name)] = name
+
+                if not running:
+                    break
+
+                done: Set[Future]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        errors.append(error)
+                        continue
+                    for dependent in self.dependents[name]:
+                        pending[dependent] -= 1
+                        if not pending[dependent]:
+                            heapq.heappush(ready, (-self.priorities[dependent], self.order[dependent], dependent))
+
+        if errors:
+            raise errors[0]
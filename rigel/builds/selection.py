@@ -0,0 +1,285 @@
+import fnmatch
+import os
+import subprocess
+import yaml
+from rigel.exceptions import GitRevisionError, UnknownROSPackagesError
+from rigel.files.composer import RigelfileComposer
+from rigel.files.decoder import YAMLDataDecoder
+from rigel.models import DockerSection, DockerfileSection
+from rigelcore.exceptions import RigelError
+from typing import Any, Dict, List, Optional, Set, Union
+from .paths import generate_paths, ssh_key_path
+
+
+def select_packages(
+    packages: List[Union[DockerSection, DockerfileSection]],
+    patterns: List[str]
+) -> List[Union[DockerSection, DockerfileSection]]:
+    """
+    Select a subset of the ROS packages declared in the Rigelfile.
+
+    :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :param packages: All declared ROS packages.
+    :type patterns: List[string]
+    :param patterns: Names or shell-style patterns (e.g. 'robot_*') of the desired ROS packages.
+    If empty all declared ROS packages are selected.
+
+    :rtype: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :return: The desired ROS packages, in order of declaration.
+    """
+    if not patterns:  # consider all declared packages
+        return list(packages)
+
+    unknown_patterns = [
+        pattern for pattern in patterns
+        if not any(fnmatch.fnmatchcase(package.package, pattern) for package in packages)
+    ]
+    if unknown_patterns:  # check if an unknown package was referenced
+        raise UnknownROSPackagesError(packages=', '.join(unknown_patterns))
+
+    return [
+        package for package in packages
+        if any(fnmatch.fnmatchcase(package.package, pattern) for pattern in patterns)
+    ]
+
+
+def add_dependents(
+    packages: List[Union[DockerSection, DockerfileSection]],
+    names: Set[str]
+) -> Set[str]:
+    """
+    Extend a set of ROS packages with all packages that directly or indirectly depend upon them.
+
+    :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :param packages: All declared ROS packages.
+    :type names: Set[string]
+    :param names: The names of the ROS packages to extend.
+
+    :rtype: Set[string]
+    :return: The names of the ROS packages and of all their dependents.
+    """
+    dependents: Dict[str, List[str]] = {package.package: [] for package in packages}
+    for package in packages:
+        for dependency in package.depends_on:
+            dependents.setdefault(dependency, []).append(package.package)
+
+    selected = set(names)
+    stack = list(names)
+    while stack:
+        for dependent in dependents.get(stack.pop(), []):
+            if dependent not in selected:
+                selected.add(dependent)
+                stack.append(dependent)
+    return selected
+
+
+class ChangeDetector:
+    """
+    A class to find which ROS packages are affected by the changes made since a given git revision.
+
+    A ROS package is affected if any of its inputs changed (its build context, its .rosinstall files,
+    its SSH key files or its Dockerfile), if its own declaration inside the Rigelfile or inside the Rigelfile
+    fragment declaring it changed, if it is declared by a newly included Rigelfile fragment
+    or if it depends upon an affected ROS package.
+    """
+
+    def __init__(self, revision: str, rigelfile: str = './Rigelfile') -> None:
+        """
+        :type revision: string
+        :param revision: The git revision to compare against (e.g. 'origin/main').
+        :type rigelfile: string
+        :param rigelfile: The path of the Rigelfile.
+        """
+        self.revision = revision
+        self.rigelfile = os.path.abspath(rigelfile)
+
+    def __git(self, *args: str) -> str:
+        """
+        Auxiliary function that runs a git command inside the folder of the Rigelfile.
+
+        :type args: Tuple[string]
+        :param args: The git command arguments.
+
+        :rtype: string
+        :return: The command output.
+        """
+        try:
+            return subprocess.run(
+                ['git', *args],
+                cwd=os.path.dirname(self.rigelfile),
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True
+            ).stdout
+        except FileNotFoundError:
+            raise GitRevisionError(revision=self.revision, cause='git is not installed')
+        except subprocess.CalledProcessError as exception:
+            raise GitRevisionError(revision=self.revision, cause=exception.stderr.strip())
+
+    def changed_files(self) -> List[str]:
+        """
+        List all files changed since the git revision, including untracked files.
+
+        :rtype: List[string]
+        :return: The absolute paths of the changed files.
+        """
+        toplevel = self.__git('rev-parse', '--show-toplevel').strip()
+        changed = self.__git('diff', '--name-only', self.revision, '--').splitlines()
+        untracked = self.__git('ls-files', '--others', '--exclude-standard', '--full-name').splitlines()
+        return sorted({os.path.normpath(os.path.join(toplevel, path)) for path in changed + untracked if path})
+
+    def __previous_data(self, path: str) -> Any:
+        """
+        Auxiliary function that retrieves the YAML data of a file at the git revision.
+
+        :type path: string
+        :param path: The absolute path of the file.
+
+        :rtype: Any
+        :return: The YAML data. None if the file could not be retrieved or parsed.
+        """
+        try:
+            relative = os.path.relpath(path, os.path.dirname(self.rigelfile))
+            return yaml.safe_load(self.__git('show', f'{self.revision}:./{relative}'))
+        except (RigelError, yaml.YAMLError):
+            return None
+
+    @staticmethod
+    def __current_data(path: str) -> Any:
+        """
+        Auxiliary function that retrieves the current YAML data of a file.
+
+        :type path: string
+        :param path: The path of the file.
+
+        :rtype: Any
+        :return: The YAML data. None if the file could not be read or parsed.
+        """
+        try:
+            with open(path, 'r') as yaml_file:
+                return yaml.safe_load(yaml_file)
+        except (OSError, yaml.YAMLError):
+            return None
+
+    def __changed_declarations(self, path: str, names: List[str]) -> Set[str]:
+        """
+        Auxiliary function that compares the ROS package declarations of a Rigelfile or Rigelfile fragment
+        with those at the git revision.
+
+        :type path: string
+        :param path: The absolute path of the Rigelfile or Rigelfile fragment.
+        :type names: List[string]
+        :param names: The names of the ROS packages to compare.
+
+        :rtype: Set[string]
+        :return: The names of the ROS packages whose declaration changed. All of them if either version is invalid.
+        """
+        previous = self.__declarations(self.__previous_data(path))
+        current = self.__declarations(self.__current_data(path))
+        if previous is None or current is None:
+            return set(names)
+        return {name for name in names if previous.get(name) != current.get(name)}
+
+    @staticmethod
+    def __declarations(yaml_data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Auxiliary function that indexes the ROS package declarations of Rigelfile data by package name.
+
+        :type yaml_data: Any
+        :param yaml_data: The Rigelfile data.
+
+        :rtype: Optional[Dict[str, Any]]
+        :return: The declaration of each ROS package. None if the data is not a valid Rigelfile.
+        """
+        try:
+            data = YAMLDataDecoder().decode(yaml_data)
+            return {declaration['package']: declaration for declaration in data['packages']}
+        except (RigelError, AttributeError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def inputs(package: Union[DockerSection, DockerfileSection]) -> List[str]:
+        """
+        List the files and folders a ROS package is built from.
+
+        :type package: Union[rigel.models.DockerSection, rigel.models.DockerfileSection]
+        :param package: The ROS package.
+
+        :rtype: List[string]
+        :return: The absolute paths of the inputs.
+        """
+        if isinstance(package, DockerfileSection):
+            return [generate_paths(package)[0]]
+
+        root = generate_paths(package)[0]
+        inputs = [os.path.join(root, file) for file in package.rosinstall]
+        inputs.extend(ssh_key_path(package, key) for key in package.ssh if key.file)
+        if package.dir:
+            inputs.append(root)
+        return inputs
+
+    def __affected_by_fragments(self, changed_files: List[str], names: List[str]) -> Set[str]:
+        """
+        Auxiliary function that finds which ROS packages are affected by changes to the Rigelfile fragments.
+
+        :type changed_files: List[string]
+        :param changed_files: The absolute paths of the changed files.
+        :type names: List[string]
+        :param names: The names of all declared ROS packages.
+
+        :rtype: Set[string]
+        :return: The names of the ROS packages declared in newly included fragments
+        or whose declaration changed inside a fragment.
+        """
+        current = self.__current_data(self.rigelfile)
+        includes = (current.get('include') if isinstance(current, dict) else None) or []
+        if not includes:
+            return set()
+
+        composer = RigelfileComposer(self.rigelfile)
+        fragments = composer.fragments(includes)
+        previous_fragments = set(fragments)
+        if self.rigelfile in changed_files:  # the included fragments may have changed
+            previous = self.__previous_data(self.rigelfile)
+            previous_includes = (previous.get('include') if isinstance(previous, dict) else None) or []
+            previous_fragments = set(composer.fragments(previous_includes))
+
+        affected: Set[str] = set()
+        for fragment, fragment_packages in composer.index(fragments).items():
+            declared = [name for name in fragment_packages if name in names]
+            if fragment not in previous_fragments:
+                affected.update(declared)
+            elif fragment in changed_files:
+                affected.update(self.__changed_declarations(fragment, declared))
+        return affected
+
+    def affected_packages(
+        self,
+        packages: List[Union[DockerSection, DockerfileSection]]
+    ) -> List[Union[DockerSection, DockerfileSection]]:
+        """
+        Find which ROS packages are affected by the changes made since the git revision.
+
+        :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :param packages: All declared ROS packages.
+
+        :rtype: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+        :return: The affected ROS packages, in order of declaration.
+        """
+        changed_files = self.changed_files()
+
+        affected: Set[str] = set()
+        for package in packages:
+            for path in self.inputs(package):
+                if any(file == path or file.startswith(path + os.sep) for file in changed_files):
+                    affected.add(package.package)
+                    break
+
+        names = [package.package for package in packages]
+        if self.rigelfile in changed_files:
+            affected.update(self.__changed_declarations(self.rigelfile, names))
+        affected.update(self.__affected_by_fragments(changed_files, names))
+
+        affected = add_dependents(packages, affected)
+        return [package for package in packages if package.package in affected]
@@ -0,0 +1,65 @@
+import threading
+from rigel.models.docker import Registry
+from rigelcore.clients import DockerClient
+from typing import Dict, Optional, Set, Tuple
+
+
+class DockerSession:
+    """
+    A class to share a single Docker client and registry authentications across a whole Rigel execution.
+
+    Each registry is authenticated only once per (server, username) pair,
+    regardless of how many ROS packages are pushed to it.
+    Concurrent authentications with the same registry are serialized.
+    """
+
+    def __init__(self, client: Optional[DockerClient] = None) -> None:
+        """
+        :type client: Optional[rigelcore.clients.DockerClient]
+        :param client: The Docker client to share. Created when first required if not provided.
+        """
+        self.__client = client
+        self.__lock = threading.Lock()
+        self.__login_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self.authenticated: Set[Tuple[str, str]] = set()
+
+    @property
+    def client(self) -> DockerClient:
+        """
+        Get the shared Docker client.
+
+        :rtype: rigelcore.clients.DockerClient
+        :return: The shared Docker client.
+        """
+        with self.__lock:
+            if self.__client is None:
+                self.__client = DockerClient()
+            return self.__client
+
+    def login(self, registry: Registry) -> bool:
+        """
+        Authenticate with a Docker image registry, unless already authenticated.
+
+        :type registry: rigel.models.docker.Registry
+        :param registry: Information about the image registry.
+
+        :rtype: bool
+        :return: True if a new authentication was made. False if a previous authentication was reused.
+        """
+        key = (registry.server, registry.username)
+        with self.__lock:
+            login_lock = self.__login_locks.setdefault(key, threading.Lock())
+
+        with login_lock:
+            if key in self.authenticated:
+                return False
+            self.client.login(registry.server, registry.username, registry.password)
+            self.authenticated.add(key)
+            return True
+
+    def reset(self) -> None:
+        """
+        Forget all registry authentications made so far.
+        """
+        with self.__lock:
+            self.authenticated.clear()
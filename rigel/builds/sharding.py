@@ -0,0 +1,111 @@
+import hashlib
+from rigel.exceptions import InvalidShardError
+from rigel.models import DockerSection, DockerfileSection
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+
+def parse_shard(declaration: str) -> Tuple[int, int]:
+    """
+    Parse a shard declaration.
+
+    :type declaration: string
+    :param declaration: Declaration in the format <INDEX>/<COUNT> (e.g. '2/4'). Indexes start at 1.
+
+    :rtype: Tuple[int, int]
+    :return: The shard index and the total number of shards.
+    """
+    index, _, count = declaration.partition('/')
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        raise InvalidShardError(shard=declaration)
+    if not 1 <= shard[0] <= shard[1]:
+        raise InvalidShardError(shard=declaration)
+    return shard
+
+
+def dependency_closure(packages: List[Union[DockerSection, DockerfileSection]]) -> Dict[str, Set[str]]:
+    """
+    Find the ROS packages each ROS package is directly or indirectly built upon through 'depends_on'.
+    Dependencies on ROS packages that are not given are ignored.
+
+    :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :param packages: The ROS packages.
+
+    :rtype: Dict[string, Set[string]]
+    :return: The names of the ancestors of each ROS package.
+    """
+    dependencies = {package.package: [d for d in package.depends_on if d != package.package] for package in packages}
+    dependencies = {name: [d for d in names if d in dependencies] for name, names in dependencies.items()}
+    closure: Dict[str, Set[str]] = {}
+
+    for name in dependencies:
+        stack = [name]
+        while stack:  # dependencies first (iteratively, since chains of dependencies may be long)
+            current = stack[-1]
+            missing = [d for d in dependencies[current] if d not in closure and d not in stack]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            closure[current] = set(dependencies[current])
+            for dependency in dependencies[current]:
+                closure[current] |= closure.get(dependency, set())
+    return closure
+
+
+def shard_packages(
+    packages: List[Union[DockerSection, DockerfileSection]],
+    index: int,
+    count: int,
+    durations: Optional[Dict[str, float]] = None
+) -> List[Union[DockerSection, DockerfileSection]]:
+    """
+    Select the ROS packages assigned to a given shard.
+
+    Every shard also holds the ROS packages its ROS packages are built upon (see 'depends_on'),
+    so that every image is built on the same runner as the images it is built upon.
+    Only these shared ancestors are built by several shards, which lets dependents of a common base package
+    spread across all shards.
+    The assignment only depends on the names of the ROS packages, on their dependencies and on the provided durations,
+    so that every CI runner computes the same shards independently as long as all runners share the same durations.
+    If the duration of every ROS package is provided the shards are balanced by expected build duration:
+    ROS packages are assigned, longest chain of builds first, to the shard whose total duration grows the least
+    (ancestors already held by a shard cost nothing). ROS packages already held by a shard as an ancestor are not
+    assigned again. Otherwise each ROS package is assigned to a shard according to a hash of its name.
+
+    :type packages: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :param packages: The ROS packages to split.
+    :type index: int
+    :param index: The index of the shard (starting at 1).
+    :type count: int
+    :param count: The total number of shards.
+    :type durations: Optional[Dict[str, float]]
+    :param durations: The expected build duration of each ROS package, shared by all CI runners.
+
+    :rtype: List[Union[rigel.models.DockerSection, rigel.models.DockerfileSection]]
+    :return: The ROS packages of the shard, in order of declaration.
+    """
+    durations = durations or {}
+    closure = dependency_closure(packages)
+    shards: List[Set[str]] = [set() for _ in range(count)]
+
+    if all(package.package in durations for package in packages):
+        loads = [0.0] * count
+
+        def cost(names: Set[str]) -> float:
+            return sum(durations[name] for name in names)
+
+        for name in sorted(closure, key=lambda n: (-cost(closure[n] | {n}), n)):
+            if any(name in shard for shard in shards):
+                continue
+            required = closure[name] | {name}
+            shard = min(range(count), key=lambda s: (loads[s] + cost(required - shards[s]), s))
+            loads[shard] += cost(required - shards[shard])
+            shards[shard] |= required
+    else:
+        for name in closure:
+            digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+            shards[int(digest, 16) % count] |= closure[name] | {name}
+
+    return [package for package in packages if package.package in shards[index - 1]]
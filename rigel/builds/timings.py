@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from contextlib import closing
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+
+
+class BuildRecord(BaseModel):
+    """
+    A single build recorded in the timing database.
+
+    :type started_at: float
+    :cvar started_at: When the build started (seconds since the epoch).
+    :type package: string
+    :cvar package: The name of the ROS package.
+    :type platform: string
+    :cvar platform: The target platform. Empty if built for the host platform.
+    :type duration: float
+    :cvar duration: The build duration (seconds).
+    :type cache_hit: Optional[bool]
+    :cvar cache_hit: Whether the image was fully restored from cache. None if unknown.
+    :type success: bool
+    :cvar success: Whether the build succeeded.
+    """
+    started_at: float
+    package: str
+    platform: str
+    duration: float
+    cache_hit: Optional[bool]
+    success: bool
+
+
+class TimingDatabase:
+    """
+    A class to keep a local history of how long the containerization of each ROS package takes.
+
+    The history is stored in a SQLite database and is used to estimate the duration of future builds.
+    Builds are recorded per platform. The expected duration of a ROS package for a platform is the median duration
+    of its latest successful builds for that platform.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS builds (
+            started_at REAL NOT NULL,
+            package TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            duration REAL NOT NULL,
+            cache_hit INTEGER,
+            success INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS builds_package ON builds (package, platform, started_at);
+    """
+
+    def __init__(self, path: str = '.rigel_config/timings.db', window: int = 5) -> None:
+        """
+        :type path: string
+        :param path: The path of the SQLite database. Created when first written if missing.
+        :type window: int
+        :param window: Number of latest successful builds considered when estimating durations.
+        """
+        self.path = path
+        self.window = window
+        self.__lock = threading.Lock()
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Auxiliary function that opens a connection to the database, creating it if required.
+
+        :rtype: sqlite3.Connection
+        :return: The database connection.
+        """
+        folder = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript(self.SCHEMA)
+        return connection
+
+    def exists(self) -> bool:
+        """
+        Verify if any build was ever recorded.
+
+        :rtype: bool
+        :return: True if the database exists. False otherwise.
+        """
+        return os.path.isfile(self.path)
+
+    def record(
+        self,
+        package: str,
+        platforms: List[str],
+        duration: float,
+        cache_hit: Optional[bool] = None,
+        success: bool = True,
+        started_at: Optional[float] = None
+    ) -> None:
+        """
+        Record a build, once per target platform.
+
+        :type package: string
+        :param package: The name of the ROS package.
+        :type platforms: List[string]
+        :param platforms: The target platforms (built together). Empty if built for the host platform.
+        :type duration: float
+        :param duration: The build duration (seconds).
+        :type cache_hit: Optional[bool]
+        :param cache_hit: Whether the image was fully restored from cache, if known.
+        :type success: bool
+        :param success: Whether the build succeeded.
+        :type started_at: Optional[float]
+        :param started_at: When the build started. Defaults to the current time minus the duration.
+        """
+        if started_at is None:
+            started_at = time.time() - duration
+        with self.__lock, closing(self.__connect()) as connection, connection:
+            connection.executemany(
+                'INSERT INTO builds VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    (started_at, package, platform, duration, None if cache_hit is None else int(cache_hit), int(success))
+                    for platform in platforms or ['']
+                ]
+            )
+
+    def history(self, package: Optional[str] = None, limit: Optional[int] = None) -> List[BuildRecord]:
+        """
+        Retrieve recorded builds, latest first.
+
+        :type package: Optional[string]
+        :param package: Only retrieve builds of this ROS package, if set.
+        :type limit: Optional[int]
+        :param limit: Maximum number of builds to retrieve per ROS package and platform, if set.
+
+        :rtype: List[BuildRecord]
+        :return: The recorded builds.
+        """
+        if not self.exists():
+            return []
+
+        query = 'SELECT * FROM builds'
+        params: List[str] = []
+        if package is not None:
+            query += ' WHERE package = ?'
+            params.append(package)
+        query += ' ORDER BY started_at DESC'
+
+        with self.__lock, closing(self.__connect()) as connection:
+            rows = connection.execute(query, params).fetchall()
+
+        records: List[BuildRecord] = []
+        counts: Dict[Tuple[str, str], int] = {}
+        for started_at, name, platform, duration, cache_hit, success in rows:
+            counts[(name, platform)] = counts.get((name, platform), 0) + 1
+            if limit is None or counts[(name, platform)] <= limit:
+                records.append(BuildRecord(
+                    started_at=started_at,
+                    package=name,
+                    platform=platform,
+                    duration=duration,
+                    cache_hit=None if cache_hit is None else bool(cache_hit),
+                    success=bool(success)
+                ))
+        return records
+
+    def expected_platform_durations(self) -> Dict[Tuple[str, str], float]:
+        """
+        Estimate how long the containerization of each ROS package takes for each platform.
+
+        :rtype: Dict[Tuple[str, str], float]
+        :return: The expected build duration (seconds) of every ROS package and platform with successful builds.
+        The platform is empty for builds for the host platform.
+        """
+        durations: Dict[Tuple[str, str], List[float]] = {}
+        for record in self.history():
+            if record.success:
+                latest = durations.setdefault((record.package, record.platform), [])
+                if len(latest) < self.window:
+                    latest.append(record.duration)
+        return {key: statistics.median(latest) for key, latest in durations.items()}
+
+    def expected_durations(self) -> Dict[str, float]:
+        """
+        Estimate how long the containerization of each ROS package takes.
+        Platforms are built concurrently, hence the longest platform build is expected.
+
+        :rtype: Dict[str, float]
+        :return: The expected build duration (seconds) of every ROS package with successful builds.
+        """
+        durations: Dict[str, float] = {}
+        for (package, _), duration in self.expected_platform_durations().items():
+            durations[package] = max(duration, durations.get(package, 0.0))
+        return durations
@@ -0,0 +1,297 @@
+import abc
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterator, List, Set, Tuple
+
+# Folders whose content is never watched (e.g. build files created by Rigel itself).
+IGNORED_FOLDERS = ['.git', '.rigel_config']
+
+# inotify event flags (see inotify(7)).
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+    IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+IN_EVENT_HEADER = struct.Struct('iIII')
+
+
+class FileWatcher(abc.ABC):
+    """
+    A base class to detect changes made to files and folders (recursively).
+    Watched paths need not exist yet.
+    """
+
+    def __init__(self, paths: List[str]) -> None:
+        """
+        :type paths: List[string]
+        :param paths: The absolute paths of the files and folders to watch.
+        """
+        self.paths = sorted({os.path.normpath(path) for path in paths})
+
+    def relevant(self, path: str) -> bool:
+        """
+        Verify if a changed path must be reported.
+
+        :type path: string
+        :param path: The absolute path of the changed file or folder.
+
+        :rtype: bool
+        :return: True if the path is (inside) a watched path and not inside an ignored folder. False otherwise.
+        """
+        for watched in self.paths:
+            if path == watched:
+                return True
+            if path.startswith(watched + os.sep):
+                return not any(part in IGNORED_FOLDERS for part in os.path.relpath(path, watched).split(os.sep))
+        return False
+
+    @abc.abstractmethod
+    def changes(self, timeout: float) -> Set[str]:
+        """
+        Wait for changes.
+
+        :type timeout: float
+        :param timeout: Maximum time to wait for changes (seconds).
+
+        :rtype: Set[string]
+        :return: The absolute paths of the changed files and folders. Empty if no changes were made.
+        """
+
+    def wait(self, delay: float, timeout: float) -> Set[str]:
+        """
+        Wait for a burst of changes to finish.
+
+        :type delay: float
+        :param delay: Time without further changes after which a burst of changes is considered finished (seconds).
+        :type timeout: float
+        :param timeout: Maximum time to wait for the first change (seconds).
+
+        :rtype: Set[string]
+        :return: The absolute paths of all files and folders changed during the burst. Empty if no changes were made.
+        """
+        changed = self.changes(timeout)
+        if changed:
+            while True:
+                more = self.changes(delay)
+                if not more:
+                    break
+                changed.update(more)
+        return changed
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """
+        Stop watching for changes.
+        """
+
+
+class PollingWatcher(FileWatcher):
+    """
+    A class to detect changes by periodically comparing the state of the watched files.
+    """
+
+    def __init__(self, paths: List[str], interval: float = 1.0) -> None:
+        """
+        :type paths: List[string]
+        :param paths: The absolute paths of the files and folders to watch.
+        :type interval: float
+        :param interval: Time between consecutive comparisons (seconds).
+        """
+        super().__init__(paths)
+        self.interval = interval
+        self.state = self.snapshot()
+
+    def files(self) -> Iterator[str]:
+        """
+        List all files and folders currently inside the watched paths.
+
+        :rtype: Iterator[string]
+        :return: The absolute paths of the files and folders.
+        """
+        for path in self.paths:
+            if os.path.exists(path):
+                yield path
+            if os.path.isdir(path):
+                for folder, folders, files in os.walk(path):
+                    folders[:] = [name for name in folders if name not in IGNORED_FOLDERS]
+                    for name in folders + files:
+                        yield os.path.join(folder, name)
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Take the state of all files and folders currently inside the watched paths.
+
+        :rtype: Dict[string, Tuple[int, int]]
+        :return: The modification time (nanoseconds) and size of each file and folder.
+        """
+        state: Dict[str, Tuple[int, int]] = {}
+        for path in self.files():
+            try:
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass  # removed meanwhile
+        return state
+
+    def changes(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(max(0.0, min(self.interval, deadline - time.monotonic())))
+            state = self.snapshot()
+            changed = {path for path in set(state) | set(self.state) if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+    def close(self) -> None:
+        self.state = {}  # nothing to release
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    A class to detect changes using the inotify API of the Linux kernel.
+    """
+
+    def __init__(self, paths: List[str]) -> None:
+        """
+        :type paths: List[string]
+        :param paths: The absolute paths of the files and folders to watch.
+        """
+        super().__init__(paths)
+        library = ctypes.util.find_library('c') if sys.platform.startswith('linux') else None
+        if library is None:
+            raise OSError('inotify is not available')
+        self.libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError('inotify is not available')
+
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self.watches: Dict[int, str] = {}  # folder watched by each watch descriptor
+        try:
+            for path in self.paths:
+                if os.path.isdir(path):
+                    self.add_folder(path)
+                else:  # files (and paths that do not exist yet) are watched through their parent folder
+                    self.add_watch(os.path.dirname(path))
+        except OSError:
+            self.close()
+            raise
+
+    def add_watch(self, folder: str) -> None:
+        """
+        Watch the direct content of a folder.
+
+        :type folder: string
+        :param folder: The absolute path of the folder.
+        """
+        descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), IN_WATCH_MASK)
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:  # the limit of watches was reached
+                raise OSError(error, os.strerror(error))
+            return  # the folder is missing or was removed meanwhile
+        self.watches[descriptor] = folder
+
+    def add_folder(self, folder: str) -> None:
+        """
+        Watch a folder and all its subfolders.
+
+        :type folder: string
+        :param folder: The absolute path of the folder.
+        """
+        for path, folders, _ in os.walk(folder):
+            folders[:] = [name for name in folders if name not in IGNORED_FOLDERS]
+            self.add_watch(path)
+
+    def read_events(self) -> Iterator[Tuple[int, int, str]]:
+        """
+        Read all pending inotify events.
+
+        :rtype: Iterator[Tuple[int, int, string]]
+        :return: The watch descriptor, flags and file name of each event.
+        """
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + IN_EVENT_HEADER.size <= len(data):
+                descriptor, mask, _, length = IN_EVENT_HEADER.unpack_from(data, offset)
+                offset += IN_EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                yield descriptor, mask, name
+
+    def changes(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        changed: Set[str] = set()
+        while not changed:
+            remaining = deadline - time.monotonic()
+            if remaining < 0 or not select.select([self.fd], [], [], remaining)[0]:
+                break
+            for descriptor, mask, name in self.read_events():
+                if mask & IN_Q_OVERFLOW:  # events were lost
+                    changed.update(self.paths)
+                    continue
+                folder = self.watches.get(descriptor)
+                if folder is None:
+                    continue
+                if mask & IN_IGNORED:  # the folder was removed
+                    del self.watches[descriptor]
+                    continue
+                path = os.path.join(folder, name) if name else folder
+                if not self.relevant(path):
+                    continue
+                changed.add(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_folder(path)
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(paths: List[str], polling: bool = False, interval: float = 1.0) -> FileWatcher:
+    """
+    Create a watcher of files and folders. inotify is used whenever available.
+
+    :type paths: List[string]
+    :param paths: The absolute paths of the files and folders to watch.
+    :type polling: bool
+    :param polling: Always compare the state of the watched files periodically instead.
+    :type interval: float
+    :param interval: Time between consecutive comparisons (seconds), when polling.
+
+    :rtype: FileWatcher
+    :return: The watcher.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(paths)
+        except OSError:
+            pass  # e.g. not running on Linux or too many folders to watch
+    return PollingWatcher(paths, interval)
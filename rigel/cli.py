@@ -1,32 +1,27 @@
 import click
 import os
 import signal
+import statistics
 import sys
-from pathlib import Path
-from rigelcore.clients import DockerClient
 from rigelcore.exceptions import RigelError
 from rigelcore.loggers import ErrorLogger, MessageLogger
-from rigelcore.simulations import SimulationRequirementsParser
-from rigelcore.simulations.requirements import SimulationRequirementsManager
-from rigel.exceptions import (
-    RigelfileAlreadyExistsError,
-    UnknownROSPackagesError
-)
-from rigel.files import (
-    Renderer,
-    RigelfileCreator,
-    YAMLDataDecoder,
-    YAMLDataLoader
-)
-from rigel.models import DockerSection, Rigelfile, PluginSection
-from rigel.models.docker import SUPPORTED_PLATFORMS, DockerfileSection
-from rigel.plugins import Plugin, PluginInstaller
-from rigel.plugins.loader import PluginLoader
-from rigelcore.models import ModelBuilder
-from typing import Any, Dict, List, Tuple, Union
+from rigel.api import Project
+from rigel.builds import BuildRecord, DockerSession, preflight_report, select_packages
+from rigel.client import SOCKET_FILE
+from rigel.daemon import serve
+from rigel.exceptions import PreflightError, RigelfileAlreadyExistsError
+from rigel.files import RigelfileCreator
+from rigel.metrics import MetricsRegistry, MetricsServer
+from rigel.plugins import PluginInstaller
+from rigel.profiling import CommandProfiler, PROFILE_FILE
+from typing import Any, Dict, List, Optional, Tuple
 
 
 MESSAGE_LOGGER = MessageLogger()
+DOCKER_SESSION = DockerSession()
+PROJECTS: Dict[str, Project] = {}  # reused by all commands run by a Rigel daemon
+METRICS: Optional[MetricsRegistry] = None  # collected only if requested
+METRICS_SERVERS: Dict[int, MetricsServer] = {}
 
 
 def handle_rigel_error(err: RigelError) -> None:
@@ -40,31 +35,48 @@ def handle_rigel_error(err: RigelError) -> None:
     sys.exit(err.code)
 
 
-def create_folder(path: str) -> None:
+def get_project() -> Project:
     """
-    Create a folder in case it does not exist yet.
+    Get the Rigel project at the current directory.
 
-    :type path: string
-    :param path: Path of the folder to be created.
+    :rtype: rigel.api.Project
+    :return: The Rigel project.
     """
-    Path(path).mkdir(parents=True, exist_ok=True)
+    root = os.path.abspath('.')
+    if root not in PROJECTS:
+        PROJECTS[root] = Project(root, MESSAGE_LOGGER, DOCKER_SESSION)
+    PROJECTS[root].metrics = METRICS
+    return PROJECTS[root]
 
 
-# TODO: change return type to Rigelfile
-def parse_rigelfile() -> Any:
+def enable_metrics(textfile: Optional[str], port: Optional[int]) -> None:
     """
-    Parse information inside local Rigelfile.
+    Start collecting metrics about builds, external plugins and simulations.
+    Metrics are kept for the lifetime of the process (e.g. of a Rigel daemon).
 
-    :rtype: rigle.models.Rigelfile
-    :return: The parsed information.
+    :type textfile: Optional[string]
+    :param textfile: The path of the file where to write the metrics (Prometheus text format), if any.
+    :type port: Optional[int]
+    :param port: The local port where to expose the metrics at /metrics, if any.
     """
-    loader = YAMLDataLoader('./Rigelfile')
-    decoder = YAMLDataDecoder()
+    global METRICS
+    if textfile is None and port is None:
+        return
 
-    yaml_data = decoder.decode(loader.load())
+    if METRICS is None:
+        METRICS = MetricsRegistry()
+    if textfile is not None:
+        METRICS.textfile = os.path.abspath(textfile)
 
-    builder = ModelBuilder(Rigelfile)
-    return builder.build([], yaml_data)
+    if port is not None and port not in METRICS_SERVERS:
+        try:
+            server = MetricsServer(METRICS, port)
+        except OSError as err:
+            MESSAGE_LOGGER.warning(f'Unable to expose metrics at port {port}: {err}')
+            return
+        server.start()
+        METRICS_SERVERS[port] = server
+        MESSAGE_LOGGER.info(f'Exposing metrics at http://127.0.0.1:{server.port}/metrics')
 
 
 def rigelfile_exists() -> bool:
@@ -77,120 +89,99 @@ def rigelfile_exists() -> bool:
     return os.path.isfile('./Rigelfile')
 
 
-def load_plugin(
-        plugin: PluginSection,
-        application_args: List[Any],
-        application_kwargs: Dict[str, Any]
-        ) -> Tuple[str, Plugin]:
+def stop_plugins_on_signal(project: Project) -> None:
     """
-    Load an external plugin.
+    Gracefully stop the external plugins of a project whenever the user interrupts Rigel.
 
-    :type plugin: rigel.models.PluginSection
-    :param plugin: Metadata about the external plugin.
-    :type application_args: List[Any]
-    :param application_args: Additional positional arguments to be passed the plugin.
-    :type application_kwargs: Dict[str, Any]
-    :param application_kwargs: Additional keyword arguments to be passed the plugin.
-
-    :rtype: Tuple[str, rigel.plugin.Plugin]
-    :return: An instance of the external plugin.
+    :type project: rigel.api.Project
+    :param project: The Rigel project.
     """
-    MESSAGE_LOGGER.warning(f"Loading external plugin '{plugin.name}'.")
-    try:
-
-        loader = PluginLoader()
-
-        if application_args:
-            plugin.args = application_args + plugin.args
+    def stop_plugins(*args: Any) -> None:
+        project.stop_plugins()
+        sys.exit(0)
 
-        if application_kwargs:
-            plugin.kwargs.update(application_kwargs)
+    signal.signal(signal.SIGINT, stop_plugins)
+    signal.signal(signal.SIGTSTP, stop_plugins)
 
-        plugin_instance = loader.load(plugin)
 
-    except RigelError as err:
-        handle_rigel_error(err)
-
-    return (plugin.name, plugin_instance)
-
-
-def run_plugin(plugin: Tuple[str, Plugin]) -> None:
+class RigelGroup(click.Group):
     """
-    Run an external plugin.
-
-    :type plugin: Tuple[str, rigel.plugin.Plugin]
-    :param plugin: An external plugin to be run.
+    The group of all Rigel commands.
     """
-    try:
-
-        plugin_name, plugin_instance = plugin
 
-        def stop_plugin(*args: Any) -> None:
-            plugin_instance.stop()
-            MESSAGE_LOGGER.info(f"Plugin '{plugin_name}' stopped executing gracefully.")
-            sys.exit(0)
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        # Option '--profile' takes an optional value (i.e. '--profile[=FILE]'):
+        # make sure that the name of the command that follows is never taken as the output file.
+        args = list(args)
+        for index, arg in enumerate(args):
+            following = args[index + 1] if index + 1 < len(args) else None
+            if arg == '--profile' and (following is None or following in self.commands or following.startswith('-')):
+                args[index] = f'--profile={PROFILE_FILE}'
+        return super().parse_args(ctx, args)
 
-        signal.signal(signal.SIGINT, stop_plugin)
-        signal.signal(signal.SIGTSTP, stop_plugin)
 
-        MESSAGE_LOGGER.warning(f"Executing external plugin '{plugin_name}'.")
-        plugin_instance.run()
-
-        plugin_instance.stop()
-        MESSAGE_LOGGER.info(f"Plugin '{plugin_name}' finished execution with success.")
-
-    except RigelError as err:
-        handle_rigel_error(err)
-
-
-def run_simulation_plugin(
-    plugin: Tuple[str, Plugin],
-    manager: SimulationRequirementsManager,
-) -> None:
+def profile_command(ctx: click.Context, path: str, speedscope: bool) -> None:
     """
-    Run an external simulation plugin.
+    Profile the command invoked with the given context. The profile is written once the command finishes.
 
-    :type plugin: Tuple[str, rigel.plugin.Plugin]
-    :param plugin: An external plugin to be run.
-    :type manager: rigelcore.simulations.SimulationRequirementsManager
-    :param manager: The simulation requirements associated with the external plugin.
-    :type manager: rigelcore.simulations.SimulationRequirementsManager
-    :param manager: The simulation requirements associated with the external plugin.
+    :type ctx: click.Context
+    :param ctx: The context of the Rigel command group.
+    :type path: string
+    :param path: The path of the pstats file.
+    :type speedscope: bool
+    :param speedscope: Also write a speedscope-compatible JSON file next to the pstats file.
     """
-    try:
-
-        plugin_name, plugin_instance = plugin
-
-        def stop_plugin(*args: Any) -> None:
-            plugin_instance.stop()
-            MESSAGE_LOGGER.info(f"Plugin '{plugin_name}' stopped executing gracefully.")
-            sys.exit(0)
-
-        signal.signal(signal.SIGINT, stop_plugin)
-        signal.signal(signal.SIGTSTP, stop_plugin)
+    profiler = CommandProfiler(speedscope)
 
-        MESSAGE_LOGGER.warning(f"Executing external plugin '{plugin_name}'.")
-        plugin_instance.run()
-        MESSAGE_LOGGER.warning("Simulation started.")
+    def write_profile() -> None:
+        profiler.stop()
+        for output in profiler.write(path, f'rigel {ctx.invoked_subcommand}'):
+            MESSAGE_LOGGER.info(f"Profile written to '{output}'")
 
-        while True:  # wait for test stage to finish
-            if manager.finished:
-                break
-
-        print(manager)
-        plugin_instance.stop()
-        MESSAGE_LOGGER.info(f"Plugin '{plugin_name}' finished executing.")
-
-    except RigelError as err:
-        handle_rigel_error(err)
+    ctx.call_on_close(write_profile)
+    profiler.start()
 
 
-@click.group()
-def cli() -> None:
+@click.group(cls=RigelGroup)
+@click.option(
+    '--profile',
+    type=str,
+    default=None,
+    metavar='[=FILE]',
+    help=f"Profile the command and write a pstats file (default: '{PROFILE_FILE}')."
+)
+@click.option(
+    '--speedscope',
+    is_flag=True,
+    default=False,
+    help='Also write a speedscope-compatible JSON file with sampled call stacks of all threads (implies --profile).'
+)
+@click.option(
+    '--metrics-textfile',
+    type=str,
+    default=None,
+    help='Write metrics to a file in the Prometheus text format (e.g. for the node exporter textfile collector).'
+)
+@click.option(
+    '--metrics-port',
+    type=int,
+    default=None,
+    help='Expose metrics at http://127.0.0.1:<port>/metrics while Rigel runs (e.g. alongside a daemon).'
+)
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    profile: Optional[str],
+    speedscope: bool,
+    metrics_textfile: Optional[str],
+    metrics_port: Optional[int]
+) -> None:
     """
     Rigel - containerize and deploy your ROS application using Docker
     """
-    pass
+    enable_metrics(metrics_textfile, metrics_port)
+    if profile is not None or speedscope:
+        profile_command(ctx, profile or PROFILE_FILE, speedscope)
 
 
 @click.command()
@@ -212,237 +203,233 @@ def init(force: bool) -> None:
         handle_rigel_error(err)
 
 
-def create_package_files(package: DockerSection) -> None:
-    """
-    Create all the files required to containerize a given ROS package.
-
-    :type package: rigel.models.DockerSection
-    :param package: The ROS package whose Dockerfile is to be created.
-    """
-    MESSAGE_LOGGER.warning(f"Creating build files for package {package.package}.")
-
-    if package.dir:
-        path = os.path.abspath(f'{package.dir}/.rigel_config')
-    else:
-        path = os.path.abspath(f'.rigel_config/{package.package}')
-
-    create_folder(path)
-
-    renderer = Renderer(package)
-
-    renderer.render('Dockerfile.j2', f'{path}/Dockerfile')
-    MESSAGE_LOGGER.info(f"Created file {path}/Dockerfile")
-
-    renderer.render('entrypoint.j2', f'{path}/entrypoint.sh')
-    MESSAGE_LOGGER.info(f"Created file {path}/entrypoint.sh")
-
-    if package.ssh:
-        renderer.render('config.j2', f'{path}/config')
-        MESSAGE_LOGGER.info(f"Created file {path}/config")
-
-
 @click.command()
-@click.option('--pkg', multiple=True, help='A list of desired packages.')
-def create(pkg: Tuple[str]) -> None:
+@click.option('--pkg', multiple=True, help='A list of desired packages (shell-style patterns allowed).')
+@click.option('--prefetch', is_flag=True, default=False, help='Fetch external repositories in advance using a mirror cache.')
+@click.option('--jobs', type=int, default=4, show_default=True, help='Maximum number of repositories to fetch concurrently.')
+@click.option('--bake', is_flag=True, default=False, help='Also describe all packages in a single docker buildx bake file.')
+@click.option('--cache-dir', type=str, default=None, help='Folder where to keep a local build cache per package (bake only).')
+@click.option('--shard', type=str, default=None, help="Only handle one shard of the selected packages (e.g. '2/4').")
+def create(pkg: Tuple[str], prefetch: bool, jobs: int, bake: bool, cache_dir: Optional[str], shard: Optional[str]) -> None:
     """
     Create all files required to containerize your ROS packages.
     """
-    list_packages = list(pkg)
     try:
-        rigelfile = parse_rigelfile()
-        if not list_packages:  # consider all declared packages
-            desired_packages = rigelfile.packages
-        else:
-            desired_packages = []
-            for package in rigelfile.packages:
-                if package.package in list_packages:
-                    desired_packages.append(package)
-                    list_packages.remove(package.package)
-            if list_packages:  # check if an unknown package was referenced
-                raise UnknownROSPackagesError(packages=', '.join(list_packages))
-
-        for package in desired_packages:
-            if isinstance(package, DockerSection):
-                create_package_files(package)
-
+        get_project().create(list(pkg), prefetch, jobs, bake, cache_dir, shard)
     except RigelError as err:
         handle_rigel_error(err)
 
 
-def login_registry(package: Union[DockerSection, DockerfileSection]) -> None:
+@click.command()
+@click.option('--pkg', multiple=True, help='A list of desired packages (shell-style patterns allowed).')
+@click.option("--load", is_flag=True, show_default=True, default=False, help="Store built image locally.")
+@click.option("--push", is_flag=True, show_default=True, default=False, help="Store built image in a remote registry.")
+@click.option(
+    '--jobs',
+    type=int,
+    default=None,
+    help='Maximum number of packages to build concurrently. Defaults to what fits the available CPUs and memory (cgroup aware).'
+)
+@click.option("--split-platforms", is_flag=True, default=False, help="Build each platform image as a separate concurrent job.")
+@click.option(
+    "--builder-endpoint",
+    multiple=True,
+    help="Remote BuildKit endpoint for a platform when splitting platforms (e.g. 'linux/arm64=tcp://arm-node:1234')."
+)
+@click.option('--bake', is_flag=True, default=False, help='Build all packages with a single docker buildx bake invocation.')
+@click.option('--cache-dir', type=str, default=None, help='Folder where to keep a local build cache per package (bake only).')
+@click.option(
+    '--changed-since',
+    type=str,
+    default=None,
+    help='Only build packages affected by changes made since a git revision (and their dependents).'
+)
+@click.option('--shard', type=str, default=None, help="Only handle one shard of the selected packages (e.g. '2/4').")
+@click.option(
+    '--watch',
+    is_flag=True,
+    default=False,
+    help='Keep building packages whenever they change (only --pkg, --load, --push and --jobs apply).'
+)
+@click.option('--poll', is_flag=True, default=False, help='Detect changes by polling files instead of inotify (watch only).')
+@click.option('--quiet', is_flag=True, default=False, help='Only write build output to the build logs at .rigel_config/logs.')
+@click.option(
+    '--resume',
+    is_flag=True,
+    default=False,
+    help='Skip packages already built by the previous (interrupted or failed) run whose inputs did not change.'
+)
+@click.option('--skip-preflight', is_flag=True, default=False, help='Do not check whether all packages are ready to be built.')
+@click.option('--skip-pull', is_flag=True, default=False, help='Do not pull the base images of all packages before building.')
+def build(
+    pkg: Tuple[str],
+    load: bool,
+    push: bool,
+    jobs: Optional[int],
+    split_platforms: bool,
+    builder_endpoint: Tuple[str],
+    bake: bool,
+    cache_dir: Optional[str],
+    changed_since: Optional[str],
+    shard: Optional[str],
+    watch: bool,
+    poll: bool,
+    quiet: bool,
+    resume: bool,
+    skip_preflight: bool,
+    skip_pull: bool
+) -> None:
     """
-    Login to a Docker image registry.
-
-    :param package: The ROS package to be containerized and deployed.
-    :type package: DockerSection
+    Build a Docker image of your ROS packages.
     """
-    docker = DockerClient()
-
-    # Authenticate with registry
-    if package.registry:
-
-        server = package.registry.server
-        username = package.registry.username
-        password = package.registry.password
-
-        try:
-
-            MESSAGE_LOGGER.info(f'Authenticating with registry {server}')
-            docker.login(
-                server,
-                username,
-                password
-            )
-
-        except RigelError as err:
-            handle_rigel_error(err)
-
-
-def generate_paths(package: DockerSection) -> Tuple[str, str]:
-    if package.dir:
-        return (
-            os.path.abspath(f'{package.dir}'),                      # package root
-            os.path.abspath(f'{package.dir}/.rigel_config')         # Dockerfile folder
-        )
-    else:
-        return (
-            os.path.abspath(f'.rigel_config/{package.package}'),    # package root
-            os.path.abspath(f'.rigel_config/{package.package}')     # Dockerfile folder
+    try:
+        project = get_project()
+        project.echo_builds = not quiet
+
+        if watch:
+            try:
+                project.watch(list(pkg), load, push, jobs, polling=poll)
+            except KeyboardInterrupt:
+                MESSAGE_LOGGER.info('Stopped watching for changes.')
+            return
+
+        project.build(
+            list(pkg),
+            load,
+            push,
+            jobs,
+            split_platforms,
+            list(builder_endpoint),
+            bake,
+            cache_dir,
+            changed_since,
+            shard,
+            resume,
+            not skip_preflight,
+            not skip_pull
         )
+    except RigelError as err:
+        handle_rigel_error(err)
 
 
-def containerize_package(package: DockerSection, load: bool, push: bool) -> None:
+@click.command()
+@click.option('--pkg', multiple=True, help='A list of desired packages (shell-style patterns allowed).')
+@click.option('--shard', type=str, default=None, help="Only handle one shard of the selected packages (e.g. '2/4').")
+def preflight(pkg: Tuple[str], shard: Optional[str]) -> None:
     """
-    Containerize a given ROS package.
-
-    :type package: rigel.models.DockerSection
-    :param package: The ROS package whose Dockerfile is to be created.
-    :type load: bool
-    :param package: Store built image locally.
-    :type push: bool
-    :param package: Store built image in a remote registry.
+    Check whether your ROS packages are ready to be built.
     """
-    MESSAGE_LOGGER.warning(f"Containerizing package {package.package}.")
-    if package.ssh and not package.rosinstall:
-        MESSAGE_LOGGER.warning('No .rosinstall file was declared. Recommended to remove unused SSH keys from Dockerfile.')
-
-    buildargs: Dict[str, str] = {}
-    for key in package.ssh:
-        if not key.file:
-            value = os.environ[key.value]  # NOTE: SSHKey model ensures that environment variable is declared.
-            buildargs[key.value] = value
-
-    path = generate_paths(package)
-
-    docker = DockerClient()
-
-    login_registry(package)
-
-    platforms = package.platforms or None
-
-    docker.create_builder('rigel-builder', use=True)
-    MESSAGE_LOGGER.info("Created builder 'rigel-builder'")
+    try:
+        failures = get_project().preflight(list(pkg), shard)
+        if failures:
+            raise PreflightError(report=preflight_report(failures))
+        MESSAGE_LOGGER.info('All packages are ready to be built.')
+    except RigelError as err:
+        handle_rigel_error(err)
 
-    # Ensure that QEMU is properly configured before building an image.
-    for docker_platform, _, qemu_config_file in SUPPORTED_PLATFORMS:
-        if not os.path.exists(f'/proc/sys/fs/binfmt_misc/{qemu_config_file}'):
-            docker.run_container(
-                'qus',
-                'aptman/qus',
-                command=['-s -- -c -p'],
-                privileged=True,
-                remove=True,
-            )
-            MESSAGE_LOGGER.info(f"Created QEMU configuration file for '{docker_platform}'")
 
-    # Build the Docker image.
-    MESSAGE_LOGGER.info(f"Building Docker image '{package.image}'")
+@click.command()
+@click.option('--update', is_flag=True, default=False, help='Resolve all base images and repositories again.')
+@click.option('--jobs', type=int, default=4, show_default=True, help='Maximum number of inputs to resolve concurrently.')
+def lock(update: bool, jobs: int) -> None:
+    """
+    Pin base images and external repositories of your ROS packages inside Rigelfile.lock.
+    Packages built from their own Dockerfile are not locked.
+    """
     try:
+        get_project().lock(update, jobs)
+    except RigelError as err:
+        handle_rigel_error(err)
 
-        kwargs = {
-            "file": f'{path[1]}/Dockerfile',
-            "tags": package.image,
-            "load": load,
-            "push": push
-        }
 
-        if buildargs:
-            kwargs["build_args"] = buildargs
+@click.command()
+@click.option('--pkg', multiple=True, help='A list of desired packages (shell-style patterns allowed).')
+@click.option('--limit', type=int, default=10, show_default=True, help='Number of latest builds to consider per package.')
+@click.option('--export', is_flag=True, default=False, help='Write expected durations to Rigelfile.durations to balance shards.')
+def stats(pkg: Tuple[str], limit: int, export: bool) -> None:
+    """
+    Show how long building your ROS packages takes.
+    """
+    try:
+        project = get_project()
+        if export:
+            project.export_durations()
+            return
 
-        if platforms:
-            kwargs["platforms"] = platforms
+        desired_packages = select_packages(project.parse(list(pkg) or None).packages, list(pkg))
 
-        docker.build_image(path[0], **kwargs)
+        timings = project.timings
+        if not timings.exists():
+            MESSAGE_LOGGER.warning('No builds were recorded yet.')
+            return
 
-        MESSAGE_LOGGER.info(f"Docker image '{package.image}' built with success.")
-        if push:
-            MESSAGE_LOGGER.info(f"Docker image '{package.image}' pushed with success.")
+        print(f"{'PACKAGE':<30} {'PLATFORM':<14} {'BUILDS':>6} {'LAST':>9} {'MEDIAN':>9} {'TREND':>7} {'CACHED':>7}")
+        for package in desired_packages:
+            platforms: Dict[str, List[BuildRecord]] = {}
+            for record in timings.history(package.package, limit):
+                if record.success:
+                    platforms.setdefault(record.platform, []).append(record)
+            if not platforms:
+                print(f"{package.package:<30} {'-':<14} {0:>6} {'-':>9} {'-':>9} {'-':>7} {'-':>7}")
+                continue
+
+            for platform, records in sorted(platforms.items()):
+                durations = [r.duration for r in records]  # latest first
+                half = len(durations) // 2
+                trend = '-'
+                if half:  # compare the latest half of the builds with the oldest half
+                    recent, older = statistics.median(durations[:half]), statistics.median(durations[-half:])
+                    trend = f'{(recent - older) / older:+.0%}' if older else '-'
+
+                hits = [r.cache_hit for r in records if r.cache_hit is not None]
+                cached = f'{sum(hits) / len(hits):.0%}' if hits else '-'
+
+                print(
+                    f"{package.package:<30} {platform or 'host':<14} {len(records):>6} {durations[0]:>8.1f}s "
+                    f"{statistics.median(durations):>8.1f}s {trend:>7} {cached:>7}"
+                )
 
     except RigelError as err:
         handle_rigel_error(err)
 
-    finally:
-        # In all situations make sure to remove the builder if existent
-        docker.remove_builder('rigel-builder')
-        MESSAGE_LOGGER.info("Removed builder 'rigel-builder'")
-
-
-def build_image(package: DockerfileSection, load: bool, push: bool) -> None:
-    """
-    Containerize a given ROS package (existing Dockerfile).
 
-    :type package: rigel.models.DockerfileSection
-    :param package: The Dockerfile to use to containerize.
-    :type load: bool
-    :param package: Store built image locally.
-    :type push: bool
-    :param package: Store built image in a remote registry.
+def format_size(size: float) -> str:
     """
-    MESSAGE_LOGGER.warning(f"Creating Docker image using provided Dockerfile at {package.dockerfile}")
-
-    login_registry(package)
+    Format an amount of bytes as a human-readable string.
 
-    path = os.path.abspath(package.dockerfile)
+    :type size: float
+    :param size: The amount of bytes.
 
-    MESSAGE_LOGGER.info(f"Building Docker image {package.image}")
-    builder = DockerClient()
-    kwargs = {
-        "tags": package.image,
-        "load": load,
-        "push": push
-    }
-    builder.build_image(path, **kwargs)
-
-    MESSAGE_LOGGER.info(f"Docker image '{package.image}' built with success.")
+    :rtype: string
+    :return: The formatted amount.
+    """
+    units = ['B', 'KB', 'MB', 'GB', 'TB']
+    exponent = 0
+    while size >= 1024 and exponent < len(units) - 1:
+        size /= 1024
+        exponent += 1
+    return f'{size:.1f} {units[exponent]}' if exponent else f'{int(size)} B'
 
 
-@click.command()
-@click.option('--pkg', multiple=True, help='A list of desired packages.')
-@click.option("--load", is_flag=True, show_default=True, default=False, help="Store built image locally.")
-@click.option("--push", is_flag=True, show_default=True, default=False, help="Store built image in a remote registry.")
-def build(pkg: Tuple[str], load: bool, push: bool) -> None:
+@click.command('context-size')
+@click.option('--pkg', multiple=True, help='A list of desired packages (shell-style patterns allowed).')
+def context_size(pkg: Tuple[str]) -> None:
     """
-    Build a Docker image of your ROS packages.
+    Report the size of the build context of your ROS packages.
     """
-    list_packages = list(pkg)
-    rigelfile = parse_rigelfile()
     try:
-        if not list_packages:  # consider all declared packages
-            desired_packages = rigelfile.packages
-        else:
-            desired_packages = []
-            for package in rigelfile.packages:
-                if package.package in list_packages:
-                    desired_packages.append(package)
-                    list_packages.remove(package.package)
-            if list_packages:  # check if an unknown package was referenced
-                raise UnknownROSPackagesError(packages=', '.join(list_packages))
+        project = get_project()
+        desired_packages = select_packages(project.parse(list(pkg) or None).packages, list(pkg))
 
+        total = 0
         for package in desired_packages:
-            if isinstance(package, DockerSection):
-                containerize_package(package, load, push)
-            else:  # DockerfileSection
-                build_image(package, load, push)
+            context = project.build_context(package)
+            size, count, entries = context.size()
+            total += size
+            MESSAGE_LOGGER.info(f"Package {package.package}: {format_size(size)} in {count} files ({context.root})")
+            for entry, entry_size in sorted(entries.items(), key=lambda item: item[1], reverse=True)[:5]:
+                print(f'  {format_size(entry_size):>10}  {entry}')
+        MESSAGE_LOGGER.info(f'Total: {format_size(total)}')
 
     except RigelError as err:
         handle_rigel_error(err)
@@ -454,17 +441,12 @@ def deploy() -> None:
     Push a Docker image to a remote image registry.
     """
     MESSAGE_LOGGER.info('Deploying containerized ROS package.')
-
-    rigelfile = parse_rigelfile()
-    if rigelfile.deploy:
-
-        # Run external deployment plugins.
-        for plugin_section in rigelfile.deploy:
-            plugin = load_plugin(plugin_section, [], {})
-            run_plugin(plugin)
-
-    else:
-        MESSAGE_LOGGER.warning('No deployment plugin declared inside Rigelfile.')
+    try:
+        project = get_project()
+        stop_plugins_on_signal(project)
+        project.deploy()
+    except RigelError as err:
+        handle_rigel_error(err)
 
 
 @click.command()
@@ -473,27 +455,49 @@ def run() -> None:
     Start your containerized ROS application.
     """
     MESSAGE_LOGGER.info('Starting containerized ROS application.')
+    try:
+        project = get_project()
+        stop_plugins_on_signal(project)
+        for result in project.run():
+            print(result.report)
+    except RigelError as err:
+        handle_rigel_error(err)
 
-    rigelfile = parse_rigelfile()
-    if rigelfile.simulate:
 
-        for plugin_section in rigelfile.simulate.plugins:
+def run_command(args: List[str]) -> int:
+    """
+    Run a Rigel command inside the current process.
 
-            requirements_manager = SimulationRequirementsManager(rigelfile.simulate.timeout)
+    :type args: List[string]
+    :param args: The command arguments.
 
-            # Parse simulation requirements.
-            requirements_parser = SimulationRequirementsParser()
-            for hpl_statement in rigelfile.simulate.introspection:
-                requirement = requirements_parser.parse(hpl_statement)
-                requirement.father = requirements_manager
-                requirements_manager.children.append(requirement)
+    :rtype: int
+    :return: The exit code of the command.
+    """
+    try:
+        cli.main(args, prog_name='rigel')
+    except SystemExit as exit:
+        if isinstance(exit.code, int):
+            return exit.code
+        return 0 if exit.code is None else 1
+    return 0
 
-            # Run external simulation plugins.
-            plugin = load_plugin(plugin_section, [requirements_manager], {})
-            run_simulation_plugin(plugin, requirements_manager)
 
-    else:
-        MESSAGE_LOGGER.warning('No simulation plugin declared inside Rigelfile.')
+@click.command()
+def daemon() -> None:
+    """
+    Serve Rigel commands over a local Unix socket, keeping the Rigelfile parsed and the Docker client ready.
+    """
+    try:
+        get_project().parse()
+        serve(
+            run_command,
+            SOCKET_FILE,
+            lambda: MESSAGE_LOGGER.info(f"Rigel daemon serving commands at '{os.path.abspath(SOCKET_FILE)}'.")
+        )
+        MESSAGE_LOGGER.info('Rigel daemon stopped.')
+    except RigelError as err:
+        handle_rigel_error(err)
 
 
 @click.command()
@@ -514,10 +518,15 @@ def install(plugin: str, host: str, ssh: bool) -> None:
 # Add commands to CLI
 cli.add_command(init)
 cli.add_command(build)
+cli.add_command(context_size)
 cli.add_command(create)
+cli.add_command(daemon)
 cli.add_command(deploy)
 cli.add_command(install)
+cli.add_command(lock)
+cli.add_command(preflight)
 cli.add_command(run)
+cli.add_command(stats)
 
 
 def main() -> None:
@@ -0,0 +1,79 @@
+import json
+import os
+import socket
+import sys
+from typing import List, Optional, TextIO
+
+# NOTE: this module is imported by every invocation of Rigel and must only depend on the standard library.
+
+SOCKET_FILE = '.rigel_config/rigel.sock'
+
+# Commands that do not require an interactive terminal.
+FORWARDED_COMMANDS = ['build', 'context-size', 'create', 'lock', 'preflight', 'stats']
+
+# Options that keep a command running until interrupted, which would hold the Rigel daemon forever.
+UNFORWARDED_OPTIONS = ['--watch']
+
+
+def forward(
+    args: List[str],
+    path: str = SOCKET_FILE,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None
+) -> Optional[int]:
+    """
+    Forward a command to the Rigel daemon serving the current folder, if any.
+    The command is run with the environment variables and working directory of this process.
+
+    :type args: List[string]
+    :param args: The command arguments.
+    :type path: string
+    :param path: The path of the Unix socket of the Rigel daemon.
+    :type stdout: Optional[TextIO]
+    :param stdout: Where to write the standard output of the command. Defaults to sys.stdout.
+    :type stderr: Optional[TextIO]
+    :param stderr: Where to write the standard error of the command. Defaults to sys.stderr.
+
+    :rtype: Optional[int]
+    :return: The exit code of the command. None if the command was not forwarded.
+    """
+    if not args or args[0] not in FORWARDED_COMMANDS or not os.path.exists(path):
+        return None
+    if any(arg in UNFORWARDED_OPTIONS for arg in args):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None  # the Rigel daemon is no longer running
+
+    streams = {'stdout': stdout or sys.stdout, 'stderr': stderr or sys.stderr}
+    with connection, connection.makefile('rb') as responses:
+        request = {'args': args, 'env': dict(os.environ), 'cwd': os.getcwd()}
+        connection.sendall(json.dumps(request).encode() + b'\n')
+        for line in responses:
+            response = json.loads(line)
+            if 'exit' in response:
+                return int(response['exit'])
+            for stream, text in response.items():
+                streams[stream].write(text)
+                streams[stream].flush()
+
+    print('ERROR - Rigel daemon stopped before the command finished.', file=streams['stderr'])
+    return 1
+
+
+def main() -> None:
+    """
+    Rigel application entry point.
+    Commands are forwarded to the Rigel daemon if one is serving the current folder.
+    Otherwise they are run by this process.
+    """
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    from rigel.cli import main as run_locally
+    run_locally()
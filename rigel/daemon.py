@@ -0,0 +1,203 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from rigel.client import SOCKET_FILE, UNFORWARDED_OPTIONS
+from rigel.exceptions import DaemonAlreadyRunningError
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class StreamForwarder:
+    """
+    A file-like object that forwards written text to a client of the Rigel daemon.
+    """
+
+    def __init__(self, connection: socket.socket, stream: str) -> None:
+        """
+        :type connection: socket.socket
+        :param connection: The connection to the client.
+        :type stream: string
+        :param stream: The name of the stream ('stdout' or 'stderr').
+        """
+        self.connection = connection
+        self.stream = stream
+        self.closed_by_client = False
+
+    def write(self, text: str) -> int:
+        """
+        Forward text to the client. Text is discarded once the client disconnects.
+
+        :type text: string
+        :param text: The text to forward.
+
+        :rtype: int
+        :return: The number of written characters.
+        """
+        if text and not self.closed_by_client:
+            try:
+                self.connection.sendall(json.dumps({self.stream: text}).encode() + b'\n')
+            except OSError:
+                self.closed_by_client = True  # the command keeps running
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+@contextmanager
+def client_environment(environ: Optional[Dict[str, str]], cwd: Optional[str]) -> Iterator[None]:
+    """
+    Run a command with the environment variables and working directory of a client of the Rigel daemon.
+    Those of the Rigel daemon are restored afterwards.
+
+    :type environ: Optional[Dict[string, string]]
+    :param environ: The environment variables of the client. Those of the Rigel daemon are kept if not set.
+    :type cwd: Optional[string]
+    :param cwd: The working directory of the client. That of the Rigel daemon is kept if not set.
+    """
+    previous_environ, previous_cwd = dict(os.environ), os.getcwd()
+    try:
+        if environ is not None:
+            os.environ.clear()
+            os.environ.update(environ)
+        if cwd is not None:
+            os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        os.environ.clear()
+        os.environ.update(previous_environ)
+
+
+class RigelDaemon(socketserver.UnixStreamServer):
+    """
+    A server that runs Rigel commands on behalf of thin clients (see rigel.client).
+
+    Clients send a single JSON line {"args": [...], "env": {...}, "cwd": path} and receive JSON lines
+    {"stdout": text} or {"stderr": text} while the command runs, followed by {"exit": code}.
+    Commands are run one at a time inside the process of the daemon, with the environment variables and
+    working directory of the client, thus reusing the parsed Rigelfile, compiled templates and Docker client.
+    Commands that never finish (e.g. 'build --watch') are refused, as they would block all other clients.
+    """
+
+    def __init__(self, handler: Callable[[List[str]], int], path: str = SOCKET_FILE) -> None:
+        """
+        :type handler: Callable[[List[string]], int]
+        :param handler: Function that runs a command (given its arguments) and returns the exit code.
+        :type path: string
+        :param path: The path of the Unix socket.
+        """
+        self.handler = handler
+        self.path = os.path.abspath(path)
+        self.lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+                raise DaemonAlreadyRunningError(path=self.path)
+            except OSError:
+                os.remove(self.path)  # left behind by a daemon that did not exit gracefully
+            finally:
+                probe.close()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        super().__init__(self.path, RigelRequestHandler)
+        os.chmod(self.path, 0o600)  # only the owner may issue commands
+
+    def run_command(
+        self,
+        connection: socket.socket,
+        args: List[str],
+        environ: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None
+    ) -> int:
+        """
+        Run a command with its output forwarded to a client.
+
+        :type connection: socket.socket
+        :param connection: The connection to the client.
+        :type args: List[string]
+        :param args: The command arguments.
+        :type environ: Optional[Dict[string, string]]
+        :param environ: The environment variables of the client, if sent.
+        :type cwd: Optional[string]
+        :param cwd: The working directory of the client, if sent.
+
+        :rtype: int
+        :return: The exit code of the command.
+        """
+        # The output streams, environment variables and working directory of the process are shared by all commands.
+        with self.lock:
+            stdout, stderr = StreamForwarder(connection, 'stdout'), StreamForwarder(connection, 'stderr')
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                if any(arg in UNFORWARDED_OPTIONS for arg in args):
+                    print(f"ERROR - Options {', '.join(UNFORWARDED_OPTIONS)} cannot be used with the Rigel daemon.",
+                          file=sys.stderr)
+                    return 2
+                try:
+                    with client_environment(environ, cwd):
+                        return self.handler(args)
+                except Exception as exception:  # do not let a single command bring the daemon down
+                    print(f'Unexpected error: {exception!r}', file=sys.stderr)
+                    return 1
+
+    def server_close(self) -> None:
+        """
+        Stop listening and remove the Unix socket.
+        """
+        super().server_close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RigelRequestHandler(socketserver.StreamRequestHandler):
+    """
+    A handler of the requests of a single client of the Rigel daemon.
+    """
+
+    server: Any
+
+    def handle(self) -> None:
+        """
+        Run the requested command and report its exit code.
+        """
+        try:
+            request = json.loads(self.rfile.readline())
+            args = [str(arg) for arg in request['args']]
+            environ = {str(key): str(value) for key, value in request['env'].items()} if 'env' in request else None
+            cwd = str(request['cwd']) if 'cwd' in request else None
+        except (AttributeError, ValueError, KeyError, TypeError):
+            return  # not a Rigel client
+
+        code = self.server.run_command(self.connection, args, environ, cwd)
+        try:
+            self.connection.sendall(json.dumps({'exit': code}).encode() + b'\n')
+        except OSError:
+            pass  # the client disconnected
+
+
+def serve(handler: Callable[[List[str]], int], path: str = SOCKET_FILE, ready: Optional[Callable[[], None]] = None) -> None:
+    """
+    Serve Rigel commands until interrupted.
+
+    :type handler: Callable[[List[string]], int]
+    :param handler: Function that runs a command (given its arguments) and returns the exit code.
+    :type path: string
+    :param path: The path of the Unix socket.
+    :type ready: Optional[Callable[[], None]]
+    :param ready: Function called once the daemon accepts commands.
+    """
+    with RigelDaemon(handler, path) as daemon:
+        if ready:
+            ready()
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
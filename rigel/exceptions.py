@@ -138,3 +138,175 @@ class UnknownROSPackagesError(RigelError):
     """
     base = "The following packages were not declared in the Rigelfile: {packages}."
     code = 21
+
+
+class InvalidRosinstallFileError(RigelError):
+    """
+    Raised whenever a .rosinstall file cannot be parsed.
+
+    :type file: string
+    :ivar file: Path of the .rosinstall file.
+    :type cause: string
+    :ivar cause: Reason why the .rosinstall file is invalid.
+    """
+    base = "Invalid .rosinstall file '{file}': {cause}"
+    code = 22
+
+
+class RepositoryFetchError(RigelError):
+    """
+    Raised whenever an external repository cannot be fetched or checked out.
+
+    :type repository: string
+    :ivar repository: URL of the repository.
+    :type cause: string
+    :ivar cause: Reason why the operation failed.
+    """
+    base = "Unable to fetch repository '{repository}': {cause}"
+    code = 23
+
+
+class InvalidBuilderEndpointError(RigelError):
+    """
+    Raised whenever an invalid remote builder endpoint is declared.
+
+    :type endpoint: string
+    :ivar endpoint: The invalid builder endpoint declaration.
+    """
+    base = "Invalid builder endpoint '{endpoint}'. Use the format <PLATFORM>=<ENDPOINT>."
+    code = 24
+
+
+class UnknownDependencyError(RigelError):
+    """
+    Raised whenever a ROS package depends on a package not declared in the Rigelfile.
+
+    :type package: string
+    :ivar package: The ROS package declaring the dependency.
+    :type dependency: string
+    :ivar dependency: The undeclared ROS package.
+    """
+    base = "Package '{package}' depends on undeclared package '{dependency}'."
+    code = 25
+
+
+class CyclicDependencyError(RigelError):
+    """
+    Raised whenever the dependencies between ROS packages form a cycle.
+
+    :type cycle: string
+    :ivar cycle: The ROS packages that form the cycle.
+    """
+    base = "Cyclic dependency between packages: {cycle}."
+    code = 26
+
+
+class GitRevisionError(RigelError):
+    """
+    Raised whenever the files changed since a given git revision cannot be determined.
+
+    :type revision: string
+    :ivar revision: The git revision.
+    :type cause: string
+    :ivar cause: Reason why the operation failed.
+    """
+    base = "Unable to list files changed since git revision '{revision}': {cause}"
+    code = 27
+
+
+class InvalidShardError(RigelError):
+    """
+    Raised whenever an invalid shard declaration is provided.
+
+    :type shard: string
+    :ivar shard: The invalid shard declaration.
+    """
+    base = "Invalid shard '{shard}'. Shards must be declared as <INDEX>/<COUNT> with 1 <= INDEX <= COUNT."
+    code = 28
+
+
+class InvalidRigelfileFragmentError(RigelError):
+    """
+    Raised whenever a Rigelfile fragment included by the Rigelfile cannot be used.
+
+    :type fragment: string
+    :ivar fragment: The path of the Rigelfile fragment.
+    :type cause: string
+    :ivar cause: Reason why the Rigelfile fragment cannot be used.
+    """
+    base = "Invalid Rigelfile fragment '{fragment}': {cause}"
+    code = 29
+
+
+class DaemonAlreadyRunningError(RigelError):
+    """
+    Raised whenever a Rigel daemon is already serving commands at a given socket.
+
+    :type path: string
+    :ivar path: The path of the Unix socket.
+    """
+    base = "A Rigel daemon is already serving commands at '{path}'."
+    code = 30
+
+
+class InvalidMemorySizeError(RigelError):
+    """
+    Raised whenever an amount of memory cannot be parsed.
+
+    :type size: string
+    :ivar size: The amount of memory.
+    """
+    base = "Invalid memory size '{size}'. Use a number of bytes optionally followed by a unit (e.g. '512M' or '4G')."
+    code = 31
+
+
+class PreflightError(RigelError):
+    """
+    Raised whenever ROS packages are not ready to be built.
+
+    :type report: string
+    :ivar report: The problems found for each ROS package.
+    """
+    base = "Preflight checks failed:\n{report}"
+    code = 32
+
+
+class InvalidLockfileError(RigelError):
+    """
+    Raised whenever a Rigelfile.lock cannot be used.
+
+    :type path: string
+    :ivar path: The path of the Rigelfile.lock.
+    :type cause: string
+    :ivar cause: Reason why the Rigelfile.lock cannot be used.
+    """
+    base = "Invalid lockfile '{path}': {cause}. Run 'rigel lock --update' to create it again."
+    code = 33
+
+
+class UnsupportedRepositoryError(RigelError):
+    """
+    Raised whenever an external repository cannot be fetched by Rigel itself.
+
+    :type file: string
+    :ivar file: Path of the .rosinstall file.
+    :type repository: string
+    :ivar repository: The name of the repository.
+    :type vcs: string
+    :ivar vcs: The version control system of the repository.
+    """
+    base = "Repository '{repository}' of file '{file}' uses '{vcs}' but only git repositories can be fetched in advance."
+    code = 34
+
+
+class InvalidDurationsFileError(RigelError):
+    """
+    Raised whenever a Rigelfile.durations cannot be used.
+
+    :type path: string
+    :ivar path: The path of the Rigelfile.durations.
+    :type cause: string
+    :ivar cause: Reason why the Rigelfile.durations cannot be used.
+    """
+    base = "Invalid durations file '{path}': {cause}. Run 'rigel stats --export' to create it again."
+    code = 35
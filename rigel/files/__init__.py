@@ -1,4 +1,8 @@
+from .context import BuildContext  # noqa: F401
+from .composer import RigelfileComposer  # noqa: F401
 from .creator import RigelfileCreator  # noqa: F401
 from .decoder import YAMLDataDecoder  # noqa: F401
+from .durations import DURATIONS_FILE, load_durations, write_durations  # noqa: F401
 from .loader import YAMLDataLoader  # noqa: F401
+from .lock import LOCKFILE, load_lockfile, write_lockfile  # noqa: F401
 from .renderer import Renderer  # noqa: F401
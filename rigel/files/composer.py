@@ -0,0 +1,206 @@
+import glob
+import json
+import os
+import yaml
+from fnmatch import fnmatchcase
+from rigel.exceptions import InvalidRigelfileFragmentError
+from typing import Any, Dict, List, Optional, Set
+from .loader import YAMLDataLoader
+
+
+class RigelfileComposer:
+    """
+    A class to compose a Rigelfile with the Rigelfile fragments it includes.
+
+    A Rigelfile may list in field 'include' glob patterns (relative to the Rigelfile folder)
+    of YAML fragments declaring more ROS packages in their own 'packages' field.
+    Paths declared inside a fragment ('dir' and 'dockerfile') are relative to the fragment folder.
+    SSH key files stay relative to the package folder, as for packages declared inline.
+
+    Fragments are indexed by the name of the ROS packages they declare. The index is kept in a cache
+    and a fragment is only read again once it changes. This way only the fragments declaring the desired
+    ROS packages (and their dependencies) must be read, decoded and validated.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, filepath: str = './Rigelfile', index_path: Optional[str] = None) -> None:
+        """
+        :type filepath: string
+        :param filepath: The path of the Rigelfile.
+        :type index_path: Optional[string]
+        :param index_path: The path of the fragment index cache. Defaults to '.rigel_config/fragments.json'
+        inside the Rigelfile folder.
+        """
+        self.filepath = filepath
+        self.root = os.path.dirname(os.path.abspath(filepath))
+        self.index_path = index_path or os.path.join(self.root, '.rigel_config', 'fragments.json')
+
+    def fragments(self, patterns: List[str]) -> List[str]:
+        """
+        List the Rigelfile fragments matching the include patterns.
+
+        :type patterns: List[string]
+        :param patterns: The include patterns.
+
+        :rtype: List[string]
+        :return: The absolute paths of the Rigelfile fragments, in order of inclusion.
+        """
+        fragments: List[str] = []
+        for pattern in patterns:
+            for path in sorted(glob.glob(os.path.join(self.root, pattern), recursive=True)):
+                path = os.path.normpath(path)
+                if os.path.isfile(path) and path not in fragments:
+                    fragments.append(path)
+        return fragments
+
+    def __rebase(self, fragment: str, path: Any) -> Any:
+        """
+        Auxiliary function that turns a path relative to a fragment folder into a path relative to the Rigelfile folder.
+
+        :type fragment: string
+        :param fragment: The path of the Rigelfile fragment.
+        :type path: Any
+        :param path: The path to rebase.
+
+        :rtype: Any
+        :return: The rebased path.
+        """
+        if not isinstance(path, str) or os.path.isabs(path) or '{{' in path:
+            return path
+        return os.path.relpath(os.path.join(os.path.dirname(fragment), path), self.root)
+
+    def read_fragment(self, fragment: str) -> List[Dict[str, Any]]:
+        """
+        Read the ROS package declarations of a Rigelfile fragment.
+
+        :type fragment: string
+        :param fragment: The path of the Rigelfile fragment.
+
+        :rtype: List[Dict[str, Any]]
+        :return: The ROS package declarations, with paths relative to the Rigelfile folder.
+        """
+        try:
+            with open(fragment, 'r') as fragment_file:
+                data = yaml.safe_load(fragment_file)
+        except (OSError, yaml.YAMLError) as exception:
+            raise InvalidRigelfileFragmentError(fragment=fragment, cause=str(exception))
+
+        declarations = data.get('packages') if isinstance(data, dict) else None
+        if not isinstance(declarations, list):
+            raise InvalidRigelfileFragmentError(fragment=fragment, cause="missing list of packages in field 'packages'")
+
+        for declaration in declarations:
+            if not isinstance(declaration, dict) or not isinstance(declaration.get('package'), str):
+                raise InvalidRigelfileFragmentError(fragment=fragment, cause="every package requires field 'package'")
+            for field in ['dir', 'dockerfile']:
+                if field in declaration:
+                    declaration[field] = self.__rebase(fragment, declaration[field])
+        return declarations
+
+    def index(self, fragments: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Index the ROS packages declared by each Rigelfile fragment.
+        Only fragments changed since they were last indexed are read.
+
+        :type fragments: List[string]
+        :param fragments: The paths of the Rigelfile fragments.
+
+        :rtype: Dict[str, Dict[str, List[str]]]
+        :return: The dependencies of each ROS package declared by each Rigelfile fragment.
+        """
+        cache: Dict[str, Any] = {}
+        try:
+            with open(self.index_path, 'r') as index_file:
+                data = json.load(index_file)
+            if data.get('version') == self.INDEX_VERSION:
+                cache = data['fragments']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass  # rebuild the index
+
+        index: Dict[str, Dict[str, List[str]]] = {}
+        entries: Dict[str, Any] = {}
+        changed = set(cache) != set(fragments)
+        for fragment in fragments:
+            stat = os.stat(fragment)
+            entry = cache.get(fragment)
+            if not entry or entry.get('mtime') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+                entry = {
+                    'mtime': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'packages': {
+                        declaration['package']: list(declaration.get('depends_on') or [])
+                        for declaration in self.read_fragment(fragment)
+                    }
+                }
+                changed = True
+            entries[fragment] = entry
+            index[fragment] = entry['packages']
+
+        if changed:
+            try:
+                os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+                with open(self.index_path, 'w') as index_file:
+                    json.dump({'version': self.INDEX_VERSION, 'fragments': entries}, index_file)
+            except OSError:
+                pass  # the index is only a cache
+        return index
+
+    def load(self, patterns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Load the Rigelfile together with the ROS package declarations of the Rigelfile fragments it includes.
+        Package declarations are neither decoded nor validated.
+
+        :type patterns: Optional[List[string]]
+        :param patterns: Names or shell-style patterns of the desired ROS packages.
+        If set, only the fragment declarations of the desired ROS packages and of their dependencies are loaded.
+
+        :rtype: Dict[str, Any]
+        :return: The YAML data of the composed Rigelfile.
+        """
+        data: Dict[str, Any] = YAMLDataLoader(self.filepath).load()
+        includes = data.get('include') or []
+        if not includes:
+            return data
+
+        inline = list(data.get('packages') or [])
+        index = self.index(self.fragments(includes))
+
+        locations: Dict[str, str] = {}
+        dependencies: Dict[str, List[str]] = {}
+        for declaration in inline:
+            if isinstance(declaration, dict) and 'package' in declaration:
+                locations[str(declaration['package'])] = self.filepath
+                dependencies[str(declaration['package'])] = list(declaration.get('depends_on') or [])
+        for fragment, fragment_packages in index.items():
+            for name, package_dependencies in fragment_packages.items():
+                if name in locations:
+                    raise InvalidRigelfileFragmentError(
+                        fragment=fragment,
+                        cause=f"package '{name}' is also declared in '{locations[name]}'"
+                    )
+                locations[name] = fragment
+                dependencies[name] = package_dependencies
+
+        # Select the desired packages declared in fragments and all packages they depend upon.
+        required: Set[str] = set()
+        stack = [
+            name for name, location in locations.items()
+            if location == self.filepath or patterns is None or any(fnmatchcase(name, p) for p in patterns)
+        ]
+        while stack:
+            name = stack.pop()
+            if name not in required:
+                required.add(name)
+                stack.extend(dependency for dependency in dependencies.get(name, []) if dependency in locations)
+
+        packages = list(inline)
+        for fragment, fragment_packages in index.items():
+            if required.intersection(fragment_packages):
+                packages.extend(
+                    declaration for declaration in self.read_fragment(fragment)
+                    if declaration['package'] in required
+                )
+
+        data['packages'] = packages
+        return data
@@ -0,0 +1,149 @@
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+
+class BuildContext:
+    """
+    A class to inspect which files of a Docker build context are sent to the builder.
+
+    Exclusion patterns follow the .dockerignore semantics: patterns are matched against
+    paths relative to the context root, a pattern excluding a folder also excludes its content,
+    patterns starting with '!' re-include matching paths and the last matching pattern prevails.
+    """
+
+    def __init__(self, root: str, patterns: List[str]) -> None:
+        """
+        :type root: string
+        :param root: The root of the build context.
+        :type patterns: List[string]
+        :param patterns: The .dockerignore exclusion patterns.
+        """
+        self.root = root
+        self.patterns: List[Tuple[Pattern, bool]] = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            exception = pattern.startswith('!')
+            if exception:
+                pattern = pattern[1:].strip()
+            pattern = os.path.normpath(pattern).lstrip('/')
+            self.patterns.append((re.compile(self.__translate(pattern)), exception))
+
+    @classmethod
+    def from_dockerignore(cls, root: str, dockerignore: Optional[str] = None) -> 'BuildContext':
+        """
+        Create a build context whose exclusion patterns are read from a .dockerignore file.
+
+        :type root: string
+        :param root: The root of the build context.
+        :type dockerignore: Optional[string]
+        :param dockerignore: Path of the .dockerignore file. Defaults to the '.dockerignore' file at the context root.
+
+        :rtype: BuildContext
+        :return: The build context.
+        """
+        dockerignore = dockerignore or os.path.join(root, '.dockerignore')
+        patterns: List[str] = []
+        if os.path.isfile(dockerignore):
+            with open(dockerignore, 'r') as dockerignore_file:
+                patterns = dockerignore_file.read().splitlines()
+        return cls(root, patterns)
+
+    def __translate(self, pattern: str) -> str:
+        """
+        Auxiliary function that converts a .dockerignore pattern into a regular expression.
+
+        :type pattern: string
+        :param pattern: The .dockerignore pattern.
+
+        :rtype: string
+        :return: The equivalent regular expression.
+        """
+        regex = ''
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '*':
+                if pattern[i + 1:i + 2] == '*':
+                    i += 1
+                    if pattern[i + 1:i + 2] == '/':
+                        i += 1
+                    regex += '.*' if i + 1 >= len(pattern) else '(.*/)?'
+                else:
+                    regex += '[^/]*'
+            elif char == '?':
+                regex += '[^/]'
+            elif char == '[':
+                end = pattern.find(']', i + 1)
+                if end == -1:
+                    regex += re.escape(char)
+                else:
+                    regex += pattern[i:end + 1].replace('[!', '[^')
+                    i = end
+            elif char == '\\' and i + 1 < len(pattern):
+                i += 1
+                regex += re.escape(pattern[i])
+            else:
+                regex += re.escape(char)
+            i += 1
+        return f'^{regex}$'
+
+    def is_excluded(self, path: str) -> bool:
+        """
+        Verify if a given path is excluded from the build context.
+
+        :type path: string
+        :param path: A path relative to the context root.
+
+        :rtype: bool
+        :return: True if the path is not sent to the builder. False otherwise.
+        """
+        parts = path.split('/')
+        candidates = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+        excluded = False
+        for regex, exception in self.patterns:
+            if any(regex.match(candidate) for candidate in candidates):
+                excluded = not exception
+        return excluded
+
+    def files(self) -> Iterator[Tuple[str, int]]:
+        """
+        List all files sent to the builder.
+
+        :rtype: Iterator[Tuple[string, int]]
+        :return: The path (relative to the context root) and size in bytes of each file.
+        """
+        # Folders can only be skipped altogether if no exception could re-include part of their content.
+        prune = not any(exception for _, exception in self.patterns)
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            relative_dir = os.path.relpath(dirpath, self.root)
+            prefix = '' if relative_dir == '.' else f'{relative_dir}/'
+            if prune:
+                dirnames[:] = [d for d in dirnames if not self.is_excluded(f'{prefix}{d}')]
+            for filename in filenames:
+                path = f'{prefix}{filename}'
+                if not self.is_excluded(path):
+                    try:
+                        yield (path, os.lstat(os.path.join(dirpath, filename)).st_size)
+                    except OSError:
+                        continue
+
+    def size(self) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Compute the amount of data sent to the builder.
+
+        :rtype: Tuple[int, int, Dict[str, int]]
+        :return: The total number of bytes, the number of files and
+        the number of bytes per top-level entry of the build context.
+        """
+        total = 0
+        count = 0
+        entries: Dict[str, int] = {}
+        for path, size in self.files():
+            total += size
+            count += 1
+            entry = path.split('/', 1)[0]
+            entries[entry] = entries.get(entry, 0) + size
+        return (total, count, entries)
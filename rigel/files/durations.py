@@ -0,0 +1,59 @@
+import os
+import tempfile
+import yaml
+from rigel.exceptions import InvalidDurationsFileError
+from typing import Dict
+
+DURATIONS_FILE = 'Rigelfile.durations'
+
+HEADER = '# This file was generated by Rigel (see command "rigel stats --export"). Do not edit it manually.\n'
+
+
+def load_durations(path: str = DURATIONS_FILE) -> Dict[str, float]:
+    """
+    Load the expected build durations shared by all CI runners.
+
+    :type path: string
+    :param path: The path of the Rigelfile.durations.
+
+    :rtype: Dict[string, float]
+    :return: The expected build duration (seconds) of each ROS package. Empty if the file does not exist.
+    """
+    try:
+        with open(path) as durations_file:
+            data = yaml.safe_load(durations_file)
+    except FileNotFoundError:
+        return {}
+    except yaml.YAMLError as err:
+        raise InvalidDurationsFileError(path=path, cause=str(err))
+
+    if not data:
+        return {}
+    if not isinstance(data, dict):
+        raise InvalidDurationsFileError(path=path, cause='expected a mapping between packages and durations')
+    try:
+        return {str(package): float(duration) for package, duration in data.items()}
+    except (TypeError, ValueError) as err:
+        raise InvalidDurationsFileError(path=path, cause=str(err))
+
+
+def write_durations(durations: Dict[str, float], path: str = DURATIONS_FILE) -> None:
+    """
+    Atomically write the expected build durations to be shared by all CI runners.
+
+    :type durations: Dict[string, float]
+    :param durations: The expected build duration (seconds) of each ROS package.
+    :type path: string
+    :param path: The path of the Rigelfile.durations.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.Rigelfile.durations-')
+    try:
+        with os.fdopen(fd, 'w') as output_file:
+            output_file.write(HEADER)
+            yaml.safe_dump({package: round(durations[package], 1) for package in sorted(durations)}, output_file)
+        os.chmod(tmp_path, 0o644)  # meant to be committed alongside the Rigelfile
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
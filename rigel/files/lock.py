@@ -0,0 +1,56 @@
+import os
+import tempfile
+import yaml
+from pydantic import ValidationError
+from rigel.exceptions import InvalidLockfileError
+from rigel.models import Lockfile
+
+LOCKFILE = 'Rigelfile.lock'
+
+HEADER = '# This file was generated by Rigel (see command "rigel lock"). Do not edit it manually.\n'
+
+
+def load_lockfile(path: str = LOCKFILE) -> Lockfile:
+    """
+    Load a Rigelfile.lock.
+
+    :type path: string
+    :param path: The path of the Rigelfile.lock.
+
+    :rtype: rigel.models.Lockfile
+    :return: The pinned inputs of all ROS packages. Nothing is pinned if the file does not exist.
+    """
+    try:
+        with open(path) as lockfile:
+            data = yaml.safe_load(lockfile)
+    except FileNotFoundError:
+        return Lockfile()
+    except yaml.YAMLError as err:
+        raise InvalidLockfileError(path=path, cause=str(err))
+
+    try:
+        return Lockfile(**(data or {}))
+    except (TypeError, ValidationError) as err:
+        raise InvalidLockfileError(path=path, cause=str(err))
+
+
+def write_lockfile(lockfile: Lockfile, path: str = LOCKFILE) -> None:
+    """
+    Atomically write a Rigelfile.lock.
+
+    :type lockfile: rigel.models.Lockfile
+    :param lockfile: The pinned inputs of all ROS packages.
+    :type path: string
+    :param path: The path of the Rigelfile.lock.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.Rigelfile.lock-')
+    try:
+        with os.fdopen(fd, 'w') as output_file:
+            output_file.write(HEADER)
+            yaml.safe_dump(lockfile.dict(), output_file, sort_keys=False)
+        os.chmod(tmp_path, 0o644)  # meant to be committed alongside the Rigelfile
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
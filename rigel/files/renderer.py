@@ -1,6 +1,7 @@
 from jinja2 import Template
 from pkg_resources import resource_string
-from rigel.models import DockerSection
+from rigel.models import DockerSection, LockedPackage
+from typing import Any, Dict, Optional
 
 
 class Renderer:
@@ -8,12 +9,22 @@ class Renderer:
     A class that creates Dockerfiles.
     """
 
-    def __init__(self, configuration_file: DockerSection) -> None:
+    # Templates are compiled only once per process.
+    templates: Dict[str, Template] = {}
+
+    def __init__(self, configuration_file: DockerSection, lock: Optional[LockedPackage] = None, **kwargs: Any) -> None:
         """
         :type configuration_file: rigel.models.DockerSection
         :param configuration_file: An aggregator of information about the containerization of the ROS application.
+        :type lock: Optional[rigel.models.LockedPackage]
+        :param lock: The pinned base images and external repositories of the ROS package (see Rigelfile.lock), if any.
+        :type kwargs: Dict[str, Any]
+        :param kwargs: Additional variables to be made available to the templates.
         """
         self.configuration_file = configuration_file
+        self.kwargs = kwargs
+        if lock is not None:
+            self.kwargs['lock'] = lock.dict()
 
     def render(self, template: str, output: str) -> None:
         """
@@ -26,8 +37,11 @@ class Renderer:
         :param output: Name for the output rendered file.
         """
         # Open file template.
-        dockerfile_template = resource_string(__name__, f'assets/templates/{template}').decode('utf-8')
-        dockerfile_templater = Template(dockerfile_template)
+        dockerfile_templater = self.templates.get(template)
+        if dockerfile_templater is None:
+            dockerfile_template = resource_string(__name__, f'assets/templates/{template}').decode('utf-8')
+            dockerfile_templater = Template(dockerfile_template)
+            self.templates[template] = dockerfile_templater
 
         with open(output, 'w+') as output_file:
-            output_file.write(dockerfile_templater.render(configuration=self.configuration_file.dict()))
+            output_file.write(dockerfile_templater.render(configuration=self.configuration_file.dict(), **self.kwargs))
@@ -0,0 +1,226 @@
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Type and description of each metric exported by Rigel.
+METRICS: Dict[str, Tuple[str, str]] = {
+    'rigel_build_duration_seconds': ('gauge', 'Duration of the latest build of a ROS package per phase.'),
+    'rigel_builds_total': ('counter', 'Number of builds of a ROS package per outcome.'),
+    'rigel_build_cache_lookups_total': ('counter', 'Number of builds of a ROS package whose cache usage is known.'),
+    'rigel_build_cache_hits_total': ('counter', 'Number of builds of a ROS package fully restored from cache.'),
+    'rigel_build_cache_hit_ratio': ('gauge', 'Ratio of builds fully restored from cache across all ROS packages.'),
+    'rigel_build_context_bytes': ('gauge', 'Size of the build context of a ROS package.'),
+    'rigel_image_size_bytes': ('gauge', 'Size of the latest Docker image built for a ROS package.'),
+    'rigel_plugin_duration_seconds': ('gauge', 'Duration of the latest execution of an external plugin.'),
+    'rigel_plugin_runs_total': ('counter', 'Number of executions of an external plugin per outcome.'),
+    'rigel_simulation_requirement_satisfied': ('gauge', 'Whether a simulation requirement was satisfied (1) or not (0).'),
+    'rigel_simulation_verdict_seconds': ('gauge', 'Time from the start of a simulation until its verdict.')
+}
+
+# Content type of the Prometheus text exposition format.
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def escape(value: str) -> str:
+    """
+    Escape a label value according to the Prometheus text exposition format.
+
+    :type value: string
+    :param value: The label value.
+
+    :rtype: string
+    :return: The escaped label value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """
+    A class to collect metrics about builds, external plugins and simulations.
+
+    Metrics are rendered in the Prometheus text exposition format.
+    If a textfile is set it is rewritten atomically whenever a metric changes
+    (e.g. to be collected by the textfile collector of the Prometheus node exporter).
+    """
+
+    def __init__(self, textfile: Optional[str] = None) -> None:
+        """
+        :type textfile: Optional[string]
+        :param textfile: The path of the file where to keep the rendered metrics, if any.
+        """
+        self.textfile = textfile
+        self.samples: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {name: {} for name in METRICS}
+        self.__lock = threading.Lock()
+
+    def __update(self, name: str, value: float, labels: Dict[str, str], increment: bool) -> None:
+        """
+        Auxiliary function to update a single sample of a metric.
+        """
+        if name not in METRICS:
+            raise KeyError(name)
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            samples = self.samples[name]
+            samples[key] = samples.get(key, 0.0) + value if increment else value
+            text = self.render_samples() if self.textfile else None
+        if text is not None:
+            self.write_textfile(text)
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """
+        Set the value of a metric.
+
+        :type name: string
+        :param name: The name of the metric.
+        :type value: float
+        :param value: The new value.
+        :type labels: Dict[string, string]
+        :param labels: The labels of the sample.
+        """
+        self.__update(name, value, labels, False)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """
+        Increase the value of a metric.
+
+        :type name: string
+        :param name: The name of the metric.
+        :type value: float
+        :param value: The increment.
+        :type labels: Dict[string, string]
+        :param labels: The labels of the sample.
+        """
+        self.__update(name, value, labels, True)
+
+    def total(self, name: str) -> float:
+        """
+        Sum the values of all samples of a metric.
+
+        :type name: string
+        :param name: The name of the metric.
+
+        :rtype: float
+        :return: The sum.
+        """
+        with self.__lock:
+            return sum(self.samples[name].values())
+
+    def render_samples(self) -> str:
+        """
+        Auxiliary function to render all metrics. The lock must be held.
+        """
+        lines: List[str] = []
+        for name, (kind, description) in METRICS.items():
+            samples = self.samples[name]
+            if not samples:
+                continue
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, value in sorted(samples.items()):
+                labels = ','.join(f'{label}="{escape(label_value)}"' for label, label_value in key)
+                lines.append(f'{name}{{{labels}}} {value!r}' if labels else f'{name} {value!r}')
+        return ''.join(f'{line}\n' for line in lines)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        :rtype: string
+        :return: The rendered metrics.
+        """
+        with self.__lock:
+            return self.render_samples()
+
+    def write_textfile(self, text: Optional[str] = None) -> None:
+        """
+        Atomically write the rendered metrics to the textfile, so that collectors never read partial files.
+
+        :type text: Optional[string]
+        :param text: The rendered metrics. Rendered now if not provided.
+        """
+        if self.textfile is None:
+            return
+        if text is None:
+            text = self.render()
+        folder = os.path.dirname(os.path.abspath(self.textfile))
+        os.makedirs(folder, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=folder, prefix='.rigel-metrics-')
+        try:
+            with os.fdopen(fd, 'w') as output:
+                output.write(text)
+            os.chmod(path, 0o644)
+            os.replace(path, self.textfile)
+        except OSError:
+            os.remove(path)
+            raise
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """
+    A handler of requests for the metrics endpoint.
+    """
+
+    server: 'MetricsServer'
+
+    def do_GET(self) -> None:
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # scrapes are not worth reporting
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    A local HTTP server exposing the metrics of a registry at /metrics while Rigel runs.
+    Requests are served by a background thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1') -> None:
+        """
+        :type registry: MetricsRegistry
+        :param registry: The metrics to expose.
+        :type port: int
+        :param port: The port to listen on (0 picks a free port).
+        :type host: string
+        :param host: The address to listen on.
+        """
+        self.registry = registry
+        super().__init__((host, port), MetricsRequestHandler)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        """
+        Get the port the server listens on.
+
+        :rtype: int
+        :return: The port.
+        """
+        return int(self.server_address[1])
+
+    def start(self) -> None:
+        """
+        Start serving requests in the background.
+        """
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop serving requests and release the port.
+        """
+        if self.thread.is_alive():
+            self.shutdown()
+            self.thread.join()
+        self.server_close()
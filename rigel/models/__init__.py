@@ -1,9 +1,12 @@
 from .docker import (  # noqa: F401
     DockerfileSection,
     DockerSection,
+    PackageSection,
+    Resources,
     SSHKey,
     SUPPORTED_PLATFORMS
 )
+from .lock import LockedPackage, LockedRepository, Lockfile  # noqa: F401
 from .plugin import PluginSection  # noqa: F401
 from .rigelfile import Rigelfile  # noqa: F401
 from .simulation import SimulationSection  # noqa: F401
@@ -1,13 +1,20 @@
 import os
-from pydantic import BaseModel, validator
+import sys
+from pydantic import BaseModel, Field, validator
 from rigelcore.exceptions import (
     UndeclaredEnvironmentVariableError
 )
 from rigel.exceptions import (
+    InvalidMemorySizeError,
     UnsupportedCompilerError,
     UnsupportedPlatformError
 )
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+
+if sys.version_info >= (3, 9):
+    from typing import Annotated
+else:  # typing_extensions is required by pydantic itself
+    from typing_extensions import Annotated
 
 
 SUPPORTED_PLATFORMS: List[Tuple[str, str, str]] = [
@@ -71,6 +78,51 @@ class Registry(BaseModel):
     username: str
 
 
+# Multiplier of each supported memory unit (binary, as used by Docker).
+MEMORY_UNITS: Dict[str, int] = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+class Resources(BaseModel):
+    """
+    The expected resource usage of building a Docker image.
+    Used to decide how many images may be built concurrently.
+
+    :type cpus: Optional[float]
+    :cvar cpus: The expected number of CPUs kept busy. Default value is None (unknown).
+    :type memory: Optional[int]
+    :cvar memory: The expected peak memory usage in bytes (e.g. '4G' or '512M'). Default value is None (unknown).
+    """
+    cpus: Optional[float] = Field(default=None, gt=0)
+    memory: Optional[int] = None
+
+    @validator('memory', pre=True)
+    def parse_memory(cls, memory: Any) -> Optional[int]:
+        """
+        Convert amounts of memory with units (e.g. '4G' or '512Mi') to bytes.
+
+        :type memory: Any
+        :param memory: The amount of memory.
+
+        :rtype: Optional[int]
+        :return: The amount of memory in bytes.
+        """
+        if memory is None or isinstance(memory, int):
+            return memory
+        text = str(memory).strip().upper()
+        for suffix in ['IB', 'B', 'I']:  # accept 'G', 'GB', 'GiB' and 'Gi'
+            if text.endswith(suffix) and text[:-len(suffix)][-1:] in MEMORY_UNITS:
+                text = text[:-len(suffix)]
+                break
+        unit = text[-1:] if text[-1:] in MEMORY_UNITS else ''
+        try:
+            value = float(text[:len(text) - len(unit)])
+        except ValueError:
+            raise InvalidMemorySizeError(size=memory)
+        if value < 0:
+            raise InvalidMemorySizeError(size=memory)
+        return int(value * MEMORY_UNITS[unit])
+
+
 class DockerSection(BaseModel):
     """
     A placeholder for information regarding how to containerize a ROS application using Docker.
@@ -87,6 +139,8 @@ class DockerSection(BaseModel):
     :cvar apt: The name of dependencies to be installed using APT.
     :type compiler: string
     :cvar compiler: The tool with which to compile the containerized ROS workspace. Default value is 'catkin_make'.
+    :type depends_on: List[string]
+    :cvar depends_on: The names of the ROS packages whose images must be built before this one.
     :type dir: string
     :cvar dir: The folder containing the ROS package source code, if required.
     :type entrypoint: List[string]
@@ -94,10 +148,15 @@ class DockerSection(BaseModel):
     :type env: List[Dict[str, Any]]
     :cvar env: A list of environment variables to be set inside the Docker image.
     :type hostname: List[string]
+    :cvar hostname: A list of hostnames of public external repositories.
+    :type ignore: List[string]
+    :cvar ignore: A list of additional .dockerignore patterns for the build context.
     :type platforms: List[str]
     :cvar platforms: A list of architectures for which to build the Docker image.
     :type registry: Optional[rigel.files.Registry]
     :cvar registry: Information about the image registry for the Docker image. Default value is None.
+    :type resources: Optional[rigel.models.docker.Resources]
+    :cvar resources: The expected resource usage of building the Docker image. Default value is None.
     :type rosinstall: List[string]
     :cvar rosinstall: A list of all required .rosinstall files.
     :type ros_image: string
@@ -106,6 +165,8 @@ class DockerSection(BaseModel):
     :cvar run: A list of commands to be executed while building the Docker image.
     :type ssh: List[rigel.files.SSHKey]
     :cvar ssh: A list of all required private SSH keys.
+    :type type: string
+    :cvar type: The kind of package declaration. Always 'docker'.
     :type username: string
     :cvar username: The desired username. Defaults to 'user'.
     """
@@ -119,15 +180,19 @@ class DockerSection(BaseModel):
     ros_image: str
     apt: List[str] = []
     compiler: str = 'catkin_make'
+    depends_on: List[str] = []
     dir: str = ''
     entrypoint: List[str] = []
     env: List[Dict[str, Any]] = []
     hostname: List[str] = []
+    ignore: List[str] = []
     platforms: List[str] = []
     rosinstall: List[str] = []
     registry: Optional[Registry] = None
+    resources: Optional[Resources] = None
     run: List[str] = []
     ssh: List[SSHKey] = []
+    type: Literal['docker'] = 'docker'
     username: str = 'rigeluser'
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -169,6 +234,8 @@ class DockerfileSection(BaseModel):
     """
     A placeholder for information regarding building Docker images using an existing Dockerfile.
 
+    :type depends_on: List[str]
+    :cvar depends_on: The names of the ROS packages whose images must be built before this one.
     :type dockerfile: str
     :cvar dockerfile: The path to a Dockerfile.
     :type image: str
@@ -177,6 +244,10 @@ class DockerfileSection(BaseModel):
     :cvar package: The name of the package ROS to be containerized.
     :type registry: Optional[rigel.files.Registry]
     :cvar registry: Information about the image registry for the Docker image. Default value is None.
+    :type resources: Optional[rigel.models.docker.Resources]
+    :cvar resources: The expected resource usage of building the Docker image. Default value is None.
+    :type type: string
+    :cvar type: The kind of package declaration. Always 'dockerfile'.
     """
     # Required fields.
     dockerfile: str
@@ -184,4 +255,11 @@ class DockerfileSection(BaseModel):
     package: str
 
     # Optional fields.
+    depends_on: List[str] = []
     registry: Optional[Registry] = None
+    resources: Optional[Resources] = None
+    type: Literal['dockerfile'] = 'dockerfile'
+
+
+# Package declarations are routed to a single model according to their 'type' field.
+PackageSection = Annotated[Union[DockerSection, DockerfileSection], Field(discriminator='type')]
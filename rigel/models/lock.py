@@ -0,0 +1,44 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class LockedRepository(BaseModel):
+    """
+    An external repository listed inside a .rosinstall file, pinned to a commit.
+
+    :type name: string
+    :cvar name: The folder (relative to the workspace 'src' folder) where the repository is placed.
+    :type url: string
+    :cvar url: The URL of the repository.
+    :type version: string
+    :cvar version: The branch, tag or commit declared inside the .rosinstall file. Empty for the default branch.
+    :type commit: string
+    :cvar commit: The commit the declared version resolved to.
+    """
+    name: str
+    url: str
+    version: str = ''
+    commit: str
+
+
+class LockedPackage(BaseModel):
+    """
+    The pinned inputs of a ROS package.
+
+    :type images: Dict[string, string]
+    :cvar images: The pinned reference (e.g. 'ros:noetic@sha256:...') of each base image.
+    :type repositories: List[LockedRepository]
+    :cvar repositories: The pinned external repositories, in order of declaration.
+    """
+    images: Dict[str, str] = {}
+    repositories: List[LockedRepository] = []
+
+
+class Lockfile(BaseModel):
+    """
+    Placeholder for all the information contained within a Rigelfile.lock.
+
+    :type packages: Dict[string, LockedPackage]
+    :cvar packages: The pinned inputs of each ROS package.
+    """
+    packages: Dict[str, LockedPackage] = {}
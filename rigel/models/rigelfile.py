@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
+from rigel.exceptions import CyclicDependencyError, UnknownDependencyError
 from typing import Any, Dict, List, Optional, Union
-from .docker import DockerSection, DockerfileSection
+from .docker import DockerSection, DockerfileSection, PackageSection
 from .plugin import PluginSection
 from .simulation import SimulationSection
 
@@ -18,8 +19,12 @@ class Rigelfile(BaseModel):
     :type deploy: List[PluginSection]
     :cvar deploy: Section containing information regarding which external plugins to use when
     deploying Docker images of containerized ROS packages.
+    :type include: List[str]
+    :cvar include: Glob patterns of Rigelfile fragments declaring additional ROS packages.
     :type packages: List[Union[DockerSection, DockerfileSection]
     :cvar packages: Section containing information regarding how to containerize the ROS packages using Docker.
+    Each package declaration is validated against a single model, selected by its field 'type'
+    ('docker' or 'dockerfile'). If not set, 'type' is inferred from the presence of field 'dockerfile'.
     :type simulate: List[PluginSection]
     :cvar simulate: Section containing information regarding which external plugins to use when
     executing the containerized ROS application.
@@ -27,9 +32,70 @@ class Rigelfile(BaseModel):
     :cvar vars: Section containing the values of user-defined global variables.
     """
     # Required sections.
-    packages: List[Union[DockerSection, DockerfileSection]]  # at least one package declaration is required
+    packages: List[PackageSection]  # at least one package declaration is required
 
     # Optional sections.
     deploy: List[PluginSection] = []
+    include: List[str] = []
     simulate: Optional[SimulationSection] = None
     vars: Dict[str, Any] = {}
+
+    @validator('packages', pre=True)
+    def infer_package_types(cls, packages: Any) -> Any:
+        """
+        Set the type of package declarations that do not declare one.
+
+        :type packages: Any
+        :param packages: The raw ROS package declarations.
+        :rtype: Any
+        :return: The raw ROS package declarations, all with field 'type'.
+        """
+        if not isinstance(packages, list):
+            return packages
+        return [
+            {**declaration, 'type': 'dockerfile' if 'dockerfile' in declaration else 'docker'}
+            if isinstance(declaration, dict) and 'type' not in declaration else declaration
+            for declaration in packages
+        ]
+
+    @validator('packages')
+    def validate_dependencies(
+        cls,
+        packages: List[Union[DockerSection, DockerfileSection]]
+    ) -> List[Union[DockerSection, DockerfileSection]]:
+        """
+        Ensure that all package dependencies are declared and do not form a cycle.
+
+        :type packages: List[Union[DockerSection, DockerfileSection]]
+        :param packages: The declared ROS packages.
+        :rtype: List[Union[DockerSection, DockerfileSection]]
+        :return: The declared ROS packages.
+        """
+        dependencies = {package.package: package.depends_on for package in packages}
+        for package, package_dependencies in dependencies.items():
+            for name in package_dependencies:
+                if name not in dependencies:
+                    raise UnknownDependencyError(package=package, dependency=name)
+
+        # Iterative depth-first search keeping track of the packages in the current path.
+        state: Dict[str, bool] = {}  # package -> whether it is still in the current path
+        for root in dependencies:
+            if root in state:
+                continue
+            state[root] = True
+            path = [root]
+            stack = [iter(dependencies[root])]
+            while stack:
+                dependency: Optional[str] = next(stack[-1], None)
+                if dependency is None:
+                    state[path.pop()] = False
+                    stack.pop()
+                elif state.get(dependency):
+                    cycle = path[path.index(dependency):] + [dependency]
+                    raise CyclicDependencyError(cycle=' -> '.join(cycle))
+                elif dependency not in state:
+                    state[dependency] = True
+                    path.append(dependency)
+                    stack.append(iter(dependencies[dependency]))
+
+        return packages
@@ -0,0 +1,227 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+# Default output file of the profiler.
+PROFILE_FILE = 'rigel.prof'
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+T = TypeVar('T')
+
+
+def labelled(label: str, function: Callable[[], T]) -> Callable[[], T]:
+    """
+    Wrap a function so that its calls appear as a separate frame with a given name in profiles
+    (e.g. to tell apart the 'run' functions of different external plugins).
+
+    :type label: string
+    :param label: The name of the frame.
+    :type function: Callable[[], T]
+    :param function: The function to wrap.
+
+    :rtype: Callable[[], T]
+    :return: The wrapped function.
+    """
+    def call() -> T:
+        return function()
+
+    changes: Dict[str, Any] = {'co_name': label}
+    if hasattr(call.__code__, 'co_qualname'):  # Python 3.11+
+        changes['co_qualname'] = label
+    call.__code__ = call.__code__.replace(**changes)
+    return call
+
+
+class SamplingProfiler(threading.Thread):
+    """
+    A profiler that periodically samples the call stack of every thread.
+    Samples are written in the speedscope file format (one profile per thread), which
+    unlike cProfile statistics keeps the complete call stacks and time spent waiting.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """
+        :type interval: float
+        :param interval: Time between consecutive samples (seconds).
+        """
+        super().__init__(name='rigel-sampler', daemon=True)
+        self.interval = interval
+        self.frames: Dict[Tuple[str, int, str], int] = {}  # index of each (file, line, name)
+        self.samples: Dict[int, List[List[int]]] = {}
+        self.weights: Dict[int, List[float]] = {}
+        self.names: Dict[int, str] = {}
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+        self.__stop = threading.Event()
+
+    def stack(self, frame: Optional[FrameType]) -> List[int]:
+        """
+        Convert the call stack of a frame to frame indexes.
+
+        :type frame: Optional[types.FrameType]
+        :param frame: The innermost frame.
+
+        :rtype: List[int]
+        :return: The indexes of the frames, outermost first.
+        """
+        stack: List[int] = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_filename, code.co_firstlineno, code.co_name)
+            stack.append(self.frames.setdefault(key, len(self.frames)))
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def run(self) -> None:
+        self.started_at = last = time.perf_counter()
+        while not self.__stop.wait(self.interval):
+            now = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                self.names.setdefault(ident, names.get(ident, str(ident)))
+                self.samples.setdefault(ident, []).append(self.stack(frame))
+                self.weights.setdefault(ident, []).append(now - last)
+            last = now
+        self.stopped_at = time.perf_counter()
+
+    def stop(self) -> None:
+        """
+        Stop sampling.
+        """
+        self.__stop.set()
+        self.join()
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """
+        Convert all samples to the speedscope file format.
+
+        :type name: string
+        :param name: The name of the profile.
+
+        :rtype: Dict[string, Any]
+        :return: The speedscope document.
+        """
+        duration = self.stopped_at - self.started_at
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'rigel',
+            'activeProfileIndex': 0,
+            'shared': {
+                'frames': [
+                    {'name': function, 'file': file, 'line': line}
+                    for (file, line, function), _ in sorted(self.frames.items(), key=lambda item: item[1])
+                ]
+            },
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': self.names[ident],
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': duration,
+                    'samples': self.samples[ident],
+                    'weights': self.weights[ident]
+                }
+                for ident in self.samples  # in order of appearance, i.e. the main thread first
+            ]
+        }
+
+
+class CommandProfiler:
+    """
+    A class to profile a whole Rigel command.
+
+    All threads started while profiling (e.g. concurrent builds) are profiled by cProfile
+    and merged into a single pstats file. Optionally, call stacks are also sampled
+    and written as a speedscope-compatible JSON file.
+    """
+
+    def __init__(self, speedscope: bool = False, interval: float = 0.005) -> None:
+        """
+        :type speedscope: bool
+        :param speedscope: Also sample call stacks for a speedscope-compatible JSON file.
+        :type interval: float
+        :param interval: Time between consecutive samples (seconds).
+        """
+        self.profile = cProfile.Profile()
+        self.thread_profiles: List[cProfile.Profile] = []
+        self.sampler = SamplingProfiler(interval) if speedscope else None
+        self.__lock = threading.Lock()
+
+    def __profile_thread(self, frame: FrameType, event: str, arg: Any) -> None:
+        """
+        Auxiliary function that starts profiling a new thread.
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # only a single profiler may be active at once (Python 3.12+)
+            sys.setprofile(None)
+            return
+        with self.__lock:
+            self.thread_profiles.append(profile)
+
+    def start(self) -> None:
+        """
+        Start profiling.
+        """
+        if self.sampler is not None:
+            self.sampler.start()
+        threading.setprofile(self.__profile_thread)
+        self.profile.enable()
+
+    def stop(self) -> None:
+        """
+        Stop profiling.
+        """
+        self.profile.disable()
+        threading.setprofile(None)
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    def stats(self) -> pstats.Stats:
+        """
+        Merge the statistics of all profiled threads.
+
+        :rtype: pstats.Stats
+        :return: The statistics.
+        """
+        stats = pstats.Stats(self.profile)
+        with self.__lock:
+            for profile in self.thread_profiles:
+                profile.create_stats()
+                if profile.stats:
+                    stats.add(profile)
+        return stats
+
+    def write(self, path: str, name: str = 'rigel') -> List[str]:
+        """
+        Write the profile.
+
+        :type path: string
+        :param path: The path of the pstats file. The speedscope file, if any, is written next to it.
+        :type name: string
+        :param name: The name of the profile (e.g. the profiled command).
+
+        :rtype: List[string]
+        :return: The paths of the written files.
+        """
+        self.stats().dump_stats(path)
+        paths = [path]
+        if self.sampler is not None:
+            speedscope_path = f'{os.path.splitext(path)[0]}.speedscope.json'
+            with open(speedscope_path, 'w') as output:
+                json.dump(self.sampler.speedscope(name), output)
+            paths.append(speedscope_path)
+        return paths
@@ -0,0 +1,3 @@
+from .mirror import RepositoryMirror  # noqa: F401
+from .remote import list_refs, resolve_commit  # noqa: F401
+from .rosinstall import Repository, RosinstallParser  # noqa: F401
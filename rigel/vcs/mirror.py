@@ -0,0 +1,123 @@
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from rigel.exceptions import RepositoryFetchError
+from subprocess import CalledProcessError, run
+from typing import Iterable, List
+from .rosinstall import Repository
+
+
+class RepositoryMirror:
+    """
+    A class to keep a local cache of bare mirrors of external repositories.
+
+    Mirrors are fetched in parallel and only incrementally updated once they exist.
+    Working copies of the repositories are then checked out from the local mirrors,
+    without further network access.
+    """
+
+    def __init__(self, cache_dir: str, jobs: int = 4) -> None:
+        """
+        :type cache_dir: string
+        :param cache_dir: The folder where all bare mirrors are kept.
+        :type jobs: int
+        :param jobs: Maximum number of repositories to fetch or check out concurrently.
+        """
+        self.cache_dir = cache_dir
+        self.jobs = max(1, jobs)
+
+    def __git(self, url: str, *args: str) -> None:
+        """
+        Auxiliary function that runs a git command.
+
+        :type url: string
+        :param url: The URL of the repository concerned (used for error reporting).
+        :type args: string
+        :param args: The git command arguments.
+        """
+        try:
+            run(['git', *args], check=True, capture_output=True, text=True)
+        except CalledProcessError as err:
+            raise RepositoryFetchError(repository=url, cause=(err.stderr or '').strip() or f'exit code {err.returncode}')
+
+    def mirror_path(self, url: str) -> str:
+        """
+        Compute the location of the bare mirror of a given repository.
+
+        :type url: string
+        :param url: The URL of the repository.
+
+        :rtype: string
+        :return: The path of the bare mirror.
+        """
+        name = os.path.basename(url.rstrip('/'))
+        if name.endswith('.git'):
+            name = name[:-4]
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f'{name}-{digest}.git')
+
+    def update(self, url: str) -> None:
+        """
+        Create or update the bare mirror of a given repository.
+
+        :type url: string
+        :param url: The URL of the repository.
+        """
+        path = self.mirror_path(url)
+        if os.path.isdir(path):
+            self.__git(url, '--git-dir', path, 'remote', 'update', '--prune')
+        else:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.__git(url, 'clone', '--quiet', '--mirror', url, path)
+
+    def fetch(self, urls: Iterable[str]) -> None:
+        """
+        Create or update the bare mirrors of several repositories concurrently.
+        Each repository is fetched only once, even if listed multiple times.
+
+        :type urls: Iterable[string]
+        :param urls: The URLs of the repositories.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for _ in executor.map(self.update, unique_urls):
+                pass  # propagate errors
+
+    def checkout(self, repository: Repository, destination: str) -> None:
+        """
+        Create a working copy of a repository using its local bare mirror.
+
+        :type repository: Repository
+        :param repository: The repository to check out.
+        :type destination: string
+        :param destination: The folder where to place the working copy.
+        """
+        if os.path.exists(destination):
+            shutil.rmtree(destination)
+        self.__git(repository.url, 'clone', '--quiet', self.mirror_path(repository.url), destination)
+        if repository.version:
+            self.__git(repository.url, '-C', destination, 'checkout', '--quiet', repository.version)
+
+    def stage(self, repositories: List[Repository], destination: str) -> None:
+        """
+        Place working copies of several repositories inside a given folder.
+        Any content previously inside that folder is removed.
+        The bare mirrors of all repositories must have been fetched beforehand.
+
+        :type repositories: List[Repository]
+        :param repositories: The repositories to check out.
+        :type destination: string
+        :param destination: The folder where to place all working copies.
+        """
+        if os.path.exists(destination):
+            shutil.rmtree(destination)
+        os.makedirs(destination)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [
+                executor.submit(self.checkout, repository, os.path.join(destination, repository.name))
+                for repository in repositories
+            ]
+            for future in futures:
+                future.result()  # propagate errors
@@ -0,0 +1,54 @@
+import re
+from rigel.exceptions import RepositoryFetchError
+from subprocess import CalledProcessError, run
+from typing import Dict
+
+COMMIT_HASH = re.compile(r'[0-9a-f]{40}')
+
+
+def list_refs(url: str) -> Dict[str, str]:
+    """
+    List the references of a remote repository.
+
+    :type url: string
+    :param url: The URL of the repository.
+
+    :rtype: Dict[string, string]
+    :return: The commit each reference (e.g. 'HEAD', 'refs/heads/main' or 'refs/tags/v1^{}') points to.
+    """
+    try:
+        result = run(['git', 'ls-remote', url], check=True, capture_output=True, text=True)
+    except CalledProcessError as err:
+        raise RepositoryFetchError(repository=url, cause=(err.stderr or '').strip() or f'exit code {err.returncode}')
+
+    refs = {}
+    for line in result.stdout.splitlines():
+        commit, _, ref = line.partition('\t')
+        refs[ref] = commit
+    return refs
+
+
+def resolve_commit(url: str, version: str = '') -> str:
+    """
+    Resolve a version of a remote repository to a commit, without cloning it.
+
+    :type url: string
+    :param url: The URL of the repository.
+    :type version: string
+    :param version: A branch, tag, full reference or full commit hash. The default branch if empty.
+
+    :rtype: string
+    :return: The commit hash.
+    """
+    if COMMIT_HASH.fullmatch(version):
+        return version
+
+    refs = list_refs(url)
+    candidates = [f'refs/tags/{version}^{{}}', f'refs/tags/{version}', f'refs/heads/{version}', version] if version else ['HEAD']
+    for ref in candidates:
+        if ref in refs:
+            return refs[ref]
+    raise RepositoryFetchError(
+        repository=url,
+        cause=f"version '{version}' is neither a branch, a tag nor a full commit hash"
+    )
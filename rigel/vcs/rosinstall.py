@@ -0,0 +1,145 @@
+import yaml
+from pydantic import BaseModel
+from rigel.exceptions import InvalidRosinstallFileError, UnsupportedRepositoryError
+from typing import Any, Dict, List
+
+
+class Repository(BaseModel):
+    """
+    Information about an external repository listed inside a .rosinstall file.
+
+    :type name: string
+    :cvar name: The folder (relative to the workspace 'src' folder) where the repository is placed.
+    :type url: string
+    :cvar url: The URL of the repository.
+    :type version: string
+    :cvar version: The branch, tag or commit to check out. Empty for the default branch.
+    """
+    name: str
+    url: str
+    version: str = ''
+
+
+class RosinstallParser:
+    """
+    A class to extract the list of external repositories declared inside .rosinstall files.
+
+    Both the classic rosinstall format (a list of '- git: {local-name, uri, version}' entries)
+    and the vcstool format (a 'repositories' mapping of '{type, url, version}' entries) are supported.
+    Only git repositories are considered.
+    """
+
+    def __init__(self, strict: bool = False) -> None:
+        """
+        :type strict: bool
+        :param strict: Reject repositories that are not git repositories instead of leaving them out.
+        Required whenever repositories are fetched by Rigel itself, as those would otherwise be missing from the image.
+        """
+        self.strict = strict
+
+    def __supported(self, filepath: str, name: str, vcs_type: Any) -> bool:
+        """
+        Auxiliary function that decides whether a repository is considered.
+
+        :type filepath: string
+        :param filepath: Path of the .rosinstall file (used for error reporting).
+        :type name: string
+        :param name: The name of the repository (used for error reporting).
+        :type vcs_type: Any
+        :param vcs_type: The version control system of the repository.
+
+        :rtype: bool
+        :return: True if the repository is a git repository, False if it is to be left out.
+        """
+        if vcs_type == 'git':
+            return True
+        if self.strict:
+            raise UnsupportedRepositoryError(file=filepath, repository=name, vcs=vcs_type)
+        return False
+
+    def __parse_rosinstall(self, filepath: str, data: List[Any]) -> List[Repository]:
+        """
+        Auxiliary function that parses data in the classic rosinstall format.
+
+        :type filepath: string
+        :param filepath: Path of the .rosinstall file (used for error reporting).
+        :type data: List[Any]
+        :param data: The YAML data.
+
+        :rtype: List[Repository]
+        :return: The declared git repositories.
+        """
+        repositories = []
+        for entry in data:
+            if not isinstance(entry, dict) or len(entry) != 1:
+                raise InvalidRosinstallFileError(file=filepath, cause=f'unexpected entry {entry}')
+            vcs_type, info = next(iter(entry.items()))
+            if not isinstance(info, dict):
+                raise InvalidRosinstallFileError(file=filepath, cause=f"'{vcs_type}' entries must be mappings, got {info}")
+            if not self.__supported(filepath, str(info.get('local-name') or info.get('uri')), vcs_type):
+                continue
+            if not info.get('uri') or not info.get('local-name'):
+                raise InvalidRosinstallFileError(file=filepath, cause="git entries require fields 'local-name' and 'uri'")
+            repositories.append(Repository(
+                name=info['local-name'],
+                url=info['uri'],
+                version=str(info.get('version') or '')
+            ))
+        return repositories
+
+    def __parse_repos(self, filepath: str, data: Dict[str, Any]) -> List[Repository]:
+        """
+        Auxiliary function that parses data in the vcstool format.
+
+        :type filepath: string
+        :param filepath: Path of the .rosinstall file (used for error reporting).
+        :type data: Dict[str, Any]
+        :param data: The YAML data.
+
+        :rtype: List[Repository]
+        :return: The declared git repositories.
+        """
+        declarations = data.get('repositories') or {}
+        if not isinstance(declarations, dict):
+            raise InvalidRosinstallFileError(file=filepath, cause="field 'repositories' must be a mapping")
+
+        repositories = []
+        for name, info in declarations.items():
+            if not isinstance(info, dict):
+                raise InvalidRosinstallFileError(file=filepath, cause=f"unexpected entry for repository '{name}'")
+            if not self.__supported(filepath, name, info.get('type', 'git')):
+                continue
+            if not info.get('url'):
+                raise InvalidRosinstallFileError(file=filepath, cause=f"repository '{name}' has no field 'url'")
+            repositories.append(Repository(
+                name=name,
+                url=info['url'],
+                version=str(info.get('version') or '')
+            ))
+        return repositories
+
+    def parse(self, filepath: str) -> List[Repository]:
+        """
+        Parse a .rosinstall file.
+
+        :type filepath: string
+        :param filepath: Path of the .rosinstall file.
+
+        :rtype: List[Repository]
+        :return: The declared git repositories.
+        """
+        try:
+            with open(filepath, 'r') as rosinstall_file:
+                data = yaml.safe_load(rosinstall_file)
+        except FileNotFoundError:
+            raise InvalidRosinstallFileError(file=filepath, cause='file not found')
+        except yaml.YAMLError as err:
+            raise InvalidRosinstallFileError(file=filepath, cause=str(err))
+
+        if not data:
+            return []
+        if isinstance(data, list):
+            return self.__parse_rosinstall(filepath, data)
+        if isinstance(data, dict):
+            return self.__parse_repos(filepath, data)
+        raise InvalidRosinstallFileError(file=filepath, cause='unsupported format')
@@ -0,0 +1,571 @@
+import asyncio
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from rigel.api import AsyncProject, Project, RebuildRound
+from rigel.builds import BuildLog, DockerSession
+from rigel.exceptions import PreflightError, UnknownROSPackagesError
+from rigel.metrics import MetricsRegistry
+from rigelcore.exceptions import DockerAPIError
+from rigelcore.simulations.requirements import SimulationRequirementNode
+from subprocess import check_call, check_output
+from typing import Any, List
+from unittest.mock import MagicMock, Mock, patch
+
+RIGELFILE = """
+packages:
+  - package: base
+    image: base
+    dockerfile: docker
+  - package: app
+    image: app
+    distro: noetic
+    command: roslaunch app app.launch
+    depends_on: [base]
+deploy:
+  - name: test/plugin
+"""
+
+
+class ProjectTesting(unittest.TestCase):
+    """
+    Test suite for rigel.api.Project class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.realpath(self.tmp.name)
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            rigelfile.write(RIGELFILE)
+        os.makedirs(os.path.join(self.root, 'docker'))
+        with open(os.path.join(self.root, 'docker', 'Dockerfile'), 'w') as dockerfile:
+            dockerfile.write('FROM ubuntu\n')
+
+        self.client = MagicMock()
+        self.client.get_image.return_value = None
+        patcher = patch('rigel.api.stream_build')
+        self.build = patcher.start()
+        self.addCleanup(patcher.stop)
+        pull_patcher = patch('rigel.api.pull_base_image')
+        self.pull = pull_patcher.start()
+        self.addCleanup(pull_patcher.stop)
+        self.project = Project(self.root, Mock(), DockerSession(self.client))
+
+    def test_parse_once(self) -> None:
+        """
+        Test if the complete Rigelfile is parsed only once.
+        """
+        rigelfile = self.project.parse()
+        self.assertIs(self.project.parse(['app']), rigelfile)
+        self.project.reload()
+        self.assertIsNot(self.project.parse(), rigelfile)
+
+    def test_parse_changed_rigelfile(self) -> None:
+        """
+        Test if the Rigelfile is parsed again once it changes.
+        """
+        rigelfile = self.project.parse()
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile_file:
+            rigelfile_file.write(RIGELFILE.replace('image: app', 'image: app:latest'))
+        self.assertEqual(self.project.parse().packages[1].image, 'app:latest')
+        self.assertIsNot(self.project.parse(), rigelfile)
+
+    def test_parse_changed_environment(self) -> None:
+        """
+        Test if the Rigelfile is parsed again once the environment variables change.
+        """
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile_file:
+            rigelfile_file.write(RIGELFILE.replace('image: app', 'image: app:{{ RIGEL_TEST_TAG }}'))
+        with patch.dict(os.environ, {'RIGEL_TEST_TAG': 'first'}):
+            self.assertEqual(self.project.parse().packages[1].image, 'app:first')
+        with patch.dict(os.environ, {'RIGEL_TEST_TAG': 'second'}):
+            self.assertEqual(self.project.parse().packages[1].image, 'app:second')
+
+    def test_create(self) -> None:
+        """
+        Test if build files are created inside the project folder regardless of the working directory.
+        """
+        cwd = os.getcwd()
+        results = self.project.create()
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertEqual([r.package for r in results], ['app'])
+        self.assertIn(os.path.join(self.root, '.rigel_config', 'app', 'Dockerfile'), results[0].files)
+        self.assertTrue(all(os.path.isfile(file) for file in results[0].files))
+
+    def test_build_context_project_root(self) -> None:
+        """
+        Test if Rigel state is left out of the build context of a ROS package whose folder is the project root.
+        """
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            ssh = 'ssh: [{hostname: github.com, value: id_rsa, file: true}]'
+            rigelfile.write(RIGELFILE.replace('depends_on: [base]', f'dir: .\n    {ssh}'))
+        with open(os.path.join(self.root, 'id_rsa'), 'w') as key:
+            key.write('key')
+        self.project.create()
+        self.project.timings.record('app', [], 1.0)
+        self.project.journal.record('app', 'digest', 'app')
+        os.makedirs(os.path.join(self.root, '.rigel_config', 'logs'))
+        os.makedirs(os.path.join(self.root, '.rigel_config', 'rosinstall', 'lib'))
+        for path in ['logs/app.log', 'rosinstall/lib/CMakeLists.txt']:
+            with open(os.path.join(self.root, '.rigel_config', path), 'w') as f:
+                f.write(path)
+
+        files = {path for path, _ in self.project.build_context(self.project.parse().packages[1]).files()}
+        self.assertEqual({path for path in files if path.startswith('.rigel_config')}, {
+            '.rigel_config/config', '.rigel_config/entrypoint.sh', '.rigel_config/rosinstall/lib/CMakeLists.txt'
+        })
+        self.assertIn('id_rsa', files)
+
+    def commit(self, origin: str, filename: str) -> str:
+        with open(os.path.join(origin, filename), 'w') as f:
+            f.write(filename)
+        check_call(['git', '-C', origin, 'add', filename])
+        check_call(['git', '-c', 'user.name=rigel', '-c', 'user.email=rigel@test', '-C', origin, 'commit', '-q', '-m', filename])
+        return check_output(['git', '-C', origin, 'rev-parse', 'HEAD'], text=True).strip()
+
+    @patch('rigel.api.resolve_image_digest', return_value='sha256:old')
+    def test_lock(self, resolve_image_digest: Mock) -> None:
+        """
+        Test if base images and external repositories are pinned and used when creating build files until updated.
+        """
+        origin = os.path.join(self.root, 'origin')
+        check_call(['git', 'init', '--quiet', '-b', 'main', origin])
+        pinned = self.commit(origin, 'README')
+        os.makedirs(os.path.join(self.root, 'src'))
+        with open(os.path.join(self.root, 'src', 'deps.rosinstall'), 'w') as rosinstall:
+            rosinstall.write(f'- git: {{local-name: lib, uri: "file://{origin}", version: main}}\n')
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            rigelfile.write(RIGELFILE.replace('depends_on: [base]', 'dir: src\n    rosinstall: [deps.rosinstall]'))
+        self.project.lock()
+
+        latest = self.commit(origin, 'CHANGELOG')
+        resolve_image_digest.return_value = 'sha256:new'
+        lockfile = self.project.lock()  # pinned inputs are kept
+        self.assertEqual(list(lockfile.packages), ['app'])  # only generated Dockerfiles are pinned
+        self.assertEqual(lockfile.packages['app'].images, {'ros:noetic': 'ros:noetic@sha256:old'})
+        self.assertEqual(lockfile.packages['app'].repositories[0].commit, pinned)
+        self.assertEqual(resolve_image_digest.call_count, 1)
+
+        self.project.create()
+        with open(os.path.join(self.root, 'src', '.rigel_config', 'Dockerfile')) as dockerfile:
+            content = dockerfile.read()
+        self.assertIn('FROM ros:noetic@sha256:old as intermediate', content)
+        self.assertIn(f'git -C src/lib checkout --quiet {pinned}', content)
+
+        self.project.build(['app'], preflight=False)
+        self.assertIn('ros:noetic@sha256:old', [c.args[1] for c in self.pull.call_args_list])
+
+        lockfile = self.project.lock(update=True)
+        self.assertEqual(lockfile.packages['app'].images, {'ros:noetic': 'ros:noetic@sha256:new'})
+        self.assertEqual(lockfile.packages['app'].repositories[0].commit, latest)
+
+    def test_select_shards_across_runners(self) -> None:
+        """
+        Test if runners with a different build history select disjoint shards that cover all packages,
+        and if shards are balanced by duration once durations are shared.
+        """
+        rigelfile = 'packages:\n' + ''.join(
+            f'  - {{package: pkg_{i}, image: pkg_{i}, dockerfile: docker}}\n' for i in range(8)
+        )
+        runners = []
+        for index in range(2):
+            root = os.path.join(self.root, f'runner_{index}')
+            os.makedirs(root)
+            with open(os.path.join(root, 'Rigelfile'), 'w') as rigelfile_file:
+                rigelfile_file.write(rigelfile)
+            runner = Project(root, Mock(), DockerSession(self.client))
+            for i in range(8 if index else 3):  # different local histories
+                runner.timings.record(f'pkg_{i}', [], float(i * (index + 1) + 1))
+            runners.append(runner)
+
+        def shards() -> List[List[str]]:
+            return [
+                [p.package for p in runner.select(runner.parse().packages, f'{index + 1}/2')]
+                for index, runner in enumerate(runners)
+            ]
+
+        selected = shards()
+        self.assertFalse(set(selected[0]) & set(selected[1]))
+        self.assertEqual(sorted(selected[0] + selected[1]), [f'pkg_{i}' for i in range(8)])
+
+        durations = runners[1].export_durations()  # shared with the other runner (e.g. committed)
+        with open(os.path.join(runners[1].root, 'Rigelfile.durations')) as source:
+            with open(os.path.join(runners[0].root, 'Rigelfile.durations'), 'w') as target:
+                target.write(source.read())
+        selected = shards()
+        self.assertEqual(sorted(selected[0] + selected[1]), [f'pkg_{i}' for i in range(8)])
+        self.assertEqual(sum(durations[name] for name in selected[0]), sum(durations[name] for name in selected[1]))
+
+    def test_build(self) -> None:
+        """
+        Test if build results are returned in order of declaration and recorded.
+        """
+        results = self.project.build(jobs=2)
+        self.assertEqual([(r.package, r.image) for r in results], [('base', 'base'), ('app', 'app')])
+        self.assertEqual(self.build.call_count, 2)
+        self.assertEqual(set(self.project.timings.expected_durations()), {'base', 'app'})
+
+    @patch('rigel.builds.platforms.stream_build')
+    def test_build_split_platforms(self, stream_mock: Mock) -> None:
+        """
+        Test if the duration of each platform is recorded when platforms are built separately
+        and progress is reported through the logger of the project.
+        """
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            rigelfile.write(RIGELFILE.replace('depends_on: [base]', 'platforms: [linux/amd64, linux/arm64]'))
+        self.project.logger = logger = Mock()
+        self.project.build(['app'], split_platforms=True, preflight=False, pull=False)
+        messages = [c.args[0] for c in logger.info.call_args_list]
+        self.assertIn("Docker image 'app:latest-arm64' (linux/arm64) built with success.", messages)
+        self.assertEqual(
+            sorted(call.args[2].path for call in stream_mock.call_args_list),
+            [os.path.join(self.root, '.rigel_config', 'logs', f'app-{arch}.log') for arch in ['amd64', 'arm64']]
+        )
+        self.assertEqual(
+            set(self.project.timings.expected_platform_durations()),
+            {('app', 'linux/amd64'), ('app', 'linux/arm64')}
+        )
+
+    def test_build_errors(self) -> None:
+        """
+        Test if errors are raised instead of terminating the process.
+        """
+        with self.assertRaises(UnknownROSPackagesError):
+            self.project.build(['unknown'])
+
+        self.build.side_effect = DockerAPIError(exception='test')
+        with self.assertRaises(DockerAPIError):
+            self.project.build()
+        self.client.remove_builder.assert_called_with('rigel-builder')
+
+    def test_build_preflight(self) -> None:
+        """
+        Test if no package is built unless all packages are ready to be built.
+        """
+        os.remove(os.path.join(self.root, 'docker', 'Dockerfile'))
+        with self.assertRaises(PreflightError):
+            self.project.build()
+        self.build.assert_not_called()
+
+        self.assertEqual([f.package for f in self.project.preflight()], ['base'])
+        self.project.build(['app'], preflight=False)
+        self.assertEqual(self.build.call_count, 1)
+
+    def test_build_pull(self) -> None:
+        """
+        Test if distinct base images are pulled before building and failed pulls are left to the builds.
+        """
+        self.pull.side_effect = lambda docker, image, platforms, log, *args: self.assertEqual(self.build.call_count, 0)
+        self.project.build()
+        self.assertEqual(sorted(c.args[1] for c in self.pull.call_args_list), ['ros:noetic', 'ubuntu'])
+        self.assertEqual({c.args[4] for c in self.pull.call_args_list}, {'rigel-builder'})
+
+        self.pull.reset_mock()
+        self.pull.side_effect = DockerAPIError(exception='test')
+        self.project.logger = logger = Mock()
+        self.project.build(['base'])
+        self.assertEqual([c.args[1] for c in self.pull.call_args_list], ['ubuntu'])
+        logger.warning.assert_called()
+
+        self.pull.reset_mock()
+        self.project.build(pull=False)
+        self.pull.assert_not_called()
+
+    def test_build_log_tail(self) -> None:
+        """
+        Test if the latest lines of the build log are shown once a build fails.
+        """
+        def build(docker: Any, path: str, log: BuildLog, **kwargs: Any) -> None:
+            for index in range(100):
+                log.write(f'line {index}\n')
+            raise DockerAPIError(exception='test')
+
+        self.build.side_effect = build
+        self.project.echo_builds = False
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), self.assertRaises(DockerAPIError):
+            self.project.build(['base'])
+
+        self.assertIn('line 99', stdout.getvalue())
+        self.assertNotIn('line 0\n', stdout.getvalue())
+        with open(os.path.join(self.root, '.rigel_config', 'logs', 'base.log')) as log_file:
+            self.assertEqual(len(log_file.readlines()), 100)
+
+    def test_build_metrics(self) -> None:
+        """
+        Test if build durations, cache usage, context and image sizes are recorded as metrics.
+        """
+        self.project.metrics = MetricsRegistry()
+        image = Mock(id='sha256:1', size=1024)
+        self.client.get_image.return_value = image
+        self.project.build(load=True)
+
+        samples = self.project.metrics.samples
+        self.assertEqual(
+            set(samples['rigel_build_duration_seconds']),
+            {(('package', name), ('phase', phase)) for name in ['base', 'app'] for phase in ['build', 'total']}
+        )
+        self.assertEqual(samples['rigel_builds_total'][(('package', 'app'), ('status', 'success'))], 1.0)
+        self.assertEqual(samples['rigel_build_cache_hit_ratio'][()], 1.0)  # unchanged images
+        self.assertEqual(samples['rigel_image_size_bytes'][(('image', 'app'), ('package', 'app'))], 1024)
+        self.assertIn((('package', 'base'),), samples['rigel_build_context_bytes'])
+
+    def test_build_resume(self) -> None:
+        """
+        Test if resumed builds skip the packages built by the previous run whose inputs did not change.
+        """
+        self.build.side_effect = [None, DockerAPIError(exception='test')]
+        with self.assertRaises(DockerAPIError):
+            self.project.build(jobs=1)
+
+        self.build.reset_mock(side_effect=True)
+        results = self.project.build(jobs=1, resume=True)
+        self.assertEqual([(r.package, r.resumed) for r in results], [('base', True), ('app', False)])
+        self.assertEqual(self.build.call_count, 1)
+
+        self.build.reset_mock()
+        with open(os.path.join(self.root, 'docker', 'Dockerfile'), 'w') as dockerfile:
+            dockerfile.write('FROM debian\n')
+        results = self.project.build(jobs=1, resume=True)
+        self.assertFalse(any(r.resumed for r in results))  # dependents are rebuilt as well
+        self.assertEqual(self.build.call_count, 2)
+
+        self.build.reset_mock()
+        self.project.build(jobs=1)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_input_digests_project_root(self) -> None:
+        """
+        Test if the input digest of a ROS package whose folder is the project root ignores the state kept by Rigel.
+        """
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            content = RIGELFILE.replace('depends_on: [base]', 'dir: .')
+            rigelfile.write(content.replace('dockerfile: docker', 'distro: noetic\n    command: run'))
+        self.project.create()
+        packages = self.project.parse().packages
+
+        def digest() -> str:
+            with self.project.workdir():
+                return self.project.input_digests(packages, [packages[1]], False, False)['app']
+
+        before = digest()
+        self.project.timings.record('app', [], 1.0)
+        self.project.journal.record('app', before, 'app')
+        with open(os.path.join(self.root, '.rigel_config', 'base', 'Dockerfile'), 'a') as dockerfile:
+            dockerfile.write('RUN true\n')  # build files of another package
+        self.assertEqual(digest(), before)
+
+        with open(os.path.join(self.root, '.rigel_config', 'Dockerfile'), 'a') as dockerfile:
+            dockerfile.write('RUN true\n')  # build files of the package itself
+        self.assertNotEqual(digest(), before)
+
+    @patch('rigel.api.Project.input_digests')
+    def test_build_single_unjournaled(self, digests_mock: Mock) -> None:
+        """
+        Test if no input digest is computed nor journaled when a single ROS package is built without resuming.
+        """
+        self.project.build(['base'])
+        digests_mock.assert_not_called()
+        self.assertEqual(self.project.journal.entries(), {})
+
+    def test_simulation_metrics(self) -> None:
+        """
+        Test if plugin durations and the verdict of simulation requirements are recorded as metrics.
+        """
+        self.project.metrics = MetricsRegistry()
+        manager = Mock(finished=True, children=[
+            Mock(spec=SimulationRequirementNode, satisfied=True),
+            Mock(spec=SimulationRequirementNode, satisfied=False)
+        ])
+        self.project.run_plugin('test/plugin', Mock(), manager, ['first requirement'])
+
+        samples = self.project.metrics.samples
+        self.assertIn((('plugin', 'test/plugin'),), samples['rigel_plugin_duration_seconds'])
+        self.assertIn((('plugin', 'test/plugin'),), samples['rigel_simulation_verdict_seconds'])
+        self.assertEqual(samples['rigel_simulation_requirement_satisfied'], {
+            (('plugin', 'test/plugin'), ('requirement', 'first requirement')): 1.0,
+            (('plugin', 'test/plugin'), ('requirement', '1')): 0.0
+        })
+
+    def wait_for_builds(self, count: int) -> None:
+        deadline = time.monotonic() + 5
+        while self.build.call_count < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.build.call_count, count)
+
+    def test_watch(self) -> None:
+        """
+        Test if changed ROS packages and their dependents are built again.
+        """
+        stop = threading.Event()
+        thread = threading.Thread(target=self.project.watch, kwargs={'delay': 0.1, 'stop': stop})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(stop.set)
+
+        self.wait_for_builds(2)
+        self.assertTrue(os.path.isfile(os.path.join(self.root, '.rigel_config', 'app', 'Dockerfile')))
+
+        time.sleep(0.2)  # let the watcher settle after the build files were created
+        with open(os.path.join(self.root, 'docker', 'Dockerfile'), 'w') as dockerfile:
+            dockerfile.write('FROM scratch')
+        self.wait_for_builds(4)
+
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            rigelfile.write(RIGELFILE.replace('image: app', 'image: app:latest'))
+        self.wait_for_builds(5)
+        self.assertEqual(self.build.call_args[1]['tags'], 'app:latest')
+
+    def test_rebuild_round_cancel(self) -> None:
+        """
+        Test if builds in progress are aborted by removing the builders.
+        """
+        started, release = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+
+        def build_image(*args: Any, **kwargs: Any) -> None:
+            started.set()
+            release.wait(5)
+            raise DockerAPIError(exception='builder removed')
+
+        self.build.side_effect = build_image
+        self.client.remove_builder.side_effect = lambda *args: release.set()
+
+        rigelfile = self.project.parse()
+        rebuild = RebuildRound(self.project, rigelfile.packages, [], False, False, 1)
+        rebuild.start()
+        self.assertTrue(started.wait(5))
+        rebuild.cancel()
+        self.assertFalse(rebuild.is_alive())
+        self.client.remove_builder.assert_called_once_with('rigel-builder')
+        self.assertEqual(self.build.call_count, 1)
+        self.assertEqual(rebuild.completed, set())
+
+    @patch('rigel.api.PluginLoader')
+    def test_deploy(self, loader_mock: Mock) -> None:
+        """
+        Test if deployment plugins are run and stopped.
+        """
+        plugin = Mock()
+        loader_mock.return_value.load.return_value = plugin
+        results = self.project.deploy()
+        self.assertEqual([r.plugin for r in results], ['test/plugin'])
+        plugin.run.assert_called_once_with()
+        plugin.stop.assert_called_once_with()
+        self.assertEqual(self.project.plugins, {})
+
+    @patch('rigel.api.PluginLoader')
+    def test_deploy_error(self, loader_mock: Mock) -> None:
+        """
+        Test if plugins are stopped if they fail.
+        """
+        plugin = Mock()
+        plugin.run.side_effect = DockerAPIError(exception='test')
+        loader_mock.return_value.load.return_value = plugin
+        with self.assertRaises(DockerAPIError):
+            self.project.deploy()
+        plugin.stop.assert_called_once_with()
+
+
+class AsyncProjectTesting(unittest.IsolatedAsyncioTestCase):
+    """
+    Test suite for rigel.api.AsyncProject class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.realpath(self.tmp.name)
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            rigelfile.write(RIGELFILE)
+
+        executor = ThreadPoolExecutor(4)
+        self.addCleanup(executor.shutdown)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)  # never leave blocked threads behind
+
+        self.client = MagicMock()
+        self.client.get_image.return_value = None
+        patcher = patch('rigel.api.stream_build')
+        self.build = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.project = AsyncProject(self.root, Mock(), DockerSession(self.client), executor)
+
+    async def wait(self, event: threading.Event) -> None:
+        self.assertTrue(await asyncio.get_running_loop().run_in_executor(None, event.wait, 5))
+
+    async def test_build(self) -> None:
+        """
+        Test if build results are returned in order of declaration and builders are shared by all builds.
+        """
+        results = await self.project.build(jobs=2)
+        self.assertEqual([r.package for r in results], ['base', 'app'])
+        self.client.create_builder.assert_called_once_with('rigel-builder', use=True)
+        self.client.remove_builder.assert_called_once_with('rigel-builder')
+
+    async def test_build_package_concurrently(self) -> None:
+        """
+        Test if several ROS packages are built concurrently with the same builders.
+        """
+        started = threading.Barrier(2, timeout=5)
+
+        def build_image(*args: Any, **kwargs: Any) -> None:
+            started.wait()
+
+        self.build.side_effect = build_image
+        results = await asyncio.gather(self.project.build_package('app'), self.project.build_package('app'))
+        self.assertEqual([r.package for r in results], ['app', 'app'])
+        self.client.create_builder.assert_called_once_with('rigel-builder', use=True)
+        self.client.remove_builder.assert_called_once_with('rigel-builder')
+
+    async def test_build_package_cancelled(self) -> None:
+        """
+        Test if builders are removed once a build is cancelled.
+        """
+        started = threading.Event()
+
+        def build_image(*args: Any, **kwargs: Any) -> None:
+            started.set()
+            self.release.wait(5)
+
+        self.build.side_effect = build_image
+        task = asyncio.ensure_future(self.project.build_package('app'))
+        await self.wait(started)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.client.remove_builder.assert_called_once_with('rigel-builder')
+
+    @patch('rigel.api.PluginLoader')
+    async def test_deploy_cancelled(self, loader_mock: Mock) -> None:
+        """
+        Test if deployment plugins are stopped once a deployment is cancelled.
+        """
+        started = threading.Event()
+
+        def run() -> None:
+            started.set()
+            self.release.wait(5)
+
+        plugin = Mock()
+        plugin.run.side_effect = run
+        plugin.stop.side_effect = self.release.set
+        loader_mock.return_value.load.return_value = plugin
+
+        task = asyncio.ensure_future(self.project.deploy())
+        await self.wait(started)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        plugin.stop.assert_called_once_with()
+        self.assertEqual(self.project.project.plugins, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+from rigel.builds import BakeFileGenerator, run_bake
+from rigel.models import DockerSection, DockerfileSection
+from unittest.mock import Mock, patch
+
+
+class BakeFileGeneratorTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.BakeFileGenerator class.
+    """
+
+    def setUp(self) -> None:
+        with patch.dict(os.environ, {'TEST_SSH_KEY': 'secret'}):
+            self.base = DockerSection(
+                package='base.pkg',
+                distro='noetic',
+                command='test-command',
+                image='base:latest',
+                platforms=['linux/amd64', 'linux/arm64'],
+                ssh=[{'hostname': 'gitlab.com', 'value': 'TEST_SSH_KEY'}]
+            )
+        self.app = DockerfileSection(package='app', dockerfile='app', image='app:latest', depends_on=['base.pkg'])
+        self.paths = {
+            'base.pkg': ('/ctx/base', '/ctx/base/.rigel_config/Dockerfile'),
+            'app': ('/ctx/app', '/ctx/app/Dockerfile')
+        }
+
+    def test_target_name(self) -> None:
+        """
+        Test if target names only contain characters accepted by docker buildx bake.
+        """
+        self.assertEqual(BakeFileGenerator.target_name('my.package/a'), 'my-package-a')
+
+    def test_generate(self) -> None:
+        """
+        Test if all packages are described as targets of the default group.
+        """
+        definition = BakeFileGenerator([self.base, self.app], self.paths).generate()
+        self.assertEqual(definition['group'], {'default': {'targets': ['base-pkg', 'app']}})
+
+        base = definition['target']['base-pkg']
+        self.assertEqual(base['context'], '/ctx/base')
+        self.assertEqual(base['dockerfile'], '/ctx/base/.rigel_config/Dockerfile')
+        self.assertEqual(base['tags'], ['base:latest'])
+        self.assertEqual(base['platforms'], ['linux/amd64', 'linux/arm64'])
+        self.assertEqual(base['args'], {'TEST_SSH_KEY': None})  # no secret values are written
+        self.assertNotIn('cache-from', base)
+
+        app = definition['target']['app']
+        self.assertEqual(app['contexts'], {'base:latest': 'target:base-pkg'})
+        self.assertNotIn('platforms', app)
+
+    def test_cache_settings(self) -> None:
+        """
+        Test if a local cache is assigned to each target when a cache folder is set.
+        """
+        definition = BakeFileGenerator([self.app], self.paths, '/cache').generate()
+        self.assertEqual(definition['target']['app']['cache-from'], ['type=local,src=/cache/app'])
+        self.assertEqual(definition['target']['app']['cache-to'], ['type=local,dest=/cache/app,mode=max'])
+
+    def test_write(self) -> None:
+        """
+        Test if the bake definition is written as JSON.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, 'docker-bake.json')
+            generator = BakeFileGenerator([self.base, self.app], self.paths)
+            generator.write(filepath)
+            with open(filepath, 'r') as bake_file:
+                self.assertEqual(json.load(bake_file), generator.generate())
+
+    def test_run_bake(self) -> None:
+        """
+        Test if all targets are built with a single bake invocation.
+        """
+        docker = Mock()
+        run_bake(docker, 'docker-bake.json', ['base-pkg', 'app'], True, False, {'base-pkg.args.KEY': 'value'})
+        docker.client.buildx.bake.assert_called_once_with(
+            targets=['base-pkg', 'app'],
+            files=['docker-bake.json'],
+            load=True,
+            push=False,
+            set={'base-pkg.args.KEY': 'value'}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from rigel.builds import BuildJournal, input_digest
+
+
+class InputDigestTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.input_digest function.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'Dockerfile')
+        with open(self.path, 'w') as dockerfile:
+            dockerfile.write('FROM ubuntu\n')
+
+    def test_digest(self) -> None:
+        """
+        Test if the digest changes with the declaration, the files and the dependencies.
+        """
+        digest = input_digest({'image': 'app'}, [self.path], [])
+        self.assertEqual(input_digest({'image': 'app'}, [self.path, self.path], []), digest)
+        self.assertNotEqual(input_digest({'image': 'other'}, [self.path], []), digest)
+        self.assertNotEqual(input_digest({'image': 'app'}, [self.path], ['base']), digest)
+        self.assertNotEqual(input_digest({'image': 'app'}, [], []), digest)
+
+        with open(self.path, 'w') as dockerfile:
+            dockerfile.write('FROM debian\n')
+        os.utime(self.path, ns=(0, 0))
+        self.assertNotEqual(input_digest({'image': 'app'}, [self.path], []), digest)
+
+    def test_fingerprint(self) -> None:
+        """
+        Test if files are identified by their size and modification time instead of their content.
+        """
+        os.utime(self.path, ns=(0, 0))
+        digest = input_digest({}, [self.path], [])
+        with open(self.path, 'w') as dockerfile:
+            dockerfile.write('FROM debian\n')  # same size
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(input_digest({}, [self.path], []), digest)
+
+        os.utime(self.path, ns=(0, 1))
+        self.assertNotEqual(input_digest({}, [self.path], []), digest)
+
+
+class BuildJournalTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.BuildJournal class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, '.rigel_config', 'journal.json')
+
+    def test_record(self) -> None:
+        """
+        Test if successful builds are persisted and only match the same digest.
+        """
+        BuildJournal(self.path).record('app', 'digest', 'app:latest')
+
+        journal = BuildJournal(self.path)
+        self.assertTrue(journal.completed('app', 'digest'))
+        self.assertFalse(journal.completed('app', 'other'))
+        self.assertFalse(journal.completed('base', 'digest'))
+        self.assertEqual(journal.entries()['app']['image'], 'app:latest')
+
+    def test_clear(self) -> None:
+        """
+        Test if a new run forgets all previous builds.
+        """
+        journal = BuildJournal(self.path)
+        journal.record('app', 'digest', 'app')
+        journal.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(BuildJournal(self.path).completed('app', 'digest'))
+
+    def test_corrupted(self) -> None:
+        """
+        Test if corrupted journals are ignored.
+        """
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as journal_file:
+            journal_file.write('{"packages": ')
+        self.assertEqual(BuildJournal(self.path).entries(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
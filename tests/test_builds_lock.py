@@ -0,0 +1,59 @@
+import unittest
+from python_on_whales.exceptions import DockerException
+from rigel.builds import pin_image, resolve_image_digest
+from rigelcore.exceptions import DockerAPIError
+from unittest.mock import MagicMock, patch
+
+DIGEST = 'sha256:' + 'a' * 64
+
+
+class ResolveImageDigestTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.resolve_image_digest function.
+    """
+
+    def setUp(self) -> None:
+        self.docker = MagicMock()
+        self.docker.client.docker_cmd = ['docker']
+
+    @patch('rigel.builds.lock.python_on_whales.utils.run')
+    def test_resolve(self, run: MagicMock) -> None:
+        """
+        Test if the digest is read from the manifest inside the registry.
+        """
+        run.return_value = f'{{"mediaType": "application/vnd.oci.image.index.v1+json", "digest": "{DIGEST}", "size": 1}}'
+        self.assertEqual(resolve_image_digest(self.docker, 'ros:noetic'), DIGEST)
+        run.assert_called_once_with(
+            ['docker', 'buildx', 'imagetools', 'inspect', '--format', '{{json .Manifest}}', 'ros:noetic']
+        )
+
+    @patch('rigel.builds.lock.python_on_whales.utils.run')
+    def test_errors(self, run: MagicMock) -> None:
+        """
+        Test if unknown images and unexpected output are reported.
+        """
+        run.side_effect = DockerException(['docker'], 1)
+        with self.assertRaises(DockerAPIError):
+            resolve_image_digest(self.docker, 'ros:unknown')
+
+        run.side_effect = None
+        run.return_value = 'unexpected'
+        with self.assertRaises(DockerAPIError):
+            resolve_image_digest(self.docker, 'ros:noetic')
+
+
+class PinImageTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.pin_image function.
+    """
+
+    def test_pin_image(self) -> None:
+        """
+        Test if tags are kept and previous digests are replaced.
+        """
+        self.assertEqual(pin_image('ros:noetic', DIGEST), f'ros:noetic@{DIGEST}')
+        self.assertEqual(pin_image('localhost:5000/ros@sha256:old', DIGEST), f'localhost:5000/ros@{DIGEST}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from rigel.builds import BuildLog, stream_build
+from rigelcore.exceptions import DockerAPIError
+from typing import List
+from unittest.mock import MagicMock, Mock, patch
+
+
+class BuildLogTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.BuildLog class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.folder = os.path.join(self.tmp.name, 'logs')
+
+    def read(self, path: str) -> List[str]:
+        with open(path, 'r') as log_file:
+            return log_file.read().splitlines()
+
+    def test_tail(self) -> None:
+        """
+        Test if all lines are written to the log file while only the latest are kept in memory.
+        """
+        with BuildLog('test_package', self.folder, tail_lines=3) as log:
+            for index in range(10):
+                log.write(f'line {index}\n')
+        self.assertEqual(log.tail(), ['line 7', 'line 8', 'line 9'])
+        self.assertEqual(len(self.read(log.path)), 10)
+
+    def test_rotation(self) -> None:
+        """
+        Test if log files are rotated once too large and whenever a new build starts.
+        """
+        with BuildLog('test_package', self.folder, max_bytes=20, backups=2) as log:
+            for index in range(4):
+                log.write(f'line {index}')  # 7 bytes each
+        self.assertEqual(self.read(log.path), ['line 2', 'line 3'])
+        self.assertEqual(self.read(f'{log.path}.1'), ['line 0', 'line 1'])
+
+        with BuildLog('test_package', self.folder, max_bytes=20, backups=2) as log:
+            log.write('new build')
+        self.assertEqual(self.read(log.path), ['new build'])
+        self.assertEqual(self.read(f'{log.path}.1'), ['line 2', 'line 3'])
+        self.assertEqual(self.read(f'{log.path}.2'), ['line 0', 'line 1'])
+        self.assertFalse(os.path.exists(f'{log.path}.3'))
+
+    def test_echo(self) -> None:
+        """
+        Test if lines are echoed in order.
+        """
+        echoed: List[str] = []
+        with BuildLog('test_package', self.folder, echo=echoed.append) as log:
+            for index in range(10):
+                log.write(f'line {index}\n')
+        self.assertEqual(echoed, [f'line {index}' for index in range(10)])
+        self.assertEqual(log.skipped, 0)
+
+    def test_slow_echo(self) -> None:
+        """
+        Test if a slow echo skips lines instead of stalling the build output.
+        """
+        release = threading.Event()
+        self.addCleanup(release.set)
+        echoed: List[str] = []
+
+        def echo(line: str) -> None:
+            release.wait(5)
+            echoed.append(line)
+
+        log = BuildLog('test_package', self.folder, echo=echo, queue_size=2)
+        log.open()
+        for index in range(10):
+            log.write(f'line {index}')  # must not block
+        release.set()
+        log.close()
+        self.assertGreater(log.skipped, 0)
+        self.assertEqual(len(echoed) + log.skipped, 10)
+        self.assertEqual(self.read(log.path)[-1], f'[{log.skipped} lines were not echoed to the terminal]')
+
+
+class StreamBuildTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.stream_build function.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.docker = MagicMock()
+        self.docker.client.docker_cmd = ['docker']
+        self.log = BuildLog('test_package', self.tmp.name)
+
+    @patch('rigel.builds.logs.subprocess.Popen')
+    def test_stream_build(self, popen_mock: Mock) -> None:
+        """
+        Test if build output is captured line by line.
+        """
+        popen_mock.return_value.stdout = io.BytesIO(b'#1 step\n#2 done\n')
+        popen_mock.return_value.wait.return_value = 0
+
+        with self.log:
+            stream_build(
+                self.docker,
+                'test_path',
+                self.log,
+                tags='test_image',
+                file='test_path/Dockerfile',
+                build_args={'KEY': 'value'},
+                platforms=['linux/amd64', 'linux/arm64'],
+                load=True
+            )
+
+        self.assertEqual(popen_mock.call_args[0][0], [
+            'docker', 'buildx', 'build', '--progress', 'plain',
+            '--tag', 'test_image',
+            '--file', 'test_path/Dockerfile',
+            '--build-arg', 'KEY=value',
+            '--platform', 'linux/amd64,linux/arm64',
+            '--load',
+            'test_path'
+        ])
+        self.assertEqual(self.log.tail(), ['#1 step', '#2 done'])
+
+    @patch('rigel.builds.logs.subprocess.Popen')
+    def test_stream_build_error(self, popen_mock: Mock) -> None:
+        """
+        Test if DockerAPIError is thrown if the build fails.
+        """
+        popen_mock.return_value.stdout = io.BytesIO(b'ERROR: failed to solve\n')
+        popen_mock.return_value.wait.return_value = 1
+
+        with self.log, self.assertRaises(DockerAPIError):
+            stream_build(self.docker, 'test_path', self.log, tags=['test_image'], push=True)
+        self.assertIn('--push', popen_mock.call_args[0][0])
+        self.assertEqual(self.log.tail(), ['ERROR: failed to solve'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import unittest
+from rigel.builds import generate_paths, ssh_key_path
+from rigel.models import DockerSection, DockerfileSection
+
+
+class GeneratePathsTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.generate_paths function.
+    """
+
+    def test_paths(self) -> None:
+        """
+        Test if build contexts and Dockerfile folders are placed as expected.
+        """
+        package = DockerSection(package='app', image='app', distro='noetic', command='run')
+        self.assertEqual(generate_paths(package), (os.path.abspath('.rigel_config/app'),) * 2)
+        package = DockerSection(package='app', image='app', distro='noetic', command='run', dir='src')
+        self.assertEqual(generate_paths(package), (os.path.abspath('src'), os.path.abspath('src/.rigel_config')))
+        dockerfile = DockerfileSection(package='app', image='app', dockerfile='docker')
+        self.assertEqual(generate_paths(dockerfile), (os.path.abspath('docker'),) * 2)
+
+
+class SSHKeyPathTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.ssh_key_path function.
+    """
+
+    def test_relative_to_package_root(self) -> None:
+        """
+        Test if key files are resolved against the package root, from which they are copied when building.
+        """
+        package = DockerSection(
+            package='app',
+            image='app',
+            distro='noetic',
+            command='run',
+            dir='src',
+            ssh=[{'hostname': 'github.com', 'value': 'id_rsa', 'file': True}]
+        )
+        self.assertEqual(ssh_key_path(package, package.ssh[0]), os.path.abspath('src/id_rsa'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from rigel.builds import MultiPlatformBuilder, parse_builder_endpoints
+from rigel.exceptions import InvalidBuilderEndpointError, UnsupportedPlatformError
+from rigelcore.exceptions import DockerAPIError
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, Mock, patch
+
+
+class ParseBuilderEndpointsTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.parse_builder_endpoints function.
+    """
+
+    def test_valid_endpoints(self) -> None:
+        """
+        Test if builder endpoint declarations are parsed as expected.
+        """
+        endpoints = parse_builder_endpoints(['linux/arm64=tcp://arm-node:1234'])
+        self.assertEqual(endpoints, {'linux/arm64': 'tcp://arm-node:1234'})
+
+    def test_invalid_builder_endpoint_error(self) -> None:
+        """
+        Test if InvalidBuilderEndpointError is thrown if a declaration has no endpoint.
+        """
+        with self.assertRaises(InvalidBuilderEndpointError) as context:
+            parse_builder_endpoints(['linux/arm64'])
+        self.assertEqual(context.exception.kwargs['endpoint'], 'linux/arm64')
+
+    def test_unsupported_platform_error(self) -> None:
+        """
+        Test if UnsupportedPlatformError is thrown if a declaration concerns an unsupported platform.
+        """
+        with self.assertRaises(UnsupportedPlatformError):
+            parse_builder_endpoints(['linux/s390x=tcp://node:1234'])
+
+
+class MultiPlatformBuilderTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.MultiPlatformBuilder class.
+    """
+
+    platforms = ['linux/arm64', 'linux/amd64']
+
+    def test_platform_tag(self) -> None:
+        """
+        Test if single-platform image names are derived from the image name.
+        """
+        self.assertEqual(MultiPlatformBuilder.platform_tag('user/image:1.0', 'linux/arm64'), 'user/image:1.0-arm64')
+        self.assertEqual(MultiPlatformBuilder.platform_tag('image', 'linux/amd64'), 'image:latest-amd64')
+        self.assertEqual(
+            MultiPlatformBuilder.platform_tag('localhost:5000/image', 'linux/arm64'),
+            'localhost:5000/image:latest-arm64'
+        )
+
+    def test_builder_name(self) -> None:
+        """
+        Test if only platforms with a remote endpoint are assigned a dedicated builder.
+        """
+        builder = MultiPlatformBuilder(Mock(), 'rigel-builder', {'linux/arm64': 'tcp://arm-node:1234'})
+        self.assertEqual(builder.builder_name('linux/arm64'), 'rigel-builder-linux-arm64')
+        self.assertEqual(builder.builder_name('linux/amd64'), 'rigel-builder')
+
+    def test_create_remote_builders(self) -> None:
+        """
+        Test if remote builders are created using the declared endpoints.
+        """
+        docker = MagicMock()
+        docker.get_builder.return_value = None
+        builder = MultiPlatformBuilder(docker, 'rigel-builder', {'linux/arm64': 'tcp://arm-node:1234'})
+        self.assertEqual(builder.create_remote_builders(self.platforms), ['rigel-builder-linux-arm64'])
+        docker.client.buildx.create.assert_called_once_with(
+            'tcp://arm-node:1234',
+            driver='remote',
+            name='rigel-builder-linux-arm64'
+        )
+
+    def logs(self) -> Dict[str, MagicMock]:
+        logs: Dict[str, MagicMock] = {}
+        for docker_platform in self.platforms:
+            logs[docker_platform] = MagicMock()
+            logs[docker_platform].tail.return_value = ['error']
+        return logs
+
+    @patch('rigel.builds.platforms.stream_build')
+    @patch('rigel.builds.platforms.MultiPlatformBuilder.create_manifest')
+    def test_build_push(self, manifest_mock: Mock, stream_mock: Mock) -> None:
+        """
+        Test if one build is made per platform, each with its own build log, and a manifest list is assembled when pushing.
+        """
+        docker = Mock()
+        logs = self.logs()
+        builder = MultiPlatformBuilder(docker, 'rigel-builder')
+        tags = builder.build('/context', 'image:1.0', self.platforms, False, True, logs.__getitem__, file='/context/Dockerfile')
+
+        self.assertEqual(tags, {'linux/arm64': 'image:1.0-arm64', 'linux/amd64': 'image:1.0-amd64'})
+        self.assertEqual(stream_mock.call_count, 2)
+        stream_mock.assert_any_call(
+            docker,
+            '/context',
+            logs['linux/arm64'],
+            file='/context/Dockerfile',
+            load=False,
+            push=True,
+            tags='image:1.0-arm64',
+            platforms=['linux/arm64'],
+            builder='rigel-builder'
+        )
+        manifest_mock.assert_called_once_with('image:1.0', ['image:1.0-arm64', 'image:1.0-amd64'])
+
+    @patch('rigel.builds.platforms.stream_build')
+    @patch('rigel.builds.platforms.host_platform.machine')
+    @patch('rigel.builds.platforms.MultiPlatformBuilder.create_manifest')
+    def test_build_load(self, manifest_mock: Mock, machine_mock: Mock, stream_mock: Mock) -> None:
+        """
+        Test if the native image is tagged with the original image name when images are only loaded.
+        """
+        machine_mock.return_value = 'aarch64'
+        docker = Mock()
+        builder = MultiPlatformBuilder(docker, 'rigel-builder')
+        builder.build('/context', 'image:1.0', self.platforms, True, False, self.logs().__getitem__)
+
+        manifest_mock.assert_not_called()
+        docker.tag_image.assert_called_once_with('image:1.0-arm64', 'image:1.0')
+
+    @patch('rigel.builds.platforms.stream_build')
+    @patch('rigel.builds.platforms.MultiPlatformBuilder.create_manifest')
+    def test_build_error(self, manifest_mock: Mock, stream_mock: Mock) -> None:
+        """
+        Test if errors raised by any platform build are propagated together with the tail of its build log.
+        """
+        def build(docker: Any, path: str, log: Any, platforms: List[str], **kwargs: Any) -> None:
+            if platforms == ['linux/arm64']:
+                raise DockerAPIError(exception='test')
+
+        stream_mock.side_effect = build
+        logger = Mock()
+        builder = MultiPlatformBuilder(Mock(), 'rigel-builder', logger=logger)
+        built = Mock()
+        stdout = io.StringIO()
+        with self.assertRaises(DockerAPIError), redirect_stdout(stdout):
+            builder.build('/context', 'image', self.platforms, False, True, self.logs().__getitem__, built)
+        manifest_mock.assert_not_called()
+        logger.error.assert_called_once()
+        self.assertIn("Failed to build Docker image 'image:latest-arm64'", logger.error.call_args.args[0])
+        self.assertIn('  error\n', stdout.getvalue())
+        self.assertEqual(sorted((c.args[0], c.args[2]) for c in built.call_args_list),
+                         [('linux/amd64', True), ('linux/arm64', False)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import os
+import python_on_whales
+import socket
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from rigel.builds import PreflightChecker, preflight_report
+from rigel.builds.preflight import base_images, registry_url
+from rigel.models import DockerSection, DockerfileSection, LockedPackage, Lockfile
+from rigel.models.docker import Registry
+from typing import Any, List, Union
+from unittest.mock import MagicMock
+
+
+class RegistryHandler(BaseHTTPRequestHandler):
+    """
+    A stand-in for a local image registry that requires authentication.
+    """
+
+    def do_GET(self) -> None:
+        self.send_response(401 if self.path == '/v2/' else 404)
+        self.send_header('WWW-Authenticate', 'Basic realm="registry"')
+        self.end_headers()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class RegistryURLTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.preflight.registry_url function.
+    """
+
+    def test_registry_url(self) -> None:
+        """
+        Test if local registries are reached using HTTP and Docker Hub aliases are resolved.
+        """
+        self.assertEqual(registry_url('registry.example.com'), 'https://registry.example.com/v2/')
+        self.assertEqual(registry_url('https://registry.example.com/team'), 'https://registry.example.com/v2/')
+        self.assertEqual(registry_url('localhost:5000'), 'http://localhost:5000/v2/')
+        self.assertEqual(registry_url('docker.io'), 'https://registry-1.docker.io/v2/')
+
+
+class BaseImagesTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.preflight.base_images function.
+    """
+
+    def test_docker_section(self) -> None:
+        """
+        Test if the ROS images of generated Dockerfiles are listed once.
+        """
+        package = DockerSection(package='app', image='app', distro='noetic', command='run')
+        self.assertEqual(base_images(package), ['ros:noetic'])
+        package = DockerSection(package='app', image='app', distro='noetic', command='run', ros_image='noetic-perception')
+        self.assertEqual(base_images(package), ['ros:noetic', 'ros:noetic-perception'])
+
+    def test_locked(self) -> None:
+        """
+        Test if the pinned references of locked base images are listed instead.
+        """
+        package = DockerSection(package='app', image='app', distro='noetic', command='run', ros_image='noetic-perception')
+        lock = LockedPackage(images={'ros:noetic': 'ros:noetic@sha256:pinned'})
+        self.assertEqual(base_images(package, lock), ['ros:noetic@sha256:pinned', 'ros:noetic-perception'])
+
+    def test_dockerfile_section(self) -> None:
+        """
+        Test if stages, scratch and images named after build arguments are left out.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, 'Dockerfile'), 'w') as dockerfile:
+                dockerfile.write(
+                    'ARG BASE=ubuntu\n'
+                    'FROM --platform=linux/amd64 ubuntu:22.04 AS builder\n'
+                    'FROM scratch AS empty\n'
+                    'from ${BASE}\n'
+                    'FROM builder\n'
+                    'FROM python:3.9-slim\n'
+                )
+            package = DockerfileSection(package='app', image='app', dockerfile=folder)
+            self.assertEqual(base_images(package), ['ubuntu:22.04', 'python:3.9-slim'])
+
+
+class PreflightCheckerTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.PreflightChecker class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.realpath(self.tmp.name)
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+        self.server = HTTPServer(('127.0.0.1', 0), RegistryHandler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.docker = MagicMock()
+        self.docker.get_image.return_value = None
+
+    def registry(self, port: int) -> Registry:
+        return Registry(server=f'localhost:{port}', username='user', password='secret')
+
+    def closed_port(self) -> int:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port: int = sock.getsockname()[1]
+            return port
+
+    def checks(self, failures: List[Any]) -> List[str]:
+        return [f'{failure.package}:{failure.check}' for failure in failures]
+
+    def test_ready(self) -> None:
+        """
+        Test if no problems are reported for packages ready to be built.
+        """
+        os.makedirs('app')
+        for name in ['deps.rosinstall', 'id_rsa']:
+            with open(os.path.join('app', name), 'w') as file:
+                file.write('content')
+        package = DockerSection(
+            package='app',
+            image='app',
+            distro='noetic',
+            command='run',
+            dir='app',
+            rosinstall=['deps.rosinstall'],
+            ssh=[{'hostname': 'github.com', 'value': 'id_rsa', 'file': True}],
+            registry=self.registry(self.server.server_port)
+        )
+        self.assertEqual(PreflightChecker(self.docker, timeout=5).run([package]), [])
+
+    def test_failures(self) -> None:
+        """
+        Test if all problems of all packages are reported.
+        """
+        self.docker.client.buildx.imagetools.inspect.side_effect = python_on_whales.exceptions.DockerException(
+            ['docker', 'buildx', 'imagetools', 'inspect'], 1
+        )
+        os.makedirs('app')
+        packages: List[Union[DockerSection, DockerfileSection]] = [
+            DockerSection(
+                package='app',
+                image='app',
+                distro='noetic',
+                command='run',
+                dir='app',
+                rosinstall=['deps.rosinstall'],
+                ssh=[{'hostname': 'github.com', 'value': 'id_rsa', 'file': True}],
+                registry=self.registry(self.closed_port())
+            ),
+            DockerfileSection(package='base', image='base', dockerfile='missing')
+        ]
+        failures = PreflightChecker(self.docker, timeout=5).run(packages)
+        self.assertEqual(
+            self.checks(failures),
+            ['app:registry', 'app:rosinstall', 'app:ssh', 'app:base_image', 'base:dockerfile']
+        )
+        report = preflight_report(failures)
+        self.assertIn("app (ssh): SSH key file 'id_rsa' does not exist", report)
+        self.assertIn("Base image 'ros:noetic'", report)
+
+    def test_shared_checks(self) -> None:
+        """
+        Test if shared registries and base images are checked once and images built by Rigel are not checked.
+        """
+        os.makedirs('docker')
+        with open(os.path.join('docker', 'Dockerfile'), 'w') as dockerfile:
+            dockerfile.write('FROM app\n')
+        registry = self.registry(self.server.server_port)
+        packages: List[Union[DockerSection, DockerfileSection]] = [
+            DockerSection(package=f'app_{index}', image='app', distro='noetic', command='run', registry=registry)
+            for index in range(5)
+        ]
+        packages.append(DockerfileSection(package='extension', image='extension', dockerfile='docker'))
+
+        checker = PreflightChecker(self.docker, images=['app'], timeout=5)
+        self.assertEqual(checker.run(packages), [])
+        self.docker.get_image.assert_called_once_with('ros:noetic')
+
+    def test_locked_base_images(self) -> None:
+        """
+        Test if the pinned references of locked base images are checked.
+        """
+        package = DockerSection(package='app', image='app', distro='noetic', command='run')
+        lockfile = Lockfile(packages={'app': LockedPackage(images={'ros:noetic': 'ros:noetic@sha256:pinned'})})
+        self.assertEqual(PreflightChecker(self.docker, timeout=5, lockfile=lockfile).run([package]), [])
+        self.docker.get_image.assert_called_once_with('ros:noetic@sha256:pinned')
+
+
+if __name__ == '__main__':
+    unittest.main()
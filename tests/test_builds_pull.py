@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from rigel.builds import base_image_pulls, BuildLog, pull_base_image
+from rigel.models import DockerSection, DockerfileSection, LockedPackage, Lockfile
+from typing import Any, List, Union
+from unittest.mock import MagicMock, patch
+
+
+class BaseImagePullsTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.base_image_pulls function.
+    """
+
+    def test_distinct_images(self) -> None:
+        """
+        Test if each base image is pulled once per set of platforms and images built by Rigel are left out.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            with open(os.path.join(folder, 'Dockerfile'), 'w') as dockerfile:
+                dockerfile.write('FROM ubuntu:22.04\nFROM app\n')
+            packages: List[Union[DockerSection, DockerfileSection]] = [
+                DockerSection(package=f'app_{index}', image='app', distro='noetic', command='run') for index in range(3)
+            ]
+            packages.append(DockerSection(
+                package='arm', image='arm', distro='noetic', command='run', ros_image='noetic-perception',
+                platforms=['linux/arm64', 'linux/amd64']
+            ))
+            packages.append(DockerfileSection(package='extension', image='extension', dockerfile=folder))
+
+            self.assertEqual(base_image_pulls(packages, ['app', 'arm', 'extension']), [
+                ('ros:noetic', []),
+                ('ros:noetic', ['linux/amd64', 'linux/arm64']),
+                ('ros:noetic-perception', ['linux/amd64', 'linux/arm64']),
+                ('ubuntu:22.04', [])
+            ])
+
+    def test_locked_images(self) -> None:
+        """
+        Test if the pinned references of locked base images are pulled instead.
+        """
+        packages: List[Union[DockerSection, DockerfileSection]] = [
+            DockerSection(package=name, image=name, distro='noetic', command='run') for name in ['app', 'other']
+        ]
+        lockfile = Lockfile(packages={'app': LockedPackage(images={'ros:noetic': 'ros:noetic@sha256:pinned'})})
+        self.assertEqual(base_image_pulls(packages, [], lockfile), [('ros:noetic@sha256:pinned', []), ('ros:noetic', [])])
+
+
+class PullBaseImageTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.pull_base_image function.
+    """
+
+    def setUp(self) -> None:
+        self.dockerfiles: List[str] = []
+        patcher = patch('rigel.builds.pull.stream_build', side_effect=self.read_dockerfile)
+        self.build = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('rigel.builds.pull.resolve_image_digest', return_value='sha256:remote')
+        self.resolve = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_dockerfile(self, docker: Any, path: str, log: BuildLog, **kwargs: Any) -> None:
+        with open(os.path.join(path, 'Dockerfile')) as dockerfile:
+            self.dockerfiles.append(dockerfile.read())
+
+    def test_pull(self) -> None:
+        """
+        Test if base images are pulled by the builder, pinned to their remote digest, by a build that exports nothing.
+        """
+        docker, log = MagicMock(), MagicMock()
+        self.assertTrue(pull_base_image(docker, 'ros:noetic', ['linux/arm64', 'linux/amd64'], log, 'rigel-builder'))
+
+        self.assertEqual(self.dockerfiles, ['FROM ros:noetic@sha256:remote\n'])
+        self.build.assert_called_once_with(
+            docker, self.build.call_args.args[1], log,
+            tags=[], platforms=['linux/arm64', 'linux/amd64'], builder='rigel-builder'
+        )
+        self.assertFalse(os.path.exists(self.build.call_args.args[1]))  # the build context is removed
+        docker.client.image.pull.assert_not_called()  # the image store of the Docker daemon is not used by builds
+
+    def test_skip(self) -> None:
+        """
+        Test if only platforms the builder does not hold the current digest for are pulled.
+        """
+        docker, log = MagicMock(), MagicMock()
+        warmed = {('sha256:remote', 'linux/arm64'), ('sha256:outdated', 'linux/amd64')}
+        self.assertTrue(pull_base_image(docker, 'ros:noetic', ['linux/arm64', 'linux/amd64'], log, 'rigel-builder', warmed))
+        self.assertEqual(self.build.call_args.kwargs['platforms'], ['linux/amd64'])
+        self.assertIn(('sha256:remote', 'linux/amd64'), warmed)
+
+        self.build.reset_mock()
+        self.assertFalse(pull_base_image(docker, 'ros:noetic', ['linux/amd64'], log, 'rigel-builder', warmed))
+        self.build.assert_not_called()
+
+    def test_pinned(self) -> None:
+        """
+        Test if the digest of base images pinned by the Rigelfile.lock is used without resolving it.
+        """
+        docker, log, warmed = MagicMock(), MagicMock(), {('sha256:pinned', '')}
+        self.assertFalse(pull_base_image(docker, 'ros:noetic@sha256:pinned', [], log, 'rigel-builder', warmed))
+        self.resolve.assert_not_called()
+
+        self.assertTrue(pull_base_image(docker, 'ros:noetic@sha256:other', [], log, 'rigel-builder', warmed))
+        self.assertEqual(self.dockerfiles, ['FROM ros:noetic@sha256:other\n'])
+        self.assertIsNone(self.build.call_args.kwargs['platforms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from rigel.builds import default_jobs, detect_budget
+from rigel.builds.resources import cgroup_cpu_limit, cgroup_folders, cgroup_memory_limit
+from rigel.models import Resources
+from typing import Dict
+from unittest.mock import patch
+
+GIB = 1024 ** 3
+
+
+class CgroupTesting(unittest.TestCase):
+    """
+    Test suite for the detection of cgroup limits at rigel.builds.resources.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        self.proc = os.path.join(self.root, 'cgroup')
+
+    def write(self, files: Dict[str, str], cgroup: str = '0::/runner/job\n') -> None:
+        with open(self.proc, 'w') as proc_file:
+            proc_file.write(cgroup)
+        for path, content in files.items():
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as value_file:
+                value_file.write(content + '\n')
+
+    def test_folders(self) -> None:
+        """
+        Test if the cgroup of the process and all its ancestors are considered.
+        """
+        self.write({})
+        self.assertEqual(cgroup_folders(self.root, self.proc), [
+            os.path.join(self.root, 'runner', 'job'),
+            os.path.join(self.root, 'runner'),
+            self.root
+        ])
+
+    def test_v2_limits(self) -> None:
+        """
+        Test if the strictest limits of cgroup v2 are used.
+        """
+        self.write({
+            'runner/job/cpu.max': 'max 100000',
+            'runner/cpu.max': '250000 100000',
+            'runner/job/memory.max': str(6 * GIB),
+            'runner/memory.max': str(8 * GIB),
+            'memory.max': 'max'
+        })
+        self.assertEqual(cgroup_cpu_limit(self.root, self.proc), 2.5)
+        self.assertEqual(cgroup_memory_limit(self.root, self.proc), 6 * GIB)
+
+    def test_v1_limits(self) -> None:
+        """
+        Test if the limits of cgroup v1 are used if cgroup v2 is not available.
+        """
+        self.write({
+            'cpu/cpu.cfs_quota_us': '200000',
+            'cpu/cpu.cfs_period_us': '100000',
+            'memory/memory.limit_in_bytes': str(4 * GIB)
+        }, cgroup='4:memory:/job\n1:cpu:/job\n0::/\n')
+        self.assertEqual(cgroup_cpu_limit(self.root, self.proc), 2.0)
+        self.assertEqual(cgroup_memory_limit(self.root, self.proc), 4 * GIB)
+
+    def test_unlimited(self) -> None:
+        """
+        Test if no limits are reported when none are set.
+        """
+        self.write({'cpu/cpu.cfs_quota_us': '-1', 'memory/memory.limit_in_bytes': str(2 ** 63 - 4096)})
+        self.assertIsNone(cgroup_cpu_limit(self.root, self.proc))
+        self.assertIsNone(cgroup_memory_limit(self.root, self.proc))
+
+    @patch('rigel.builds.resources.cgroup_memory_limit', return_value=3 * GIB)
+    @patch('rigel.builds.resources.cgroup_cpu_limit', return_value=1.5)
+    @patch('rigel.builds.resources.available_cpus', return_value=8)
+    def test_detect_budget(self, *mocks: object) -> None:
+        """
+        Test if the available resources are limited by cgroups.
+        """
+        self.assertEqual(detect_budget(), Resources(cpus=1.5, memory=3 * GIB))
+
+
+class DefaultJobsTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.default_jobs function.
+    """
+
+    def test_default_jobs(self) -> None:
+        """
+        Test if the default concurrency fits both the available CPUs and memory.
+        """
+        self.assertEqual(default_jobs(Resources(cpus=8, memory=64 * GIB)), 8)
+        self.assertEqual(default_jobs(Resources(cpus=8, memory=7 * GIB)), 3)
+        self.assertEqual(default_jobs(Resources(cpus=0.5, memory=64 * GIB)), 1)
+        self.assertEqual(default_jobs(Resources(cpus=4, memory=GIB)), 1)
+        self.assertEqual(default_jobs(Resources()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
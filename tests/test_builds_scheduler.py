@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+from rigel.builds import BuildScheduler
+from rigel.exceptions import CyclicDependencyError
+from rigel.models import Resources
+from typing import List
+
+
+class BuildSchedulerTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.BuildScheduler class.
+    """
+
+    def test_dependency_order(self) -> None:
+        """
+        Test if jobs only start after all their dependencies.
+        """
+        scheduler = BuildScheduler({'app': ['base', 'msgs'], 'msgs': ['base'], 'base': []})
+        self.assertEqual(scheduler.schedule(), ['base', 'msgs', 'app'])
+
+    def test_critical_path_priority(self) -> None:
+        """
+        Test if, among ready jobs, the one heading the longest chain of dependents starts first.
+        """
+        scheduler = BuildScheduler({'leaf': [], 'base': [], 'middle': ['base'], 'top': ['middle']})
+        self.assertEqual(scheduler.priorities, {'leaf': 1.0, 'base': 3.0, 'middle': 2.0, 'top': 1.0})
+        self.assertEqual(scheduler.schedule(), ['base', 'middle', 'leaf', 'top'])
+
+    def test_weights(self) -> None:
+        """
+        Test if job costs are considered when computing the critical path.
+        """
+        scheduler = BuildScheduler({'a': [], 'b': []}, weights={'b': 10.0})
+        self.assertEqual(scheduler.schedule(), ['b', 'a'])
+
+    def test_unscheduled_dependencies(self) -> None:
+        """
+        Test if dependencies on jobs that are not scheduled are ignored.
+        """
+        scheduler = BuildScheduler({'app': ['unselected']})
+        self.assertEqual(scheduler.schedule(), ['app'])
+
+    def test_concurrency(self) -> None:
+        """
+        Test if independent jobs run concurrently and dependent jobs wait for their dependencies.
+        """
+        lock = threading.Lock()
+        running: List[str] = []
+        overlaps: List[List[str]] = []
+        finished: List[str] = []
+
+        def job(name: str) -> None:
+            with lock:
+                running.append(name)
+                overlaps.append(list(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(name)
+                finished.append(name)
+
+        BuildScheduler({'a': [], 'b': [], 'c': ['a', 'b']}, jobs=2).run(job)
+        self.assertIn(['a', 'b'], [sorted(o) for o in overlaps])
+        self.assertEqual(finished[-1], 'c')
+
+    def test_failure_stops_scheduling(self) -> None:
+        """
+        Test if no further job starts once a job fails and the error is raised.
+        """
+        started: List[str] = []
+
+        def job(name: str) -> None:
+            started.append(name)
+            if name == 'base':
+                raise RuntimeError('test_error')
+
+        with self.assertRaises(RuntimeError):
+            BuildScheduler({'base': [], 'app': ['base'], 'other': []}, jobs=1).run(job)
+        self.assertEqual(started, ['base'])
+
+    def test_cyclic_dependency_error(self) -> None:
+        """
+        Test if CyclicDependencyError is thrown if jobs depend on each other.
+        """
+        with self.assertRaises(CyclicDependencyError):
+            BuildScheduler({'a': ['b'], 'b': ['a']})
+
+    def test_resource_budget(self) -> None:
+        """
+        Test if jobs only start while their declared resource usage fits the budget.
+        """
+        lock = threading.Lock()
+        running: List[str] = []
+        overlaps: List[List[str]] = []
+
+        def job(name: str) -> None:
+            with lock:
+                running.append(name)
+                overlaps.append(sorted(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(name)
+
+        gib = 1024 ** 3
+        scheduler = BuildScheduler(
+            {'large': [], 'medium': [], 'small': [], 'unknown': []},
+            jobs=4,
+            weights={'large': 4.0, 'medium': 3.0, 'small': 2.0},
+            demands={
+                'large': Resources(memory=6 * gib),
+                'medium': Resources(memory=3 * gib),
+                'small': Resources(cpus=1, memory=gib)
+            },
+            budget=Resources(cpus=4, memory=8 * gib)
+        )
+        scheduler.run(job)
+        # 'medium' does not fit alongside 'large' and holds back the jobs with lower priority.
+        self.assertEqual([overlap for overlap in overlaps if 'large' in overlap], [['large']])
+        self.assertIn(['medium', 'small', 'unknown'], overlaps)
+
+    def test_oversized_job(self) -> None:
+        """
+        Test if a job that does not fit the budget at all runs alone.
+        """
+        scheduler = BuildScheduler(
+            {'huge': [], 'other': []},
+            jobs=2,
+            demands={'huge': Resources(cpus=16), 'other': Resources(cpus=1)},
+            budget=Resources(cpus=4)
+        )
+        self.assertTrue(scheduler.fits('huge', []))
+        self.assertFalse(scheduler.fits('other', ['huge']))
+        self.assertEqual(scheduler.schedule(), ['huge', 'other'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import tempfile
+import unittest
+from rigel.builds import add_dependents, ChangeDetector, select_packages
+from rigel.exceptions import GitRevisionError, UnknownROSPackagesError
+from rigel.models import DockerSection, DockerfileSection
+from subprocess import check_call
+from typing import List, Union
+
+RIGELFILE = """
+packages:
+  - package: base
+    image: base:latest
+    dockerfile: docker
+  - package: app
+    image: app:latest
+    distro: noetic
+    command: ''
+    dir: app
+    depends_on: [base]
+  - package: other
+    image: other:{{ tag }}
+    distro: noetic
+    command: ''
+vars:
+  tag: latest
+"""
+
+
+def git(*args: str) -> None:
+    check_call(['git', '-c', 'user.name=rigel', '-c', 'user.email=rigel@test', *args])
+
+
+class PackageSelectionTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.select_packages and rigel.builds.add_dependents functions.
+    """
+
+    def setUp(self) -> None:
+        self.packages: List[Union[DockerSection, DockerfileSection]] = [
+            DockerSection(package='robot_arm', image='arm', distro='noetic', command=''),
+            DockerSection(package='robot_base', image='base', distro='noetic', command='', depends_on=['robot_arm']),
+            DockerfileSection(package='tools', image='tools', dockerfile='tools', depends_on=['robot_base'])
+        ]
+
+    def test_select_all(self) -> None:
+        """
+        Test if all packages are selected when no pattern is given.
+        """
+        self.assertEqual(select_packages(self.packages, []), self.packages)
+
+    def test_select_patterns(self) -> None:
+        """
+        Test if packages are selected by name or by shell-style pattern, in order of declaration.
+        """
+        selected = select_packages(self.packages, ['tools', 'robot_*'])
+        self.assertEqual([p.package for p in selected], ['robot_arm', 'robot_base', 'tools'])
+
+    def test_unknown_pattern(self) -> None:
+        """
+        Test if UnknownROSPackagesError is thrown if a pattern matches no package.
+        """
+        with self.assertRaises(UnknownROSPackagesError) as context:
+            select_packages(self.packages, ['robot_*', 'drone_*'])
+        self.assertEqual(context.exception.kwargs['packages'], 'drone_*')
+
+    def test_add_dependents(self) -> None:
+        """
+        Test if dependents are added transitively.
+        """
+        self.assertEqual(add_dependents(self.packages, {'robot_arm'}), {'robot_arm', 'robot_base', 'tools'})
+        self.assertEqual(add_dependents(self.packages, {'tools'}), {'tools'})
+
+
+class ChangeDetectorTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.ChangeDetector class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        self.root = os.path.realpath(self.tmp.name)
+        os.chdir(self.root)
+
+        git('init', '--quiet', '-b', 'main', self.root)
+        self.write('Rigelfile', RIGELFILE)
+        self.write('docker/Dockerfile', 'FROM ubuntu')
+        self.write('app/src/main.cpp', 'int main() {}')
+        self.write('.rigel_config/other/Dockerfile', 'FROM ubuntu')
+        git('add', '.')
+        git('commit', '--quiet', '-m', 'initial')
+
+        self.packages: List[Union[DockerSection, DockerfileSection]] = [
+            DockerfileSection(package='base', image='base:latest', dockerfile='docker'),
+            DockerSection(package='app', image='app:latest', distro='noetic', command='', dir='app', depends_on=['base']),
+            DockerSection(package='other', image='other:latest', distro='noetic', command='')
+        ]
+        self.detector = ChangeDetector('HEAD')
+
+    def write(self, path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(os.path.join(self.root, path)), exist_ok=True)
+        with open(os.path.join(self.root, path), 'w') as f:
+            f.write(content)
+
+    def affected(self) -> List[str]:
+        return [package.package for package in self.detector.affected_packages(self.packages)]
+
+    def test_no_changes(self) -> None:
+        """
+        Test if no package is affected when nothing changed.
+        """
+        self.assertEqual(self.affected(), [])
+
+    def test_changed_context(self) -> None:
+        """
+        Test if changes inside a package folder (including untracked files) affect that package only.
+        """
+        self.write('app/src/new.cpp', 'void f() {}')
+        self.assertEqual(self.detector.changed_files(), [os.path.join(self.root, 'app/src/new.cpp')])
+        self.assertEqual(self.affected(), ['app'])
+
+    def test_changed_dependency(self) -> None:
+        """
+        Test if changes to a package also affect its dependents.
+        """
+        self.write('docker/Dockerfile', 'FROM debian')
+        self.assertEqual(self.affected(), ['base', 'app'])
+
+    def test_changed_declaration(self) -> None:
+        """
+        Test if only packages whose declaration changed inside the Rigelfile are affected.
+        """
+        self.write('Rigelfile', RIGELFILE.replace('tag: latest', 'tag: devel'))
+        self.assertEqual(self.affected(), ['other'])
+
+    def test_changed_fragments(self) -> None:
+        """
+        Test if packages declared in Rigelfile fragments are affected when their declaration changes
+        or when their fragment is newly included.
+        """
+        fragment = "packages:\n  - {package: arm, image: arm, dockerfile: .}\n  - {package: leg, image: leg, dockerfile: .}\n"
+        self.write('Rigelfile', RIGELFILE + 'include: [fragments/robots.yml]\n')
+        self.write('fragments/robots.yml', fragment)
+        self.write('fragments/tools.yml', 'packages:\n  - {package: tools, image: tools, dockerfile: .}\n')
+        self.write('.gitignore', '.rigel_config/fragments.json\n')
+        git('add', '.')
+        git('commit', '--quiet', '-m', 'fragments')
+        self.packages.extend(
+            DockerfileSection(package=name, image=name, dockerfile=f'images/{name}') for name in ['arm', 'leg', 'tools']
+        )
+        self.assertEqual(self.affected(), [])
+
+        self.write('fragments/robots.yml', fragment.replace('image: leg', 'image: leg:devel'))
+        self.assertEqual(self.affected(), ['leg'])
+
+        self.write('Rigelfile', RIGELFILE + 'include: [fragments/*.yml]\n')
+        self.assertEqual(self.affected(), ['leg', 'tools'])
+
+    def test_new_rigelfile(self) -> None:
+        """
+        Test if all packages are affected if the Rigelfile did not exist at the git revision.
+        """
+        self.write('README', 'readme')
+        git('add', 'README')
+        git('commit', '--quiet', '-m', 'readme')
+        git('rm', '--quiet', '--cached', 'Rigelfile')
+        git('commit', '--quiet', '-m', 'untrack')
+        self.assertEqual(self.affected(), ['base', 'app', 'other'])
+
+    def test_invalid_revision(self) -> None:
+        """
+        Test if GitRevisionError is thrown for unknown git revisions.
+        """
+        detector = ChangeDetector('unknown-revision')
+        with self.assertRaises(GitRevisionError) as context:
+            detector.changed_files()
+        self.assertEqual(context.exception.kwargs['revision'], 'unknown-revision')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from rigel.builds import DockerSession
+from rigel.models.docker import Registry
+from rigelcore.exceptions import DockerAPIError
+from unittest.mock import Mock, patch
+
+
+class DockerSessionTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.DockerSession class.
+    """
+
+    registry = Registry(server='test_server', username='test_user', password='test_password')
+
+    @patch('rigel.builds.session.DockerClient')
+    def test_shared_client(self, client_mock: Mock) -> None:
+        """
+        Test if a single Docker client is created and shared.
+        """
+        session = DockerSession()
+        self.assertIs(session.client, session.client)
+        client_mock.assert_called_once_with()
+
+    def test_login_cache(self) -> None:
+        """
+        Test if each (server, username) pair is authenticated only once.
+        """
+        client = Mock()
+        session = DockerSession(client)
+        self.assertTrue(session.login(self.registry))
+        self.assertFalse(session.login(self.registry))
+        self.assertTrue(session.login(Registry(server='test_server', username='other_user', password='test_password')))
+        self.assertEqual(client.login.call_count, 2)
+        client.login.assert_any_call('test_server', 'test_user', 'test_password')
+
+    def test_concurrent_login(self) -> None:
+        """
+        Test if concurrent authentications with the same registry result in a single login.
+        """
+        client = Mock()
+        session = DockerSession(client)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: session.login(self.registry), range(16)))
+        self.assertEqual(results.count(True), 1)
+        client.login.assert_called_once()
+
+    def test_failed_login_not_cached(self) -> None:
+        """
+        Test if failed authentications are retried.
+        """
+        client = Mock()
+        client.login.side_effect = [DockerAPIError(exception='test'), None]
+        session = DockerSession(client)
+        with self.assertRaises(DockerAPIError):
+            session.login(self.registry)
+        self.assertTrue(session.login(self.registry))
+
+    def test_reset(self) -> None:
+        """
+        Test if authentications are forgotten after a reset.
+        """
+        client = Mock()
+        session = DockerSession(client)
+        session.login(self.registry)
+        session.reset()
+        self.assertTrue(session.login(self.registry))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from rigel.builds import parse_shard, shard_packages
+from rigel.exceptions import InvalidShardError
+from rigel.models import DockerfileSection, PackageSection
+from typing import List
+
+
+class ShardingTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.parse_shard and rigel.builds.shard_packages functions.
+    """
+
+    def setUp(self) -> None:
+        self.packages: List[PackageSection] = [
+            DockerfileSection(package=f'package_{i}', image=f'image_{i}', dockerfile='.') for i in range(10)
+        ]
+
+    def shards(self, count: int, **kwargs: float) -> List[List[str]]:
+        durations = dict(kwargs) or None
+        return [
+            [p.package for p in shard_packages(self.packages, index, count, durations)]
+            for index in range(1, count + 1)
+        ]
+
+    def test_parse_shard(self) -> None:
+        """
+        Test if valid shard declarations are parsed.
+        """
+        self.assertEqual(parse_shard('1/1'), (1, 1))
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+
+    def test_parse_invalid_shard(self) -> None:
+        """
+        Test if InvalidShardError is thrown for invalid shard declarations.
+        """
+        for declaration in ['0/2', '3/2', '1', 'a/b', '1/0']:
+            with self.assertRaises(InvalidShardError):
+                parse_shard(declaration)
+
+    def test_hash_partition(self) -> None:
+        """
+        Test if hash-based shards are deterministic and form a partition of all packages in order of declaration.
+        """
+        shards = self.shards(3)
+        self.assertEqual(shards, self.shards(3))
+        names = [p.package for p in self.packages]
+        self.assertEqual(sorted(name for shard in shards for name in shard), sorted(names))
+        for shard in shards:
+            self.assertEqual(shard, [name for name in names if name in shard])
+
+    def test_hash_independent_of_order(self) -> None:
+        """
+        Test if hash-based shards do not depend on the order of declaration.
+        """
+        shards = self.shards(3)
+        self.packages.reverse()
+        self.assertEqual([sorted(s) for s in self.shards(3)], [sorted(s) for s in shards])
+
+    def test_duration_partition(self) -> None:
+        """
+        Test if shards are balanced by build duration when the durations of all packages are known.
+        """
+        self.packages = self.packages[:5]
+        shards = self.shards(2, package_0=10.0, package_1=6.0, package_2=5.0, package_3=4.0, package_4=5.5)
+        self.assertEqual(shards, [['package_0', 'package_2'], ['package_1', 'package_3', 'package_4']])
+
+    def test_partial_durations(self) -> None:
+        """
+        Test if shards are assigned by hash unless the durations of all packages are known,
+        so that runners with a different build history compute the same partition.
+        """
+        self.assertEqual(self.shards(3, package_0=10.0), self.shards(3))
+        self.assertEqual(self.shards(3, package_1=3.0, package_2=2.0), self.shards(3))
+
+    def test_dependencies_included(self) -> None:
+        """
+        Test if every shard holds the packages its packages are built upon.
+        """
+        self.packages[3].depends_on = ['package_0']
+        self.packages[7].depends_on = ['package_3', 'unknown']
+        self.packages[9].depends_on = ['package_5']
+        ancestors = {'package_3': {'package_0'}, 'package_7': {'package_0', 'package_3'}, 'package_9': {'package_5'}}
+        for durations in [{}, {p.package: float(i) for i, p in enumerate(self.packages)}]:
+            shards = self.shards(4, **durations)
+            self.assertEqual({name for shard in shards for name in shard}, {p.package for p in self.packages})
+            for shard in shards:
+                for name, required in ancestors.items():
+                    if name in shard:
+                        self.assertLessEqual(required, set(shard))
+
+    def test_shared_base(self) -> None:
+        """
+        Test if the dependents of a common base package are balanced across shards, which all build the base package.
+        """
+        for package in self.packages[1:]:
+            package.depends_on = ['package_0']
+        durations = {p.package: 10.0 for p in self.packages[1:]}
+        durations['package_0'] = 2.0
+        shards = self.shards(3, **durations)
+        self.assertEqual([len(shard) for shard in shards], [4, 4, 4])  # 3 dependents and the base package
+        self.assertTrue(all(shard[0] == 'package_0' for shard in shards))
+        self.assertEqual({name for shard in shards for name in shard}, {p.package for p in self.packages})
+
+        self.assertGreater(len([shard for shard in self.shards(3) if len(shard) > 1]), 1)  # by hash
+
+    def test_single_shard(self) -> None:
+        """
+        Test if a single shard holds all packages.
+        """
+        self.assertEqual(self.shards(1), [[p.package for p in self.packages]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+import unittest
+from rigel.builds import TimingDatabase
+
+
+class TimingDatabaseTesting(unittest.TestCase):
+    """
+    Test suite for rigel.builds.TimingDatabase class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.database = TimingDatabase(os.path.join(self.tmp.name, 'config', 'timings.db'), window=3)
+
+    def test_empty_database(self) -> None:
+        """
+        Test if an inexistent database is not created when read.
+        """
+        self.assertEqual(self.database.history(), [])
+        self.assertEqual(self.database.expected_durations(), {})
+        self.assertFalse(self.database.exists())
+
+    def test_record_and_history(self) -> None:
+        """
+        Test if builds are retrieved latest first and limited per package.
+        """
+        self.database.record('a', [], 10.0, started_at=1.0)
+        self.database.record('a', ['linux/amd64', 'linux/arm64'], 12.0, cache_hit=True, started_at=3.0)
+        self.database.record('b', [], 5.0, cache_hit=False, success=False, started_at=2.0)
+        self.assertTrue(self.database.exists())
+
+        history = self.database.history()
+        self.assertEqual(
+            sorted((r.package, r.platform, r.started_at) for r in history),
+            [('a', '', 1.0), ('a', 'linux/amd64', 3.0), ('a', 'linux/arm64', 3.0), ('b', '', 2.0)]
+        )
+        self.assertTrue(history[0].cache_hit)
+        self.assertFalse(history[2].success)
+        self.assertIsNone(history[3].cache_hit)
+
+        self.database.record('a', [], 11.0, started_at=4.0)
+        self.assertEqual(
+            sorted((r.platform, r.started_at) for r in self.database.history('a', limit=1)),
+            [('', 4.0), ('linux/amd64', 3.0), ('linux/arm64', 3.0)]
+        )
+
+    def test_expected_durations(self) -> None:
+        """
+        Test if expected durations are the median of the latest successful builds.
+        """
+        for started_at, duration in enumerate([100.0, 1.0, 2.0, 3.0]):
+            self.database.record('a', [], duration, started_at=float(started_at))
+        self.database.record('a', [], 50.0, success=False, started_at=10.0)
+        self.database.record('b', [], 7.0, success=False)
+        self.assertEqual(self.database.expected_durations(), {'a': 2.0})
+
+    def test_expected_platform_durations(self) -> None:
+        """
+        Test if durations are estimated per platform and the longest platform is expected for the package.
+        """
+        self.database.record('a', ['linux/amd64'], 10.0, started_at=1.0)
+        self.database.record('a', ['linux/arm64'], 30.0, started_at=1.0)
+        self.database.record('a', ['linux/arm64'], 20.0, started_at=2.0)
+        self.database.record('b', ['linux/amd64', 'linux/arm64'], 5.0, started_at=1.0)
+        self.assertEqual(self.database.expected_platform_durations(), {
+            ('a', 'linux/amd64'): 10.0,
+            ('a', 'linux/arm64'): 25.0,
+            ('b', 'linux/amd64'): 5.0,
+            ('b', 'linux/arm64'): 5.0
+        })
+        self.assertEqual(self.database.expected_durations(), {'a': 25.0, 'b': 5.0})
+
+    def test_concurrent_records(self) -> None:
+        """
+        Test if builds can be recorded from several threads.
+        """
+        threads = [threading.Thread(target=self.database.record, args=(f'p{i}', [], 1.0)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.database.history()), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
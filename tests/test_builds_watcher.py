@@ -0,0 +1,88 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from rigel.builds import create_watcher, FileWatcher, InotifyWatcher, PollingWatcher
+from typing import Iterator
+
+
+class FileWatcherTesting(unittest.TestCase):
+    """
+    Test suite for the watchers at rigel.builds.watcher.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.realpath(self.tmp.name)
+        self.src = os.path.join(self.root, 'src')
+        os.makedirs(self.src)
+        self.rigelfile = os.path.join(self.root, 'Rigelfile')
+
+    def write(self, *parts: str) -> str:
+        path = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(str(time.time()))
+        return path
+
+    def watchers(self) -> Iterator[FileWatcher]:
+        yield PollingWatcher([self.src, self.rigelfile], 0.05)
+        try:
+            yield InotifyWatcher([self.src, self.rigelfile])
+        except OSError:
+            pass  # inotify is not available
+
+    def test_changes(self) -> None:
+        """
+        Test if changes to watched files and inside watched folders are detected.
+        """
+        for watcher in self.watchers():
+            self.addCleanup(watcher.close)
+            with self.subTest(watcher=type(watcher).__name__):
+                self.assertEqual(watcher.changes(0.1), set())
+
+                rigelfile = self.write('Rigelfile')
+                source = self.write('src', 'nested', 'main.cpp')
+                self.write('other')
+                self.write('src', '.rigel_config', 'Dockerfile')
+
+                changed = watcher.wait(0.2, 2)
+                self.assertIn(rigelfile, changed)
+                self.assertIn(source, changed)
+                self.assertFalse(any('.rigel_config' in path or path.endswith('other') for path in changed))
+
+                # Files inside new folders are watched as well.
+                source = self.write('src', 'nested', 'main.cpp')
+                self.assertIn(source, watcher.wait(0.2, 2))
+
+    def test_debounce(self) -> None:
+        """
+        Test if a burst of changes is reported at once.
+        """
+        for watcher in self.watchers():
+            self.addCleanup(watcher.close)
+            with self.subTest(watcher=type(watcher).__name__):
+                def burst() -> None:
+                    for index in range(5):
+                        self.write('src', f'file_{index}')
+                        time.sleep(0.05)
+
+                thread = threading.Thread(target=burst)
+                thread.start()
+                changed = watcher.wait(0.3, 2)
+                thread.join()
+                self.assertTrue(all(os.path.join(self.src, f'file_{index}') in changed for index in range(5)))
+
+    def test_polling(self) -> None:
+        """
+        Test if watchers compare the state of files periodically when requested.
+        """
+        watcher = create_watcher([self.src], polling=True, interval=0.05)
+        self.addCleanup(watcher.close)
+        self.assertIsInstance(watcher, PollingWatcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from rigel.client import forward
+from rigel.daemon import RigelDaemon
+from rigel.exceptions import DaemonAlreadyRunningError
+from typing import List, Optional, Tuple
+from unittest.mock import patch
+
+
+class RigelDaemonTesting(unittest.TestCase):
+    """
+    Test suite for rigel.daemon.RigelDaemon class and the thin client at rigel.client.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'rigel.sock')
+        self.commands: List[List[str]] = []
+        self.environments: List[Tuple[Optional[str], str]] = []
+
+    def handler(self, args: List[str]) -> int:
+        self.commands.append(args)
+        self.environments.append((os.environ.get('RIGEL_TEST_KEY'), os.getcwd()))
+        print(f"running {' '.join(args)}")
+        if args[-1] == 'fail':
+            raise RuntimeError('test')
+        return 3
+
+    def start(self) -> RigelDaemon:
+        daemon = RigelDaemon(self.handler, self.path)
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        self.addCleanup(daemon.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(daemon.shutdown)
+        return daemon
+
+    def test_forward(self) -> None:
+        """
+        Test if commands are run by the daemon and their output and exit code are forwarded.
+        """
+        self.start()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        self.assertEqual(forward(['build', '--pkg', 'app'], self.path, stdout, stderr), 3)
+        self.assertEqual(self.commands, [['build', '--pkg', 'app']])
+        self.assertEqual(stdout.getvalue(), 'running build --pkg app\n')
+
+        self.assertEqual(forward(['build', 'fail'], self.path, stdout, stderr), 1)
+        self.assertIn('RuntimeError', stderr.getvalue())
+
+    def test_not_forwarded(self) -> None:
+        """
+        Test if commands are not forwarded when no daemon is running or when they are interactive.
+        """
+        self.assertIsNone(forward(['build'], self.path))
+        self.start()
+        self.assertIsNone(forward(['deploy'], self.path))
+        self.assertIsNone(forward([], self.path))
+        self.assertEqual(self.commands, [])
+
+    def test_client_environment(self) -> None:
+        """
+        Test if commands run with the environment variables and working directory of the client
+        and if those of the daemon are restored afterwards.
+        """
+        self.start()
+        cwd = os.getcwd()
+        folder = os.path.realpath(self.tmp.name)
+        with patch.dict(os.environ, {'RIGEL_TEST_KEY': 'client'}):
+            os.chdir(folder)
+            try:
+                self.assertEqual(forward(['build'], self.path, io.StringIO()), 3)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(self.environments, [('client', folder)])
+        self.assertNotIn('RIGEL_TEST_KEY', os.environ)
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_watch_refused(self) -> None:
+        """
+        Test if commands that never finish are neither forwarded nor run by the daemon.
+        """
+        daemon = self.start()
+        self.assertIsNone(forward(['build', '--watch'], self.path))
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as unconnected:
+            self.assertEqual(daemon.run_command(unconnected, ['build', '--watch']), 2)
+        self.assertEqual(self.commands, [])
+
+    def test_daemon_already_running_error(self) -> None:
+        """
+        Test if DaemonAlreadyRunningError is thrown if a daemon is already serving at the same socket.
+        """
+        self.start()
+        with self.assertRaises(DaemonAlreadyRunningError) as context:
+            RigelDaemon(self.handler, self.path)
+        self.assertEqual(context.exception.kwargs['path'], self.path)
+
+    def test_stale_socket(self) -> None:
+        """
+        Test if sockets left behind by daemons that did not exit gracefully are replaced.
+        """
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.assertIsNone(forward(['build'], self.path))
+
+        self.start()
+        self.assertEqual(forward(['build'], self.path, io.StringIO()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
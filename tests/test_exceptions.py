@@ -1,17 +1,31 @@
 import unittest
 from rigel.exceptions import (
+    CyclicDependencyError,
+    DaemonAlreadyRunningError,
     EmptyRigelfileError,
+    GitRevisionError,
     IncompleteRigelfileError,
+    InvalidBuilderEndpointError,
+    InvalidDurationsFileError,
+    InvalidLockfileError,
+    InvalidMemorySizeError,
     InvalidPluginNameError,
+    InvalidRigelfileFragmentError,
+    InvalidRosinstallFileError,
+    InvalidShardError,
     PluginInstallationError,
     PluginNotCompliantError,
     PluginNotFoundError,
+    PreflightError,
+    RepositoryFetchError,
     RigelfileAlreadyExistsError,
     RigelfileNotFoundError,
     UnformattedRigelfileError,
+    UnknownDependencyError,
     UnknownROSPackagesError,
     UnsupportedCompilerError,
-    UnsupportedPlatformError
+    UnsupportedPlatformError,
+    UnsupportedRepositoryError
 )
 
 
@@ -124,6 +138,133 @@ class ExceptionTesting(unittest.TestCase):
         self.assertEqual(err.code, 21)
         self.assertEqual(err.kwargs['packages'], test_packages)
 
+    def test_invalid_rosinstall_file_error(self) -> None:
+        """
+        Ensure that instances of InvalidRosinstallFileError are thrown as expected.
+        """
+        test_file = 'test.rosinstall'
+        test_cause = 'test_cause'
+        err = InvalidRosinstallFileError(file=test_file, cause=test_cause)
+        self.assertEqual(err.code, 22)
+        self.assertEqual(err.kwargs['file'], test_file)
+        self.assertEqual(err.kwargs['cause'], test_cause)
+
+    def test_repository_fetch_error(self) -> None:
+        """
+        Ensure that instances of RepositoryFetchError are thrown as expected.
+        """
+        test_repository = 'file:///test_repository'
+        test_cause = 'test_cause'
+        err = RepositoryFetchError(repository=test_repository, cause=test_cause)
+        self.assertEqual(err.code, 23)
+        self.assertEqual(err.kwargs['repository'], test_repository)
+        self.assertEqual(err.kwargs['cause'], test_cause)
+
+    def test_invalid_builder_endpoint_error(self) -> None:
+        """
+        Ensure that instances of InvalidBuilderEndpointError are thrown as expected.
+        """
+        test_endpoint = 'test_endpoint'
+        err = InvalidBuilderEndpointError(endpoint=test_endpoint)
+        self.assertEqual(err.code, 24)
+        self.assertEqual(err.kwargs['endpoint'], test_endpoint)
+
+    def test_unknown_dependency_error(self) -> None:
+        """
+        Ensure that instances of UnknownDependencyError are thrown as expected.
+        """
+        err = UnknownDependencyError(package='test_package', dependency='test_dependency')
+        self.assertEqual(err.code, 25)
+        self.assertEqual(err.kwargs['package'], 'test_package')
+        self.assertEqual(err.kwargs['dependency'], 'test_dependency')
+
+    def test_cyclic_dependency_error(self) -> None:
+        """
+        Ensure that instances of CyclicDependencyError are thrown as expected.
+        """
+        test_cycle = 'a -> b -> a'
+        err = CyclicDependencyError(cycle=test_cycle)
+        self.assertEqual(err.code, 26)
+        self.assertEqual(err.kwargs['cycle'], test_cycle)
+
+    def test_git_revision_error(self) -> None:
+        """
+        Ensure that instances of GitRevisionError are thrown as expected.
+        """
+        err = GitRevisionError(revision='test_revision', cause='test_cause')
+        self.assertEqual(err.code, 27)
+        self.assertEqual(err.kwargs['revision'], 'test_revision')
+        self.assertEqual(err.kwargs['cause'], 'test_cause')
+
+    def test_invalid_shard_error(self) -> None:
+        """
+        Ensure that instances of InvalidShardError are thrown as expected.
+        """
+        err = InvalidShardError(shard='0/2')
+        self.assertEqual(err.code, 28)
+        self.assertEqual(err.kwargs['shard'], '0/2')
+
+    def test_invalid_rigelfile_fragment_error(self) -> None:
+        """
+        Ensure that instances of InvalidRigelfileFragmentError are thrown as expected.
+        """
+        err = InvalidRigelfileFragmentError(fragment='test_fragment', cause='test_cause')
+        self.assertEqual(err.code, 29)
+        self.assertEqual(err.kwargs['fragment'], 'test_fragment')
+        self.assertEqual(err.kwargs['cause'], 'test_cause')
+
+    def test_daemon_already_running_error(self) -> None:
+        """
+        Ensure that instances of DaemonAlreadyRunningError are thrown as expected.
+        """
+        err = DaemonAlreadyRunningError(path='test_path')
+        self.assertEqual(err.code, 30)
+        self.assertEqual(err.kwargs['path'], 'test_path')
+
+    def test_invalid_memory_size_error(self) -> None:
+        """
+        Ensure that instances of InvalidMemorySizeError are thrown as expected.
+        """
+        err = InvalidMemorySizeError(size='test_size')
+        self.assertEqual(err.code, 31)
+        self.assertEqual(err.kwargs['size'], 'test_size')
+
+    def test_preflight_error(self) -> None:
+        """
+        Ensure that instances of PreflightError are thrown as expected.
+        """
+        err = PreflightError(report='test_report')
+        self.assertEqual(err.code, 32)
+        self.assertEqual(err.kwargs['report'], 'test_report')
+
+    def test_invalid_lockfile_error(self) -> None:
+        """
+        Ensure that instances of InvalidLockfileError are thrown as expected.
+        """
+        err = InvalidLockfileError(path='test_path', cause='test_cause')
+        self.assertEqual(err.code, 33)
+        self.assertEqual(err.kwargs['path'], 'test_path')
+        self.assertEqual(err.kwargs['cause'], 'test_cause')
+
+    def test_unsupported_repository_error(self) -> None:
+        """
+        Ensure that instances of UnsupportedRepositoryError are thrown as expected.
+        """
+        err = UnsupportedRepositoryError(file='test_file', repository='test_repository', vcs='hg')
+        self.assertEqual(err.code, 34)
+        self.assertEqual(err.kwargs['file'], 'test_file')
+        self.assertEqual(err.kwargs['repository'], 'test_repository')
+        self.assertEqual(err.kwargs['vcs'], 'hg')
+
+    def test_invalid_durations_file_error(self) -> None:
+        """
+        Ensure that instances of InvalidDurationsFileError are thrown as expected.
+        """
+        err = InvalidDurationsFileError(path='test_path', cause='test_cause')
+        self.assertEqual(err.code, 35)
+        self.assertEqual(err.kwargs['path'], 'test_path')
+        self.assertEqual(err.kwargs['cause'], 'test_cause')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from rigel.builds import ssh_key_path
+from rigel.exceptions import InvalidRigelfileFragmentError
+from rigel.files import RigelfileComposer
+from rigel.models import DockerSection
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+RIGELFILE = """
+include:
+  - src/*/rigel.yaml
+vars:
+  tag: latest
+packages:
+  - package: main
+    image: main
+    dockerfile: .
+    depends_on: [base]
+"""
+
+BASE = """
+packages:
+  - package: base
+    image: base:{{ tag }}
+    dockerfile: docker
+"""
+
+ROBOT = """
+packages:
+  - package: robot
+    image: robot
+    distro: noetic
+    command: ''
+    dir: .
+    depends_on: [base]
+    ssh:
+      - hostname: github.com
+        value: keys/id_rsa
+        file: true
+  - package: tools
+    image: tools
+    dockerfile: /opt/tools
+"""
+
+
+class RigelfileComposerTesting(unittest.TestCase):
+    """
+    Test suite for rigel.files.RigelfileComposer class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        self.write('Rigelfile', RIGELFILE)
+        self.write('src/base/rigel.yaml', BASE)
+        self.write('src/robot/rigel.yaml', ROBOT)
+        self.composer = RigelfileComposer(os.path.join(self.root, 'Rigelfile'))
+
+    def write(self, path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(os.path.join(self.root, path)), exist_ok=True)
+        with open(os.path.join(self.root, path), 'w') as f:
+            f.write(content)
+
+    def names(self, data: Dict[str, Any]) -> List[str]:
+        return [declaration['package'] for declaration in data['packages']]
+
+    def test_load_all(self) -> None:
+        """
+        Test if all fragment packages are appended to the inline packages with rebased paths.
+        """
+        data = self.composer.load()
+        self.assertEqual(self.names(data), ['main', 'base', 'robot', 'tools'])
+        self.assertEqual(data['packages'][1]['image'], 'base:{{ tag }}')  # not decoded
+        self.assertEqual(data['packages'][1]['dockerfile'], os.path.join('src', 'base', 'docker'))
+        self.assertEqual(data['packages'][2]['dir'], os.path.join('src', 'robot'))
+        self.assertEqual(data['packages'][2]['ssh'][0]['value'], os.path.join('keys', 'id_rsa'))  # relative to 'dir'
+        self.assertEqual(data['packages'][3]['dockerfile'], '/opt/tools')
+
+    def test_ssh_key_path(self) -> None:
+        """
+        Test if SSH key files declared inside a fragment resolve inside the package folder, where builds copy them from.
+        """
+        declaration = self.composer.load(['robot'])['packages'][2]
+        package = DockerSection(**declaration)
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        self.assertEqual(
+            ssh_key_path(package, package.ssh[0]),
+            os.path.join(os.path.abspath(self.root), 'src', 'robot', 'keys', 'id_rsa')
+        )
+
+    def test_load_selection(self) -> None:
+        """
+        Test if only desired fragment packages and their dependencies are loaded.
+        """
+        self.assertEqual(self.names(self.composer.load(['too*'])), ['main', 'base', 'tools'])
+        self.assertEqual(self.names(self.composer.load(['robot'])), ['main', 'base', 'robot'])
+
+    def test_without_include(self) -> None:
+        """
+        Test if Rigelfiles without includes are loaded unchanged.
+        """
+        self.write('Rigelfile', BASE)
+        self.assertEqual(self.names(self.composer.load(['unknown'])), ['base'])
+        self.assertFalse(os.path.exists(self.composer.index_path))
+
+    def test_index_cache(self) -> None:
+        """
+        Test if unchanged fragments are only read when their packages are required.
+        """
+        self.write('src/extra/rigel.yaml', BASE.replace('package: base', 'package: extra'))
+        self.composer.load()
+        self.assertTrue(os.path.isfile(self.composer.index_path))
+
+        with patch.object(self.composer, 'read_fragment', wraps=self.composer.read_fragment) as read_mock:
+            self.composer.load(['tools'])
+        read = sorted(os.path.relpath(c.args[0], self.root) for c in read_mock.call_args_list)
+        self.assertEqual(read, [os.path.join('src', 'base', 'rigel.yaml'), os.path.join('src', 'robot', 'rigel.yaml')])
+
+        self.write('src/base/rigel.yaml', BASE.replace('package: base', 'package: new_base') + '\n')
+        index = self.composer.index(self.composer.fragments(['src/*/rigel.yaml']))
+        self.assertEqual(index[os.path.join(self.root, 'src', 'base', 'rigel.yaml')], {'new_base': []})
+
+    def test_duplicate_package(self) -> None:
+        """
+        Test if InvalidRigelfileFragmentError is thrown if a package is declared more than once.
+        """
+        self.write('src/other/rigel.yaml', BASE)
+        with self.assertRaises(InvalidRigelfileFragmentError):
+            self.composer.load()
+
+    def test_invalid_fragment(self) -> None:
+        """
+        Test if InvalidRigelfileFragmentError is thrown for fragments without package declarations.
+        """
+        self.write('src/other/rigel.yaml', 'vars: {}')
+        with self.assertRaises(InvalidRigelfileFragmentError) as context:
+            self.composer.load()
+        self.assertEqual(context.exception.kwargs['fragment'], os.path.join(self.root, 'src', 'other', 'rigel.yaml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
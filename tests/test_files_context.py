@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from rigel.files import BuildContext
+
+
+class BuildContextTesting(unittest.TestCase):
+    """
+    Test suite for rigel.files.BuildContext class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for path, size in [
+            ('package.xml', 10),
+            ('src/node.cpp', 20),
+            ('build/CMakeCache.txt', 300),
+            ('devel/setup.bash', 40),
+            ('data/run.bag', 5000),
+            ('data/keep.yaml', 5),
+            ('nested/deep/run.bag', 700),
+        ]:
+            os.makedirs(os.path.dirname(os.path.join(self.root, path)) or self.root, exist_ok=True)
+            with open(os.path.join(self.root, path), 'wb') as f:
+                f.write(b'x' * size)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_no_patterns(self) -> None:
+        """
+        Test if all files are part of the build context when no pattern is declared.
+        """
+        total, count, _ = BuildContext(self.root, []).size()
+        self.assertEqual(count, 7)
+        self.assertEqual(total, 6075)
+
+    def test_pattern_semantics(self) -> None:
+        """
+        Test if folder exclusion, '**' wildcards and exceptions follow the .dockerignore semantics.
+        """
+        context = BuildContext(self.root, ['# comment', 'build', '/devel', '**/*.bag', 'data', '!data/keep.yaml'])
+        files = dict(context.files())
+        self.assertEqual(sorted(files), ['data/keep.yaml', 'package.xml', 'src/node.cpp'])
+        self.assertTrue(context.is_excluded('build/a/b/c'))
+        self.assertTrue(context.is_excluded('run.bag'))
+        self.assertFalse(context.is_excluded('src/build.cpp'))
+
+    def test_size_per_entry(self) -> None:
+        """
+        Test if the size of the build context is aggregated by top-level entry.
+        """
+        total, count, entries = BuildContext(self.root, ['data', 'nested']).size()
+        self.assertEqual(count, 4)
+        self.assertEqual(total, 370)
+        self.assertEqual(entries, {'package.xml': 10, 'src': 20, 'build': 300, 'devel': 40})
+
+    def test_from_dockerignore(self) -> None:
+        """
+        Test if exclusion patterns are read from .dockerignore files.
+        """
+        dockerignore = os.path.join(self.root, 'custom.dockerignore')
+        with open(dockerignore, 'w') as f:
+            f.write('build\ndevel\ndata\nnested\ncustom.dockerignore\n')
+        self.assertEqual(BuildContext.from_dockerignore(self.root, dockerignore).size()[0], 30)
+        self.assertEqual(BuildContext.from_dockerignore(self.root).size()[1], 8)  # no .dockerignore file
+
+
+if __name__ == '__main__':
+    unittest.main()
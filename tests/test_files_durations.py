@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from rigel.exceptions import InvalidDurationsFileError
+from rigel.files import load_durations, write_durations
+
+
+class DurationsTesting(unittest.TestCase):
+    """
+    Test suite for rigel.files.load_durations and rigel.files.write_durations functions.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'Rigelfile.durations')
+
+    def test_round_trip(self) -> None:
+        """
+        Test if written durations are loaded unchanged.
+        """
+        write_durations({'b': 12.5, 'a': 3.0}, self.path)
+        self.assertEqual(load_durations(self.path), {'a': 3.0, 'b': 12.5})
+        with open(self.path) as durations_file:
+            self.assertTrue(durations_file.readline().startswith('# This file was generated by Rigel'))
+
+    def test_missing(self) -> None:
+        """
+        Test if no durations are known without a durations file.
+        """
+        self.assertEqual(load_durations(self.path), {})
+
+    def test_invalid(self) -> None:
+        """
+        Test if invalid durations files are reported.
+        """
+        for content in ['a: [', '- a', 'a: fast']:
+            with open(self.path, 'w') as durations_file:
+                durations_file.write(content)
+            with self.subTest(content=content), self.assertRaises(InvalidDurationsFileError):
+                load_durations(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
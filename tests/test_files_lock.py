@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from rigel.exceptions import InvalidLockfileError
+from rigel.files import load_lockfile, write_lockfile
+from rigel.models import LockedPackage, LockedRepository, Lockfile
+
+
+class LockfileTesting(unittest.TestCase):
+    """
+    Test suite for rigel.files.load_lockfile and rigel.files.write_lockfile functions.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'Rigelfile.lock')
+
+    def test_round_trip(self) -> None:
+        """
+        Test if written lockfiles are loaded unchanged.
+        """
+        lockfile = Lockfile(packages={'app': LockedPackage(
+            images={'ros:noetic': 'ros:noetic@sha256:abc'},
+            repositories=[LockedRepository(name='lib', url='https://host/lib.git', version='main', commit='a' * 40)]
+        )})
+        write_lockfile(lockfile, self.path)
+        self.assertEqual(load_lockfile(self.path), lockfile)
+        with open(self.path) as lockfile_file:
+            self.assertTrue(lockfile_file.readline().startswith('# This file was generated by Rigel'))
+
+    def test_missing(self) -> None:
+        """
+        Test if nothing is pinned without a lockfile.
+        """
+        self.assertEqual(load_lockfile(self.path), Lockfile())
+
+    def test_invalid(self) -> None:
+        """
+        Test if invalid lockfiles are reported.
+        """
+        for content in ['packages: [', 'packages:\n  app:\n    repositories:\n      - name: lib\n', '- item']:
+            with open(self.path, 'w') as lockfile_file:
+                lockfile_file.write(content)
+            with self.subTest(content=content), self.assertRaises(InvalidLockfileError):
+                load_lockfile(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
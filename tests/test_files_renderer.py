@@ -1,6 +1,6 @@
 import unittest
 from rigel.files import Renderer
-from rigel.models import DockerSection
+from rigel.models import DockerSection, LockedPackage, LockedRepository
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
 
@@ -50,3 +50,20 @@ class RendererTesting(unittest.TestCase):
         open_mock.assert_called_once_with(output_file, 'w+')
         template_instance.render.assert_called_once_with(configuration=test_configuration.dict())
         open_mock.return_value.__enter__().write.assert_called_once_with(template_data)
+
+    @patch('rigel.files.renderer.open', new_callable=mock_open())
+    def test_renderer_lock(self, open_mock: Mock) -> None:
+        """
+        Test if pinned base images and repositories are used when rendering Dockerfiles.
+        """
+        configuration = DockerSection(**self.configuration_data, rosinstall=['deps.rosinstall'])
+        lock = LockedPackage(
+            images={'ros:test_distro': 'ros:test_distro@sha256:abc'},
+            repositories=[LockedRepository(name='lib', url='https://host/lib.git', commit='a' * 40)]
+        )
+        Renderer(configuration, lock).render('Dockerfile.j2', 'Dockerfile')
+
+        content = open_mock.return_value.__enter__().write.call_args.args[0]
+        self.assertIn('FROM ros:test_distro@sha256:abc as intermediate', content)
+        self.assertIn('FROM ros:test_distro@sha256:abc\n', content)
+        self.assertIn(f"git -C src/lib checkout --quiet {'a' * 40}", content)
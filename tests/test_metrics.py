@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from rigel.metrics import CONTENT_TYPE, MetricsRegistry, MetricsServer
+
+
+class MetricsRegistryTesting(unittest.TestCase):
+    """
+    Test suite for rigel.metrics.MetricsRegistry class.
+    """
+
+    def test_render(self) -> None:
+        """
+        Test if metrics are rendered in the Prometheus text exposition format.
+        """
+        registry = MetricsRegistry()
+        self.assertEqual(registry.render(), '')
+
+        registry.set('rigel_build_duration_seconds', 1.5, package='app', phase='build')
+        registry.inc('rigel_builds_total', package='app', status='success')
+        registry.inc('rigel_builds_total', package='app', status='success')
+        registry.set('rigel_build_cache_hit_ratio', 0.5)
+
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE rigel_build_duration_seconds gauge', lines)
+        self.assertIn('rigel_build_duration_seconds{package="app",phase="build"} 1.5', lines)
+        self.assertIn('# TYPE rigel_builds_total counter', lines)
+        self.assertIn('rigel_builds_total{package="app",status="success"} 2.0', lines)
+        self.assertIn('rigel_build_cache_hit_ratio 0.5', lines)
+        self.assertNotIn('# TYPE rigel_image_size_bytes gauge', lines)  # no samples
+        self.assertEqual(registry.total('rigel_builds_total'), 2.0)
+
+    def test_label_escaping(self) -> None:
+        """
+        Test if label values are escaped.
+        """
+        registry = MetricsRegistry()
+        registry.set('rigel_simulation_requirement_satisfied', 1, plugin='p', requirement='a "b"\\\n')
+        self.assertIn('requirement="a \\"b\\"\\\\\\n"', registry.render())
+
+    def test_unknown_metric(self) -> None:
+        """
+        Test if only known metrics are recorded.
+        """
+        with self.assertRaises(KeyError):
+            MetricsRegistry().set('unknown', 1.0)
+
+    def test_textfile(self) -> None:
+        """
+        Test if the textfile is rewritten whenever a metric changes.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'metrics', 'rigel.prom')
+            registry = MetricsRegistry(path)
+            registry.set('rigel_build_context_bytes', 10, package='app')
+            registry.set('rigel_build_context_bytes', 20, package='app')
+            with open(path) as textfile:
+                self.assertEqual(textfile.read(), registry.render())
+            self.assertIn('rigel_build_context_bytes{package="app"} 20', registry.render())
+            self.assertEqual(os.listdir(os.path.dirname(path)), ['rigel.prom'])  # no temporary files left behind
+
+
+class MetricsServerTesting(unittest.TestCase):
+    """
+    Test suite for rigel.metrics.MetricsServer class.
+    """
+
+    def test_endpoint(self) -> None:
+        """
+        Test if metrics are exposed at /metrics only.
+        """
+        registry = MetricsRegistry()
+        registry.set('rigel_plugin_duration_seconds', 2.0, plugin='rigel/test')
+        server = MetricsServer(registry, 0)
+        server.start()
+        self.addCleanup(server.stop)
+
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=5) as response:
+            self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+            self.assertEqual(response.read().decode(), registry.render())
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(f'http://127.0.0.1:{server.port}/', timeout=5)
+        self.assertEqual(context.exception.code, 404)
+        context.exception.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
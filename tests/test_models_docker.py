@@ -3,10 +3,11 @@ from rigelcore.exceptions import (
     UndeclaredEnvironmentVariableError
 )
 from rigel.exceptions import (
+    InvalidMemorySizeError,
     UnsupportedCompilerError,
     UnsupportedPlatformError
 )
-from rigel.models import DockerSection, SSHKey
+from rigel.models import DockerSection, Resources, SSHKey
 from unittest.mock import Mock, patch
 
 
@@ -108,5 +109,44 @@ class DockerSectionTesting(unittest.TestCase):
         self.assertEqual(context.exception.kwargs['platform'], platform)
 
 
+class ResourcesModelTesting(unittest.TestCase):
+    """
+    Test suite for rigel.models.Resources class.
+    """
+
+    def test_memory_units(self) -> None:
+        """
+        Test if amounts of memory with units are converted to bytes.
+        """
+        for memory, expected in [(1024, 1024), ('1024', 1024), ('512M', 512 * 1024 ** 2), ('4G', 4 * 1024 ** 3),
+                                 ('4GiB', 4 * 1024 ** 3), ('1.5g', 3 * 1024 ** 3 // 2), ('2Ki', 2048), ('100B', 100)]:
+            with self.subTest(memory=memory):
+                self.assertEqual(Resources.parse_obj({'memory': memory}).memory, expected)
+        self.assertIsNone(Resources().memory)
+
+    def test_invalid_memory_size_error(self) -> None:
+        """
+        Test if InvalidMemorySizeError is thrown if an amount of memory cannot be parsed.
+        """
+        for memory in ['lots', '4X', '-1G', '']:
+            with self.subTest(memory=memory):
+                with self.assertRaises(InvalidMemorySizeError) as context:
+                    Resources.parse_obj({'memory': memory})
+                self.assertEqual(context.exception.kwargs['size'], memory)
+
+    def test_package_resources(self) -> None:
+        """
+        Test if ROS packages may declare their expected resource usage.
+        """
+        package = DockerSection(
+            command='test-command',
+            distro='test-distro',
+            image='test-image',
+            package='test-package',
+            resources={'cpus': 2, 'memory': '6G'}
+        )
+        self.assertEqual(package.resources, Resources(cpus=2.0, memory=6 * 1024 ** 3))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from pydantic import ValidationError
+from rigel.exceptions import CyclicDependencyError, UnknownDependencyError
+from rigel.models import DockerfileSection, DockerSection, Rigelfile
+from typing import Any, Dict, List
+
+
+class RigelfileTesting(unittest.TestCase):
+    """
+    Test suite for rigel.models.Rigelfile class.
+    """
+
+    def package(self, name: str, depends_on: List[str]) -> Dict[str, Any]:
+        return {
+            'command': 'test-command',
+            'distro': 'test-distro',
+            'image': f'{name}-image',
+            'package': name,
+            'depends_on': depends_on
+        }
+
+    def rigelfile(self, packages: List[Dict[str, Any]]) -> Rigelfile:
+        data: Dict[str, Any] = {'packages': packages}
+        return Rigelfile(**data)
+
+    def test_dependencies(self) -> None:
+        """
+        Test if declared dependencies between packages are accepted.
+        """
+        rigelfile = self.rigelfile([
+            self.package('app', ['base']),
+            {'package': 'base', 'dockerfile': 'base', 'image': 'base-image'}
+        ])
+        self.assertEqual(rigelfile.packages[0].depends_on, ['base'])
+        self.assertEqual(rigelfile.packages[1].depends_on, [])
+
+    def test_inferred_package_types(self) -> None:
+        """
+        Test if package declarations are routed to a model according to the presence of field 'dockerfile'.
+        """
+        rigelfile = self.rigelfile([
+            self.package('app', []),
+            {'package': 'base', 'dockerfile': 'base', 'image': 'base-image'}
+        ])
+        self.assertIsInstance(rigelfile.packages[0], DockerSection)
+        self.assertEqual(rigelfile.packages[0].type, 'docker')
+        self.assertIsInstance(rigelfile.packages[1], DockerfileSection)
+        self.assertEqual(rigelfile.packages[1].type, 'dockerfile')
+
+    def test_explicit_package_type(self) -> None:
+        """
+        Test if package declarations are only validated against the model selected by field 'type'.
+        """
+        with self.assertRaises(ValidationError) as context:
+            self.rigelfile([{'type': 'dockerfile', 'package': 'app', 'image': 'app-image'}])
+        errors = context.exception.errors()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['loc'], ('packages', 0, 'DockerfileSection', 'dockerfile'))
+
+        with self.assertRaises(ValidationError):
+            self.rigelfile([{**self.package('app', []), 'type': 'unknown'}])
+
+    def test_unknown_dependency_error(self) -> None:
+        """
+        Test if UnknownDependencyError is thrown if a package depends on an undeclared package.
+        """
+        with self.assertRaises(UnknownDependencyError) as context:
+            self.rigelfile([self.package('app', ['unknown'])])
+        self.assertEqual(context.exception.kwargs['package'], 'app')
+        self.assertEqual(context.exception.kwargs['dependency'], 'unknown')
+
+    def test_cyclic_dependency_error(self) -> None:
+        """
+        Test if CyclicDependencyError is thrown if package dependencies form a cycle.
+        """
+        with self.assertRaises(CyclicDependencyError) as context:
+            self.rigelfile([
+                self.package('app', ['a']),
+                self.package('a', ['b']),
+                self.package('b', ['a'])
+            ])
+        self.assertEqual(context.exception.kwargs['cycle'], 'a -> b -> a')
+
+    def test_self_dependency_error(self) -> None:
+        """
+        Test if CyclicDependencyError is thrown if a package depends on itself.
+        """
+        with self.assertRaises(CyclicDependencyError) as context:
+            self.rigelfile([self.package('app', ['app'])])
+        self.assertEqual(context.exception.kwargs['cycle'], 'app -> app')
+
+
+if __name__ == '__main__':
+    unittest.main()
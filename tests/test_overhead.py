@@ -0,0 +1,257 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+import yaml
+from contextlib import contextmanager
+from pydantic import BaseModel
+from rigel.api import Project
+from rigel.builds import BuildLog
+from rigel.models.docker import SUPPORTED_PLATFORMS
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from unittest.mock import Mock, patch
+
+# Simulated latency of each Docker operation (seconds).
+# 'buildx_build' stands for the docker buildx build process started by rigel.builds.stream_build.
+LATENCIES: Dict[str, float] = {
+    'buildx_build': 30.0,
+    'create_builder': 3.0,
+    'get_image': 0.05,
+    'imagetools_inspect': 0.5,
+    'login': 1.0,
+    'pull': 5.0,
+    'push_image': 10.0,
+    'remove_builder': 1.0,
+    'run_container': 5.0,
+    'tag_image': 0.1
+}
+
+# Maximum CPU time Rigel itself may spend orchestrating a single command (seconds).
+# Deliberately generous: it only catches pathological regressions, the actual value is reported.
+CPU_BUDGET = 10.0
+
+PACKAGES = 20
+
+REGISTRY = {'server': 'registry.example.com', 'username': 'user', 'password': 'secret'}
+
+
+class RecordingDockerClient:
+    """
+    A stand-in for rigelcore.clients.DockerClient that records all calls
+    and accumulates their simulated latency instead of talking to Docker.
+    Calls to operations without a simulated latency fail.
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.simulated_time = 0.0
+        self.__lock = threading.Lock()
+
+    def record(self, operation: str, *args: Any) -> None:
+        with self.__lock:
+            self.calls.append((operation, args))
+            self.simulated_time += LATENCIES[operation]
+
+    def count(self, operation: str) -> int:
+        return sum(1 for name, _ in self.calls if name == operation)
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.calls.clear()
+            self.simulated_time = 0.0
+
+    def stream_build(self, docker: Any, path: str, log: BuildLog, **kwargs: Any) -> None:
+        assert docker is self
+        log.write(f"building {kwargs['tags']}")
+        self.record('buildx_build', path)
+
+    def pull_base_image(self, docker: Any, image: str, platforms: List[str], log: BuildLog, *args: Any) -> bool:
+        assert docker is self
+        log.write(f'pulling {image}')
+        self.record('pull', image)
+        return True
+
+    def get_image(self, *args: Any, **kwargs: Any) -> None:
+        self.record('get_image', *args)
+        return None  # images are never stored locally
+
+    @property
+    def client(self) -> Any:
+        inspect = lambda name: self.record('imagetools_inspect', name)  # noqa: E731
+        return types.SimpleNamespace(buildx=types.SimpleNamespace(imagetools=types.SimpleNamespace(inspect=inspect)))
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        if name not in LATENCIES:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.record(name, *args)
+
+
+class OverheadPlugin(BaseModel):
+    """
+    A deployment plugin that pushes images using its own Docker client, like the registry plugin does.
+    """
+    images: List[str]
+
+    def run(self) -> None:
+        from rigelcore.clients import DockerClient
+        docker = DockerClient()
+        for image in self.images:
+            docker.tag_image(image, f'mirror/{image}')
+            docker.push_image(f'mirror/{image}')
+
+    def stop(self) -> None:
+        pass
+
+
+class OrchestrationOverheadTesting(unittest.TestCase):
+    """
+    Run rigel.api.Project commands end to end against a recording Docker client.
+
+    Call counts and simulated Docker time are asserted to catch orchestration regressions
+    (e.g. creating builders per ROS package). Rigel's own CPU time is reported (see 'pytest -s').
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.realpath(self.tmp.name)
+        with open(os.path.join(self.root, 'Rigelfile'), 'w') as rigelfile:
+            rigelfile.write(self.rigelfile())
+
+        self.docker = RecordingDockerClient()
+        for target in ['rigelcore.clients.DockerClient', 'rigel.builds.session.DockerClient']:
+            patcher = patch(target, return_value=self.docker)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        build_patcher = patch('rigel.api.stream_build', self.docker.stream_build)
+        build_patcher.start()
+        self.addCleanup(build_patcher.stop)
+        pull_patcher = patch('rigel.api.pull_base_image', self.docker.pull_base_image)
+        pull_patcher.start()
+        self.addCleanup(pull_patcher.stop)
+
+        module = types.ModuleType('overhead_plugin')
+        module.Plugin = OverheadPlugin  # type: ignore[attr-defined]
+        sys.modules['overhead_plugin'] = module
+        self.addCleanup(sys.modules.pop, 'overhead_plugin')
+
+        self.project = Project(self.root, Mock())
+        self.project.echo_builds = False
+
+    def rigelfile(self) -> str:
+        packages = []
+        for index in range(PACKAGES):
+            package: Dict[str, Any] = {
+                'package': f'package_{index}',
+                'image': f'registry.example.com/package_{index}',
+                'registry': REGISTRY,
+                'depends_on': [f'package_{index - 1}'] if index else []
+            }
+            if index % 2:
+                package['dockerfile'] = f'docker/package_{index}'
+            else:
+                package.update({'distro': 'noetic', 'command': f'roslaunch package_{index} main.launch'})
+            packages.append(package)
+
+        images = [f'registry.example.com/package_{index}' for index in range(PACKAGES)]
+        return yaml.safe_dump({'packages': packages, 'deploy': [{'name': 'rigel/overhead_plugin', 'kwargs': {'images': images}}]})
+
+    @staticmethod
+    def qemu_setups() -> int:
+        return sum(1 for _, _, file in SUPPORTED_PLATFORMS if not os.path.exists(f'/proc/sys/fs/binfmt_misc/{file}'))
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Report the Docker calls, simulated Docker time and Rigel's own CPU time of a command.
+        """
+        self.docker.reset()
+        started_at = time.process_time()
+        yield
+        cpu_time = time.process_time() - started_at
+        print(
+            f'\n[overhead] {name}: {len(self.docker.calls)} Docker calls, '
+            f'{self.docker.simulated_time:.2f}s simulated Docker time, {cpu_time:.3f}s Rigel CPU time'
+        )
+        self.assertLess(cpu_time, CPU_BUDGET)
+
+    def test_build(self) -> None:
+        """
+        Test if builders, QEMU, registry authentications and base images are set up once regardless of the number of ROS packages.
+        """
+        with self.measure('build'):
+            self.project.build(push=True, jobs=4, preflight=False)
+
+        qemu_setups = self.qemu_setups()
+        self.assertEqual(self.docker.count('create_builder'), 1)
+        self.assertEqual(self.docker.count('remove_builder'), 1)
+        self.assertEqual(self.docker.count('run_container'), qemu_setups)
+        self.assertEqual(self.docker.count('login'), 1)
+        self.assertEqual(self.docker.count('pull'), 1)  # ros:noetic (the Dockerfiles of other packages do not exist)
+        self.assertEqual(self.docker.count('buildx_build'), PACKAGES)
+        self.assertEqual(len(self.docker.calls), PACKAGES + qemu_setups + 4)
+        self.assertAlmostEqual(
+            self.docker.simulated_time,
+            PACKAGES * LATENCIES['buildx_build'] + qemu_setups * LATENCIES['run_container'] +
+            LATENCIES['create_builder'] + LATENCIES['remove_builder'] + LATENCIES['login'] + LATENCIES['pull']
+        )
+
+    def test_build_load(self) -> None:
+        """
+        Test if local images are only inspected before and after each build when loading images.
+        """
+        with self.measure('build --load'):
+            self.project.build(load=True, preflight=False)
+
+        self.assertEqual(self.docker.count('get_image'), PACKAGES)  # no image existed before building
+        self.assertEqual(self.docker.count('buildx_build'), PACKAGES)
+        self.assertEqual(self.docker.count('login'), 1)
+
+    def test_preflight(self) -> None:
+        """
+        Test if each distinct registry and base image is checked once regardless of the number of ROS packages.
+        """
+        for index in range(1, PACKAGES, 2):
+            os.makedirs(os.path.join(self.root, 'docker', f'package_{index}'))
+            with open(os.path.join(self.root, 'docker', f'package_{index}', 'Dockerfile'), 'w') as dockerfile:
+                dockerfile.write(f'FROM ubuntu:22.04 AS builder\nFROM builder\nFROM registry.example.com/package_{index - 1}\n')
+
+        with patch('rigel.builds.PreflightChecker.check_registry', return_value=None) as check_registry:
+            with self.measure('preflight'):
+                failures = self.project.preflight()
+
+        self.assertEqual(failures, [])
+        self.assertEqual(check_registry.call_count, 1)
+        self.assertEqual(self.docker.count('get_image'), 2)  # ros:noetic and ubuntu:22.04
+        self.assertEqual(self.docker.count('imagetools_inspect'), 2)
+
+    def test_create(self) -> None:
+        """
+        Test if build files are created without calling Docker.
+        """
+        with self.measure('create'):
+            self.project.create()
+
+        self.assertEqual(self.docker.calls, [])
+        self.assertEqual(self.docker.simulated_time, 0.0)
+
+    def test_deploy(self) -> None:
+        """
+        Test if deployment plugins are run against the same Docker stand-in.
+        """
+        with self.measure('deploy'):
+            self.project.deploy()
+
+        self.assertEqual(self.docker.count('tag_image'), PACKAGES)
+        self.assertEqual(self.docker.count('push_image'), PACKAGES)
+        self.assertAlmostEqual(
+            self.docker.simulated_time,
+            PACKAGES * (LATENCIES['tag_image'] + LATENCIES['push_image'])
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
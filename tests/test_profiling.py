@@ -0,0 +1,84 @@
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+from rigel.profiling import CommandProfiler, labelled
+
+
+def wait_in_thread() -> None:
+    time.sleep(0.05)
+
+
+class LabelledTesting(unittest.TestCase):
+    """
+    Test suite for rigel.profiling.labelled function.
+    """
+
+    def test_labelled(self) -> None:
+        """
+        Test if wrapped functions are called through a frame with the given name.
+        """
+        function = labelled('plugin[test/plugin].run', lambda: 42)
+        self.assertEqual(function(), 42)
+        self.assertEqual(function.__code__.co_name, 'plugin[test/plugin].run')
+
+
+class CommandProfilerTesting(unittest.TestCase):
+    """
+    Test suite for rigel.profiling.CommandProfiler class.
+    """
+
+    def profile(self, speedscope: bool) -> CommandProfiler:
+        profiler = CommandProfiler(speedscope, interval=0.001)
+        profiler.start()
+        try:
+            labelled('plugin[test/plugin].run', wait_in_thread)()
+            thread = threading.Thread(target=wait_in_thread, name='build')
+            thread.start()
+            thread.join()
+        finally:
+            profiler.stop()
+        return profiler
+
+    def test_pstats(self) -> None:
+        """
+        Test if all threads are profiled and merged into a single pstats file.
+        """
+        profiler = self.profile(False)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rigel.prof')
+            self.assertEqual(profiler.write(path), [path])
+            stats = pstats.Stats(path).stats  # type: ignore[attr-defined]
+
+        functions = {function: primitive_calls for (_, _, function), (primitive_calls, *_) in stats.items()}
+        self.assertEqual(functions['plugin[test/plugin].run'], 1)
+        self.assertEqual(functions['wait_in_thread'], 2)  # main thread and started thread
+
+    def test_speedscope(self) -> None:
+        """
+        Test if sampled call stacks are written in the speedscope file format.
+        """
+        profiler = self.profile(True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rigel.prof')
+            paths = profiler.write(path, 'rigel test')
+            self.assertEqual(paths, [path, os.path.join(tmp, 'rigel.speedscope.json')])
+            with open(paths[1]) as speedscope_file:
+                document = json.load(speedscope_file)
+
+        self.assertEqual(document['name'], 'rigel test')
+        frames = [frame['name'] for frame in document['shared']['frames']]
+        self.assertIn('plugin[test/plugin].run', frames)
+        profiles = {profile['name']: profile for profile in document['profiles']}
+        self.assertIn('build', profiles)
+        for profile in profiles.values():
+            self.assertEqual(profile['type'], 'sampled')
+            self.assertEqual(len(profile['samples']), len(profile['weights']))
+            self.assertTrue(all(index < len(frames) for sample in profile['samples'] for index in sample))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from rigel.exceptions import RepositoryFetchError
+from rigel.vcs import Repository, RepositoryMirror
+from subprocess import check_call
+from unittest.mock import Mock, patch
+
+
+def git(*args: str) -> None:
+    check_call(['git', '-c', 'user.name=rigel', '-c', 'user.email=rigel@test', *args])
+
+
+class RepositoryMirrorTesting(unittest.TestCase):
+    """
+    Test suite for rigel.vcs.RepositoryMirror class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.origin = os.path.join(self.tmp.name, 'origin')
+        self.url = f'file://{self.origin}'
+        git('init', '--quiet', '-b', 'main', self.origin)
+        self.commit('README', 'main')
+        git('-C', self.origin, 'checkout', '--quiet', '-b', 'devel')
+        self.commit('DEVEL', 'devel')
+        git('-C', self.origin, 'checkout', '--quiet', 'main')
+
+        self.mirror = RepositoryMirror(os.path.join(self.tmp.name, 'cache'), jobs=2)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def commit(self, filename: str, content: str) -> None:
+        with open(os.path.join(self.origin, filename), 'w') as f:
+            f.write(content)
+        git('-C', self.origin, 'add', filename)
+        git('-C', self.origin, 'commit', '--quiet', '-m', filename)
+
+    def test_mirror_path(self) -> None:
+        """
+        Test if distinct repositories with the same name are given distinct mirrors.
+        """
+        path_a = self.mirror.mirror_path('https://host_a/user/repo.git')
+        path_b = self.mirror.mirror_path('https://host_b/user/repo.git')
+        self.assertNotEqual(path_a, path_b)
+        self.assertTrue(os.path.basename(path_a).startswith('repo-'))
+
+    def test_fetch_and_stage(self) -> None:
+        """
+        Test if working copies are checked out at the requested version.
+        """
+        repositories = [
+            Repository(name='main_copy', url=self.url),
+            Repository(name='devel_copy', url=self.url, version='devel')
+        ]
+        self.mirror.fetch([r.url for r in repositories])
+        self.assertTrue(os.path.isdir(self.mirror.mirror_path(self.url)))
+
+        destination = os.path.join(self.tmp.name, 'src')
+        self.mirror.stage(repositories, destination)
+        self.assertTrue(os.path.isfile(os.path.join(destination, 'main_copy', 'README')))
+        self.assertFalse(os.path.exists(os.path.join(destination, 'main_copy', 'DEVEL')))
+        self.assertTrue(os.path.isfile(os.path.join(destination, 'devel_copy', 'DEVEL')))
+
+    def test_incremental_update(self) -> None:
+        """
+        Test if existing mirrors are updated with new commits.
+        """
+        self.mirror.fetch([self.url])
+        self.commit('NEW', 'new')
+        self.mirror.fetch([self.url])
+
+        destination = os.path.join(self.tmp.name, 'src')
+        self.mirror.stage([Repository(name='copy', url=self.url)], destination)
+        self.assertTrue(os.path.isfile(os.path.join(destination, 'copy', 'NEW')))
+
+    @patch('rigel.vcs.mirror.RepositoryMirror.update')
+    def test_fetch_deduplication(self, update_mock: Mock) -> None:
+        """
+        Test if each repository is fetched only once.
+        """
+        self.mirror.fetch([self.url, self.url, 'file:///other'])
+        self.assertEqual(update_mock.call_count, 2)
+
+    def test_repository_fetch_error(self) -> None:
+        """
+        Test if RepositoryFetchError is thrown if a repository cannot be fetched.
+        """
+        url = f'file://{self.tmp.name}/unexistent'
+        with self.assertRaises(RepositoryFetchError) as context:
+            self.mirror.fetch([url])
+        self.assertEqual(context.exception.kwargs['repository'], url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from rigel.exceptions import RepositoryFetchError
+from rigel.vcs import list_refs, resolve_commit
+from subprocess import check_call, check_output
+
+
+def git(*args: str) -> str:
+    return check_output(['git', '-c', 'user.name=rigel', '-c', 'user.email=rigel@test', *args], text=True).strip()
+
+
+class ResolveCommitTesting(unittest.TestCase):
+    """
+    Test suite for rigel.vcs.resolve_commit function.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.origin = os.path.join(self.tmp.name, 'origin')
+        self.url = f'file://{self.origin}'
+        check_call(['git', 'init', '--quiet', '-b', 'main', self.origin])
+        self.main = self.commit('README')
+        git('-C', self.origin, 'tag', '-a', 'v1', '-m', 'v1')
+        git('-C', self.origin, 'checkout', '--quiet', '-b', 'devel')
+        self.devel = self.commit('DEVEL')
+        git('-C', self.origin, 'checkout', '--quiet', 'main')
+
+    def commit(self, filename: str) -> str:
+        with open(os.path.join(self.origin, filename), 'w') as f:
+            f.write(filename)
+        git('-C', self.origin, 'add', filename)
+        git('-C', self.origin, 'commit', '--quiet', '-m', filename)
+        return git('-C', self.origin, 'rev-parse', 'HEAD')
+
+    def test_resolve(self) -> None:
+        """
+        Test if branches, annotated tags and the default branch are resolved to commits.
+        """
+        self.assertEqual(resolve_commit(self.url), self.main)
+        self.assertEqual(resolve_commit(self.url, 'devel'), self.devel)
+        self.assertEqual(resolve_commit(self.url, 'v1'), self.main)
+        self.assertEqual(resolve_commit(self.url, 'refs/heads/devel'), self.devel)
+        self.assertEqual(resolve_commit(self.url, self.devel), self.devel)
+        self.assertIn('refs/tags/v1^{}', list_refs(self.url))
+
+    def test_moving_branch(self) -> None:
+        """
+        Test if new commits are picked up once a branch moves.
+        """
+        latest = self.commit('CHANGELOG')
+        self.assertNotEqual(latest, self.main)
+        self.assertEqual(resolve_commit(self.url, 'main'), latest)
+
+    def test_errors(self) -> None:
+        """
+        Test if unknown versions and repositories are reported.
+        """
+        with self.assertRaises(RepositoryFetchError):
+            resolve_commit(self.url, 'unknown')
+        with self.assertRaises(RepositoryFetchError):
+            resolve_commit(f'file://{self.tmp.name}/missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
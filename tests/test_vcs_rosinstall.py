@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from rigel.exceptions import InvalidRosinstallFileError, UnsupportedRepositoryError
+from rigel.vcs import RosinstallParser
+
+
+class RosinstallParserTesting(unittest.TestCase):
+    """
+    Test suite for rigel.vcs.RosinstallParser class.
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp.name, 'test.rosinstall')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write(self, content: str) -> None:
+        with open(self.filepath, 'w') as rosinstall_file:
+            rosinstall_file.write(content)
+
+    def test_rosinstall_format(self) -> None:
+        """
+        Test if files in the classic rosinstall format are parsed as expected.
+        Only git repositories are considered.
+        """
+        self.write(
+            '- git: {local-name: pkg_a, uri: "file:///repo_a", version: devel}\n'
+            '- git: {local-name: pkg_b, uri: "file:///repo_b"}\n'
+            '- svn: {local-name: pkg_c, uri: "file:///repo_c"}\n'
+        )
+        repositories = RosinstallParser().parse(self.filepath)
+        self.assertEqual([r.name for r in repositories], ['pkg_a', 'pkg_b'])
+        self.assertEqual(repositories[0].url, 'file:///repo_a')
+        self.assertEqual(repositories[0].version, 'devel')
+        self.assertEqual(repositories[1].version, '')
+
+    def test_repos_format(self) -> None:
+        """
+        Test if files in the vcstool format are parsed as expected.
+        """
+        self.write(
+            'repositories:\n'
+            '  pkg_a: {type: git, url: "file:///repo_a", version: 1.0.0}\n'
+            '  pkg_b: {type: hg, url: "file:///repo_b"}\n'
+        )
+        repositories = RosinstallParser().parse(self.filepath)
+        self.assertEqual(len(repositories), 1)
+        self.assertEqual(repositories[0].name, 'pkg_a')
+        self.assertEqual(repositories[0].version, '1.0.0')
+
+    def test_missing_file_error(self) -> None:
+        """
+        Test if InvalidRosinstallFileError is thrown if the .rosinstall file does not exist.
+        """
+        with self.assertRaises(InvalidRosinstallFileError) as context:
+            RosinstallParser().parse(self.filepath)
+        self.assertEqual(context.exception.kwargs['file'], self.filepath)
+
+    def test_incomplete_entry_error(self) -> None:
+        """
+        Test if InvalidRosinstallFileError is thrown if a git entry has no URI.
+        """
+        self.write('- git: {local-name: pkg_a}\n')
+        with self.assertRaises(InvalidRosinstallFileError):
+            RosinstallParser().parse(self.filepath)
+
+    def test_malformed_entry_error(self) -> None:
+        """
+        Test if InvalidRosinstallFileError is thrown for entries that are not mappings.
+        """
+        for content in ['- git: file:///repo_a\n', '- [git, file:///repo_a]\n', 'repositories: [pkg_a]\n']:
+            self.write(content)
+            with self.assertRaises(InvalidRosinstallFileError):
+                RosinstallParser().parse(self.filepath)
+
+    def test_strict_unsupported_repository_error(self) -> None:
+        """
+        Test if UnsupportedRepositoryError is thrown for repositories that are not git repositories
+        when those cannot be left out.
+        """
+        self.write('- svn: {local-name: pkg_c, uri: "file:///repo_c"}\n')
+        with self.assertRaises(UnsupportedRepositoryError) as context:
+            RosinstallParser(strict=True).parse(self.filepath)
+        self.assertEqual(context.exception.kwargs['repository'], 'pkg_c')
+        self.assertEqual(context.exception.kwargs['vcs'], 'svn')
+
+        self.write('repositories:\n  pkg_b: {type: tar, url: "file:///repo_b.tar"}\n')
+        with self.assertRaises(UnsupportedRepositoryError):
+            RosinstallParser(strict=True).parse(self.filepath)
+
+
+if __name__ == '__main__':
+    unittest.main()